@@ -3,29 +3,55 @@
 
 TODAY=$(date +"%d-%m-%Y")
 MODULE_FILE="$1"
+# GTKWave only opens on request: ./runSim.sh uart_rx.v --waves (or WAVES=1)
+[ "$2" == "--waves" ] && WAVES=1
 MODULE_NAME=$(basename "$MODULE_FILE" .v)
 TOP="tb/${MODULE_NAME}_tb.v"
 OUT="results/${MODULE_NAME}_tb_${TODAY}.vvp"
-VCD="results/${MODULE_NAME}.vcd"
+WAVE_BASE="results/${MODULE_NAME}"
 
 if [ ! -f "$TOP" ]; then
   echo "❌ Testbench not found: $TOP"
   exit 1
 fi
 
-# Compile
-echo "🔧 Compiling $MODULE_NAME..."
-iverilog -o "$OUT" "src/$MODULE_FILE" "$TOP"
+# The testbench plus every module it instantiates, found by tb/tblib/deps.py
+# (one path per line, so paths with spaces survive)
+mapfile -t SOURCES < <(cd tb && python3 -m tblib.deps --closure "../$TOP")
+wait $! && [ ${#SOURCES[@]} -gt 0 ] || exit 1
 
-# Run
-echo "🚀 Running simulation..."
-vvp "$OUT"
+# Compile and run (SIM=verilator to use Verilator instead of Icarus)
+if [ "${SIM:-icarus}" == "verilator" ]; then
+  OBJ="results/obj_${MODULE_NAME}"
+  echo "🔧 Compiling $MODULE_NAME with Verilator..."
+  verilator --binary --timing -Wno-fatal -Mdir "$OBJ" -o sim "${SOURCES[@]}" || exit 1
 
-# Open GTKWave if VCD was generated
-if [ -f "$VCD" ]; then
-  echo "📊 Opening waveform in GTKWave..."
-  gtkwave "$VCD" &
+  echo "🚀 Running simulation..."
+  "$OBJ/sim"
 else
-  echo "⚠️ No VCD file found. Did you forget to add $dumpfile/$dumpvars?"
+  echo "🔧 Compiling $MODULE_NAME..."
+  iverilog -o "$OUT" "${SOURCES[@]}" || exit 1
+
+  echo "🚀 Running simulation..."
+  vvp "$OUT"
+fi
+
+if [ "${WAVES:-0}" == "0" ]; then
+  exit 0
 fi
 
+# Open GTKWave on whichever dump the testbench wrote (FST preferred)
+WAVE=""
+for ext in fst vcd; do
+  if [ -f "${WAVE_BASE}.${ext}" ]; then
+    WAVE="${WAVE_BASE}.${ext}"
+    break
+  fi
+done
+
+if [ -n "$WAVE" ]; then
+  echo "📊 Opening waveform in GTKWave..."
+  gtkwave "$WAVE" &
+else
+  echo "⚠️ No FST/VCD file found. Did you forget to add $dumpfile/$dumpvars?"
+fi
@@ -0,0 +1,172 @@
+// ====================================
+// File: uart_control_loop.v
+// Author: jaimebw
+// Created: 2026-10-18 11:05:03
+// ====================================
+// The whole control path between two serial lines: a1/a2 frames in on rx,
+// LandauControlLaw, and the b frame out on tx.
+//
+//   rx -> UartRx -> UartRxPidBuffer -> LandauControlLaw -> UartTxPidBuffer -> UartTx -> tx
+//
+// Every ready pulse of the PID buffer sends one 7-byte frame with b (test
+// PID for test frames). a1, a2, b and ready are brought out for the
+// testbench probes only.
+
+module UartControlLoop#(
+    parameter CLK_FREQ = 50_000_000,
+    parameter BAUD_RATE = 9600,
+    parameter FRACTIONAL = 0,
+    parameter RX_FIFO_DEPTH_LOG2 = 0,  // 0: no FIFO, else 2**N bytes queued while the b frame is sent
+`ifdef SIM_MODE
+    parameter signed [31:0] K1 = 32'sd65536,  // 1.0 in Q16.16
+    parameter signed [31:0] K2 = 32'sd65536   // 1.0 in Q16.16
+`else
+    parameter signed [31:0] K1 = -32'sd13107, // -0.2 in Q16.16
+    parameter signed [31:0] K2 = -32'sd26214  // -0.4 in Q16.16
+`endif
+)(
+    input  wire        clk,
+    input  wire        rst,
+    input  wire        rx,
+    output wire        tx,
+    output wire [31:0] a1,
+    output wire [31:0] a2,
+    output wire [31:0] b,
+    output wire        ready
+);
+
+    wire [7:0] rx_data;
+    wire       rx_done;
+    wire       rx_busy;
+    wire       test;
+
+    wire [7:0] tx_data;
+    wire       tx_start;
+    wire       tx_busy;
+    wire       tx_done;
+
+    UartRx #(
+        .CLK_FREQ(CLK_FREQ),
+        .BAUD_RATE(BAUD_RATE),
+        .FRAME_BITS(8),
+        .FRACTIONAL(FRACTIONAL)
+    ) uart_rx_inst (
+        .clk(clk),
+        .rst(rst),
+        .rx(rx),
+        .rx_data(rx_data),
+        .rx_done(rx_done),
+        .rx_busy(rx_busy)
+    );
+
+    // Optional byte FIFO in front of the PID buffer (RX_FIFO_DEPTH_LOG2 = 0: direct).
+    // UartTxPidBuffer drops a tx_valid that arrives while it sends a frame, so
+    // with the FIFO the PID buffer only takes bytes while the b frame of the
+    // last update is not on the line; what arrives meanwhile waits in the FIFO.
+    // Every 0x55 handed over holds the FIFO for END_HOLD clocks too, until a
+    // ready it may complete has reached b_frame_left.
+    localparam END_FRAME = 8'h55;
+    localparam END_HOLD  = 3'd4;      // END byte -> ready (3 clocks) + 1
+
+    wire [7:0] pid_rx_byte;
+    wire       pid_rx_done;
+
+    generate
+    if (RX_FIFO_DEPTH_LOG2 == 0) begin : rx_direct
+        assign pid_rx_byte = rx_data;
+        assign pid_rx_done = rx_done;
+    end else begin : rx_fifo
+        wire       rd_valid;
+        reg  [2:0] b_frame_left;      // bytes of the b frame not sent yet
+        reg  [2:0] end_hold;
+        wire       accept = (b_frame_left == 3'd0) && (end_hold == 3'd0);
+
+        always @(posedge clk or posedge rst) begin
+            if (rst) begin
+                b_frame_left <= 3'd0;
+                end_hold     <= 3'd0;
+            end else begin
+                if (ready)
+                    b_frame_left <= 3'd7;
+                else if (tx_done && b_frame_left != 3'd0)
+                    b_frame_left <= b_frame_left - 3'd1;
+
+                if (pid_rx_done && pid_rx_byte == END_FRAME)
+                    end_hold <= END_HOLD;
+                else if (end_hold != 3'd0)
+                    end_hold <= end_hold - 3'd1;
+            end
+        end
+
+        UartRxFifo #(
+            .DATA_BITS(8),
+            .DEPTH_LOG2(RX_FIFO_DEPTH_LOG2),
+            .COUNT_BITS(16)
+        ) rx_fifo_inst (
+            .clk(clk),
+            .rst(rst),
+            .wr_data(rx_data),
+            .wr_en(rx_done),
+            .rd_en(accept),
+            .rd_data(pid_rx_byte),
+            .rd_valid(rd_valid),
+            .full(),
+            .level(),
+            .max_level(),
+            .overflows()
+        );
+
+        assign pid_rx_done = rd_valid & accept;
+    end
+    endgenerate
+
+    UartRxPidBuffer rx_pid_buffer (
+        .clk(clk),
+        .rst(rst),
+        .rx_done(pid_rx_done),
+        .rx_byte(pid_rx_byte),
+        .a1(a1),
+        .a2(a2),
+        .ready(ready),
+        .test(test)
+    );
+
+    // Combinational: b follows a1/a2, which only change with ready
+    LandauControlLaw #(
+        .K1(K1),
+        .K2(K2)
+    ) control_law (
+        .a1(a1),
+        .a2(a2),
+        .test(test),
+        .b(b)
+    );
+
+    UartTxPidBuffer tx_pid_buffer (
+        .clk(clk),
+        .rst(rst),
+        .tx_float(b),
+        .tx_valid(ready),
+        .tx_busy(tx_busy),
+        .test(test),
+        .tx_data(tx_data),
+        .tx_start(tx_start)
+    );
+
+    // start + 8 data + stop, shifted out LSB first
+    UartTx #(
+        .CLK_FREQ(CLK_FREQ),
+        .BAUD_RATE(BAUD_RATE),
+        .FRAME_BITS(10),
+        .FRACTIONAL(FRACTIONAL)
+    ) uart_tx_inst (
+        .clk(clk),
+        .rst(rst),
+        .frame_data({1'b1, tx_data, 1'b0}),
+        .tx_start(tx_start),
+        .tx(tx),
+        .tx_busy(tx_busy),
+        .tx_done(tx_done)
+    );
+
+endmodule
@@ -3,11 +3,19 @@
 // Author: jaimebw
 // Created: 2025-05-14 23:12:21
 // ====================================
+// FRACTIONAL=1 times the bits from a phase accumulator, so the bit period
+// averages exactly 1 / BAUD_RATE (3 Mbaud from 50 MHz is 16.67 clocks per
+// bit, and 16 loses back-to-back bytes). OVERSAMPLE=1 needs
+// 16 * BAUD_RATE <= CLK_FREQ. With either one the receiver waits out half the
+// stop bit before looking for the next start bit, so a stream with no idle
+// time decodes with the sender's clock a few percent off.
 
 module UartRx#(
     parameter CLK_FREQ = 50_000_000,
     parameter BAUD_RATE = 9600,
-    parameter FRAME_BITS = 8
+    parameter FRAME_BITS = 8,
+    parameter FRACTIONAL = 0,   // 1: phase-accumulator bit timing, no CLK_FREQ / BAUD_RATE truncation
+    parameter OVERSAMPLE = 0    // 1: 16 ticks per bit, majority of ticks 7-9 (phase-accumulator timing)
 )(
     input wire clk,
     input wire rst,
@@ -32,70 +40,159 @@ localparam IDLE  = 2'd0,
            READ  = 2'd2,
            DONE  = 2'd3;
 
-always @(posedge clk or posedge rst) begin
-    if (rst) begin
-        rx_data <= 0;
-        rx_done <= 0;
-        rx_busy <= 0;
-        clk_count <= 0;
-        bit_index <= 0;
-        shift_reg <= 0;
-        state <= IDLE;
-    end else begin
-        case (state)
-            IDLE: begin
-                rx_done <= 0;
-                rx_busy <= 0;
-                clk_count <= 0;
-                bit_index <= 0;
-                if (rx == 0) begin
-                    state <= START;
-                    rx_busy <= 1;
-                end
-            end
-            START: begin
-                // Muestreo, para asegurarnos que hay una transmision
-                if (clk_count == MID_BIT) begin
+generate
+if (FRACTIONAL == 0 && OVERSAMPLE == 0) begin : integer_timing
+
+    always @(posedge clk or posedge rst) begin
+        if (rst) begin
+            rx_data <= 0;
+            rx_done <= 0;
+            rx_busy <= 0;
+            clk_count <= 0;
+            bit_index <= 0;
+            shift_reg <= 0;
+            state <= IDLE;
+        end else begin
+            case (state)
+                IDLE: begin
+                    rx_done <= 0;
+                    rx_busy <= 0;
+                    clk_count <= 0;
+                    bit_index <= 0;
                     if (rx == 0) begin
-                        clk_count <= 0;
-                        bit_index <= 0;
-                        state <= READ;
-                    end else begin
-                        state <= IDLE;
+                        state <= START;
+                        rx_busy <= 1;
                     end
-                end else begin
-                    clk_count <= clk_count + 1;
                 end
-            end
-            READ: begin
-                if (clk_count < CLKS_PER_BIT - 1) begin
-                    clk_count <= clk_count + 1;
-                end else begin
-                    clk_count <= 0;
-                    shift_reg[bit_index] <= rx;
-                    //bit_index <= bit_index + 1;
-                    // if (bit_index == FRAME_BITS - 1) begin
-                    //     state <= DONE;
-                    // end
-                    //
-                    if (bit_index == FRAME_BITS - 1) begin
-                        state <= DONE;
+                START: begin
+                    // Muestreo, para asegurarnos que hay una transmision
+                    if (clk_count == MID_BIT) begin
+                        if (rx == 0) begin
+                            clk_count <= 0;
+                            bit_index <= 0;
+                            state <= READ;
+                        end else begin
+                            state <= IDLE;
+                        end
                     end else begin
-                        bit_index <= bit_index + 1;
+                        clk_count <= clk_count + 1;
                     end
+                end
+                READ: begin
+                    if (clk_count < CLKS_PER_BIT - 1) begin
+                        clk_count <= clk_count + 1;
+                    end else begin
+                        clk_count <= 0;
+                        shift_reg[bit_index] <= rx;
+                        //bit_index <= bit_index + 1;
+                        // if (bit_index == FRAME_BITS - 1) begin
+                        //     state <= DONE;
+                        // end
+                        //
+                        if (bit_index == FRAME_BITS - 1) begin
+                            state <= DONE;
+                        end else begin
+                            bit_index <= bit_index + 1;
+                        end
 
 
+                    end
                 end
+                DONE: begin
+                    rx_data <= shift_reg;
+                    rx_done <= 1;
+                    rx_busy <= 0;
+                    state <= IDLE;
+                end
+            endcase
+        end
+    end
+
+end else begin : phase_timing
+
+    // Bit clock from a phase accumulator: ACC_INC / 2**ACC_BITS ticks per
+    // clock, so the bit period averages exactly 1 / BAUD_RATE and the error
+    // never exceeds one clock, whatever the ratio. Without oversampling the
+    // accumulator starts half a bit in on the start edge and ticks at each
+    // mid-bit; with it, the 16 ticks per bit vote on ticks 7, 8 and 9.
+    // At most one tick per clock: BAUD_RATE * 16 <= CLK_FREQ to oversample.
+    localparam TICKS    = OVERSAMPLE ? 16 : 1;
+    localparam ACC_BITS = 32;
+    localparam [ACC_BITS:0]   ACC_INC =
+        (((64'd1 * BAUD_RATE * TICKS) << ACC_BITS) + CLK_FREQ / 2) / CLK_FREQ;
+    localparam [ACC_BITS-1:0] ACC_START = OVERSAMPLE ? 0 : (1 << (ACC_BITS - 1));
+    localparam STOP = 3'd4;
+
+    reg [ACC_BITS-1:0] phase;
+    reg [3:0]          tick_count;     // ticks into the current bit (oversampling)
+    reg [1:0]          votes;          // samples at ticks 7 and 8
+    reg [2:0]          fstate;
+
+    wire [ACC_BITS:0] phase_next = {1'b0, phase} + ACC_INC;
+    wire tick    = phase_next[ACC_BITS];
+    wire decide  = tick && (OVERSAMPLE == 0 || tick_count == 4'd8);
+    wire mid_bit = tick && (OVERSAMPLE == 0 || tick_count == 4'd7);
+    wire bit_val = OVERSAMPLE ? ((votes[0] & votes[1]) | (votes[0] & rx) | (votes[1] & rx)) : rx;
+
+    always @(posedge clk or posedge rst) begin
+        if (rst) begin
+            rx_data <= 0;
+            rx_done <= 0;
+            rx_busy <= 0;
+            bit_index <= 0;
+            shift_reg <= 0;
+            phase <= 0;
+            tick_count <= 0;
+            votes <= 0;
+            fstate <= IDLE;
+        end else begin
+            phase <= phase_next[ACC_BITS-1:0];
+            if (tick) begin
+                tick_count <= tick_count + 1'b1;
+                if (tick_count == 4'd6 || tick_count == 4'd7)
+                    votes <= {votes[0], rx};
             end
-            DONE: begin
-                rx_data <= shift_reg;
-                rx_done <= 1;
-                rx_busy <= 0;
-                state <= IDLE;
-            end
-        endcase
+
+            case (fstate)
+                IDLE: begin
+                    rx_done <= 0;
+                    rx_busy <= 0;
+                    bit_index <= 0;
+                    if (rx == 0) begin
+                        // Start edge: restart the bit clock on it
+                        phase <= ACC_START;
+                        tick_count <= 0;
+                        rx_busy <= 1;
+                        fstate <= START;
+                    end
+                end
+                START: if (decide)
+                    fstate <= bit_val ? IDLE : READ;   // start bit still low at mid-bit?
+                READ: if (decide) begin
+                    shift_reg[bit_index] <= bit_val;
+                    if (bit_index == FRAME_BITS - 1)
+                        fstate <= STOP;
+                    else
+                        bit_index <= bit_index + 1;
+                end
+                // Wait out half the stop bit, so a low last data bit is not
+                // taken for the next start bit (no vote needed: leave early)
+                STOP: if (mid_bit)
+                    fstate <= DONE;
+                default: begin   // DONE
+                    rx_data <= shift_reg;
+                    rx_done <= 1;
+                    rx_busy <= 0;
+                    fstate <= IDLE;
+                end
+            endcase
+        end
     end
+
+    // state as the integer receiver would show it (the stop bit counts as READ)
+    always @(*) state = (fstate == STOP) ? READ : fstate[1:0];
+
 end
+endgenerate
 
 endmodule
-
@@ -0,0 +1,70 @@
+// ====================================
+// File: uart_rx_fifo.v
+// Author: jaimebw
+// Created: 2026-10-18 10:46:46
+// ====================================
+// Byte FIFO between UartRx and a consumer that cannot take a byte every
+// rx_done (or is busy for a while). First-word fall-through: rd_data is the
+// head byte whenever rd_valid is high, and rd_en pops it on the clock edge.
+//
+// To feed UartRxPidBuffer/UartRxBuffer, drive their rx_done with
+// rd_valid & rd_en and their rx_byte with rd_data.
+//
+// A byte arriving while full is dropped (unless a byte is popped on the same
+// edge) and counted in overflows; max_level is the high-water mark.
+
+module UartRxFifo#(
+    parameter DATA_BITS = 8,
+    parameter DEPTH_LOG2 = 4,           // 2**DEPTH_LOG2 bytes, at least 1
+    parameter COUNT_BITS = 16
+)(
+    input  wire                  clk,
+    input  wire                  rst,
+    input  wire [DATA_BITS-1:0]  wr_data,    // rx_data of UartRx
+    input  wire                  wr_en,      // rx_done of UartRx
+    input  wire                  rd_en,      // consumer takes rd_data
+    output wire [DATA_BITS-1:0]  rd_data,    // head byte, 0 while empty
+    output wire                  rd_valid,
+    output wire                  full,
+    output wire [DEPTH_LOG2:0]   level,      // bytes queued
+    output reg  [DEPTH_LOG2:0]   max_level,  // high-water mark since reset
+    output reg  [COUNT_BITS-1:0] overflows   // bytes dropped while full, saturating
+);
+
+    localparam DEPTH = 1 << DEPTH_LOG2;
+
+    reg [DATA_BITS-1:0] mem [0:DEPTH-1];
+    reg [DEPTH_LOG2:0]  wr_ptr;             // one bit wider than the index
+    reg [DEPTH_LOG2:0]  rd_ptr;
+
+    assign level    = wr_ptr - rd_ptr;
+    assign full     = (level == DEPTH);
+    assign rd_valid = (level != 0);
+    assign rd_data  = rd_valid ? mem[rd_ptr[DEPTH_LOG2-1:0]] : {DATA_BITS{1'b0}};  // no X when empty
+
+    wire pop  = rd_en && rd_valid;
+    wire push = wr_en && (!full || pop);
+
+    always @(posedge clk or posedge rst) begin
+        if (rst) begin
+            wr_ptr    <= 0;
+            rd_ptr    <= 0;
+            max_level <= 0;
+            overflows <= 0;
+        end else begin
+            if (push) begin
+                mem[wr_ptr[DEPTH_LOG2-1:0]] <= wr_data;
+                wr_ptr <= wr_ptr + 1'b1;
+            end
+            if (pop)
+                rd_ptr <= rd_ptr + 1'b1;
+
+            if (wr_en && !push && overflows != {COUNT_BITS{1'b1}})
+                overflows <= overflows + 1'b1;
+
+            if (level > max_level)
+                max_level <= level;
+        end
+    end
+
+endmodule
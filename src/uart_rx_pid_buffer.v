@@ -20,22 +20,37 @@ module UartRxPidBuffer(
     localparam START_FRAME = 8'hAA;
     localparam END_FRAME   = 8'h55;
 
+    // Burst frames: START PID <4 or 8 bytes, MSB first> END
+    localparam A1_WORD_PID = 8'h30;   // a1
+    localparam A2_WORD_PID = 8'h31;   // a2
+    localparam AB_WORD_PID = 8'h32;   // a1 then a2
+
     // FSM states
-    localparam IDLE      = 2'd0;
-    localparam GOT_START = 2'd1;   // got start delimiter, expect PID
-    localparam GOT_PID   = 2'd2;   // got PID, expect VALUE
-    localparam GOT_VAL   = 2'd3;   // got VALUE, expect END
+    localparam IDLE      = 3'd0;
+    localparam GOT_START = 3'd1;   // got start delimiter, expect PID
+    localparam GOT_PID   = 3'd2;   // got PID, expect VALUE
+    localparam GOT_VAL   = 3'd3;   // got VALUE, expect END
+    localparam GOT_WORD  = 3'd4;   // got burst PID, collecting word bytes
 
-    reg [1:0] state;
+    reg [2:0] state;
     reg [7:0] pid_byte;
     reg [7:0] value_byte;
 
+    reg [63:0] word_buf;           // burst payload, last byte in [7:0]
+    reg [2:0]  word_left;          // burst bytes still expected after this one
+
     reg [7:0] a1_bytes [3:0];
     reg [7:0] a2_bytes [3:0];
 
     reg [3:0] a1_written;
     reg [3:0] a2_written;
 
+    // Next-state copies of the written flags, only used inside the FSM.
+    // Declared here rather than in the unnamed begin block, which is an
+    // Icarus/SystemVerilog extension Verilog-2005 tools reject.
+    reg [3:0] a1_written_n;
+    reg [3:0] a2_written_n;
+
     reg set_ready;
     reg set_ready_ff;
 
@@ -47,6 +62,8 @@ module UartRxPidBuffer(
             state        <= IDLE;
             pid_byte     <= 8'h00;
             value_byte   <= 8'h00;
+            word_buf     <= 64'h0;
+            word_left    <= 3'd0;
             a1_bytes[0]  <= 8'h00; a1_bytes[1] <= 8'h00;
             a1_bytes[2]  <= 8'h00; a1_bytes[3] <= 8'h00;
             a2_bytes[0]  <= 8'h00; a2_bytes[1] <= 8'h00;
@@ -66,7 +83,22 @@ module UartRxPidBuffer(
                     //--------------------------------------------------
                     GOT_START:  begin
                                     pid_byte <= rx_byte; // latch PID
-                                    state    <= GOT_PID;
+                                    if (rx_byte == A1_WORD_PID || rx_byte == A2_WORD_PID) begin
+                                        word_left <= 3'd3;
+                                        state     <= GOT_WORD;
+                                    end else if (rx_byte == AB_WORD_PID) begin
+                                        word_left <= 3'd7;
+                                        state     <= GOT_WORD;
+                                    end else
+                                        state     <= GOT_PID;
+                                 end
+
+                    //--------------------------------------------------
+                    GOT_WORD:   begin
+                                    word_buf  <= {word_buf[55:0], rx_byte};
+                                    word_left <= word_left - 3'd1;
+                                    if (word_left == 3'd0)
+                                        state <= GOT_VAL;
                                  end
 
                     //--------------------------------------------------
@@ -79,8 +111,6 @@ module UartRxPidBuffer(
                     GOT_VAL:    begin
                                     if (rx_byte == END_FRAME) begin
                                         // shadow copies so we can update & test in same cycle
-                                        reg [3:0] a1_written_n;
-                                        reg [3:0] a2_written_n;
                                         a1_written_n = a1_written;
                                         a2_written_n = a2_written;
 
@@ -97,6 +127,25 @@ module UartRxPidBuffer(
                                             8'h21: begin a2_bytes[2] <= value_byte; a2_written_n[2] = 1'b1; end
                                             8'h22: begin a2_bytes[1] <= value_byte; a2_written_n[1] = 1'b1; end
                                             8'h23: begin a2_bytes[0] <= value_byte; a2_written_n[0] = 1'b1; end
+                                            // ---- whole words
+                                            A1_WORD_PID: begin
+                                                a1_bytes[3] <= word_buf[31:24]; a1_bytes[2] <= word_buf[23:16];
+                                                a1_bytes[1] <= word_buf[15:8];  a1_bytes[0] <= word_buf[7:0];
+                                                a1_written_n = 4'hF;
+                                            end
+                                            A2_WORD_PID: begin
+                                                a2_bytes[3] <= word_buf[31:24]; a2_bytes[2] <= word_buf[23:16];
+                                                a2_bytes[1] <= word_buf[15:8];  a2_bytes[0] <= word_buf[7:0];
+                                                a2_written_n = 4'hF;
+                                            end
+                                            AB_WORD_PID: begin
+                                                a1_bytes[3] <= word_buf[63:56]; a1_bytes[2] <= word_buf[55:48];
+                                                a1_bytes[1] <= word_buf[47:40]; a1_bytes[0] <= word_buf[39:32];
+                                                a2_bytes[3] <= word_buf[31:24]; a2_bytes[2] <= word_buf[23:16];
+                                                a2_bytes[1] <= word_buf[15:8];  a2_bytes[0] <= word_buf[7:0];
+                                                a1_written_n = 4'hF;
+                                                a2_written_n = 4'hF;
+                                            end
                                             // ---- test frame (immediate ready)
                                             TEST_PID: begin
                                                 a1_bytes[0] <= value_byte;
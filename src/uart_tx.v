@@ -6,7 +6,8 @@
 module UartTx#(
     parameter CLK_FREQ = 50_000_000,        // System clock frequency in Hz
     parameter BAUD_RATE = 9600,             // Desired baud rate for UART
-    parameter FRAME_BITS = 8// Total bits in the frame (start + data + optional parity + stop)
+    parameter FRAME_BITS = 8,// Total bits in the frame (start + data + optional parity + stop)
+    parameter FRACTIONAL = 0                // 1: phase-accumulator bit timing, exact BAUD_RATE on average
 )(
     input wire clk,                         // System clock
     input wire rst,                         // Asynchronous reset
@@ -20,6 +21,15 @@ module UartTx#(
     // Compute clocks per bit based on baud rate
     localparam CLKS_PER_BIT = CLK_FREQ / BAUD_RATE;
 
+    // Fractional timing: a bit ends on each carry out of a phase accumulator
+    // stepping by BAUD_RATE / CLK_FREQ * 2**ACC_BITS, so bit edges are never
+    // more than a clock away from the ideal ones
+    localparam ACC_BITS = 32;
+    localparam [ACC_BITS:0]   ACC_INC =
+        (((64'd1 * BAUD_RATE) << ACC_BITS) + CLK_FREQ / 2) / CLK_FREQ;
+    reg  [ACC_BITS-1:0] phase = 0;
+    wire [ACC_BITS:0]   phase_next = {1'b0, phase} + ACC_INC;
+
      
     localparam BIT_INDEX_WIDTH = 4;
     reg [15:0] clk_count = 0;  // Counts clock cycles per bit
@@ -32,12 +42,15 @@ module UartTx#(
                TRANS = 2'd1,
                DONE  = 2'd2;
 
+    wire bit_end = FRACTIONAL ? phase_next[ACC_BITS] : (clk_count >= CLKS_PER_BIT - 1);
+
     always @(posedge clk or posedge rst) begin
         if (rst) begin
             tx <= 1'b1;          // Idle state is high
             tx_busy <= 0;
             tx_done <= 0;
             clk_count <= 0;
+            phase <= 0;
             bit_index <= 0;
             tx_shift_reg <= 0;
             state <= IDLE;
@@ -50,13 +63,15 @@ module UartTx#(
                         tx_shift_reg <= frame_data;  // Load frame
                         tx_busy <= 1;
                         clk_count <= 0;
+                        phase <= 0;
                         bit_index <= 0;
                         state <= TRANS;
                     end
                 end
                 TRANS: begin
                     tx <= tx_shift_reg[bit_index];  // Output current bit
-                    if (clk_count < CLKS_PER_BIT - 1) begin
+                    phase <= phase_next[ACC_BITS-1:0];
+                    if (!bit_end) begin
                         clk_count <= clk_count + 1;
                     end else begin
                         clk_count <= 0;
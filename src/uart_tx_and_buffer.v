@@ -4,12 +4,16 @@
 // Created: 2025-05-11 20:06:14
 // ====================================
 
-module UartTxAndPidBuffer(
+module UartTxAndPidBuffer#(
+    parameter CLK_FREQ = 50_000_000,
+    parameter BAUD_RATE = 9600
+)(
     input wire clk,
     input wire rst,
     input wire rx,
     output wire [31:0] a1,
     output wire [31:0] a2,
+    output wire ready,
     output wire test
 
 );
@@ -20,8 +24,8 @@ module UartTxAndPidBuffer(
     wire        rx_busy;
 
     UartRx #(
-        .CLK_FREQ(50_000_000),
-        .BAUD_RATE(9600),
+        .CLK_FREQ(CLK_FREQ),
+        .BAUD_RATE(BAUD_RATE),
         .FRAME_BITS(8)
     ) uart_rx_inst (
         .clk(clk),
@@ -0,0 +1,108 @@
+// ====================================
+// File: uart_tx_pid_fifo.v
+// Author: jaimebw
+// Created: 2026-10-18 10:43:44
+// ====================================
+// Queued variant of UartTxPidBuffer: same frames (START, PID, 4 bytes LSB
+// first, END) and the same UartTx handshake, but words are queued in a small
+// FIFO while a frame is on the line, and bytes go out back to back.
+//
+// - tx_valid pushes {test, tx_float} whenever tx_ready is high (not full);
+//   test is taken with the word, not when the frame starts.
+// - The frame being sent lives in its own register, so the FIFO holds
+//   2**DEPTH_LOG2 more words (ping-pong plus one with the default of 1).
+// - A byte is issued on the first edge the UART is free, with no load state
+//   in between; wait_busy covers the clock before UartTx raises tx_busy.
+
+module UartTxPidFifo#(
+    parameter DEPTH_LOG2 = 1            // log2 of the queued words, at least 1
+)(
+    input  wire        clk,
+    input  wire        rst,
+    input  wire [31:0] tx_float,     // Word to send over UART
+    input  wire        tx_valid,     // Push tx_float (ignored while full)
+    input  wire        tx_busy,      // UART core busy flag
+    input  wire        test,         // Test vs normal PID select, per word
+    output reg  [7:0]  tx_data,      // Byte presented to UART
+    output reg         tx_start,     // Pulse to the UART for each byte
+    output wire        tx_ready,     // A tx_valid word is accepted this cycle
+    output wire        full          // FIFO full, tx_valid is dropped
+);
+
+    // Frame constants
+    localparam START_DEL   = 8'hAA;
+    localparam END_DEL     = 8'h55;
+    localparam TEST_PID    = 8'h42;
+    localparam DATA_PID    = 8'h69;
+    localparam DEPTH       = 1 << DEPTH_LOG2;
+
+    // Word FIFO: {test, word}, pointers one bit wider than the index
+    reg [32:0]           fifo [0:DEPTH-1];
+    reg [DEPTH_LOG2:0]   wr_ptr;
+    reg [DEPTH_LOG2:0]   rd_ptr;
+
+    wire empty = (wr_ptr == rd_ptr);
+    assign full     = (wr_ptr[DEPTH_LOG2] != rd_ptr[DEPTH_LOG2]) &&
+                      (wr_ptr[DEPTH_LOG2-1:0] == rd_ptr[DEPTH_LOG2-1:0]);
+    assign tx_ready = !full;
+
+    // Frame on the line
+    reg        sending;              // bytes of word left to issue
+    reg [2:0]  byte_index;
+    reg [31:0] word;
+    reg        word_test;
+    reg        wait_busy;            // tx_start issued, UartTx not busy yet
+
+    wire uart_free = !tx_busy && !wait_busy;
+
+    always @(posedge clk or posedge rst) begin
+        if (rst) begin
+            wr_ptr     <= 0;
+            rd_ptr     <= 0;
+            sending    <= 1'b0;
+            byte_index <= 3'd0;
+            word       <= 32'h0;
+            word_test  <= 1'b0;
+            wait_busy  <= 1'b0;
+            tx_data    <= 8'h00;
+            tx_start   <= 1'b0;
+        end else begin
+            tx_start <= 1'b0;
+
+            // Push
+            if (tx_valid && !full) begin
+                fifo[wr_ptr[DEPTH_LOG2-1:0]] <= {test, tx_float};
+                wr_ptr <= wr_ptr + 1'b1;
+            end
+
+            if (tx_busy)
+                wait_busy <= 1'b0;
+
+            if (!sending) begin
+                // Pop the next word, the previous END may still be on the line
+                if (!empty) begin
+                    {word_test, word} <= fifo[rd_ptr[DEPTH_LOG2-1:0]];
+                    rd_ptr     <= rd_ptr + 1'b1;
+                    byte_index <= 3'd0;
+                    sending    <= 1'b1;
+                end
+            end else if (uart_free) begin
+                case (byte_index)
+                    3'd0: tx_data <= START_DEL;
+                    3'd1: tx_data <= word_test ? TEST_PID : DATA_PID;
+                    3'd2: tx_data <= word[7:0];
+                    3'd3: tx_data <= word[15:8];
+                    3'd4: tx_data <= word[23:16];
+                    3'd5: tx_data <= word[31:24];
+                    default: tx_data <= END_DEL;
+                endcase
+                tx_start   <= 1'b1;
+                wait_busy  <= 1'b1;
+                byte_index <= byte_index + 1'b1;
+                if (byte_index == 3'd6)
+                    sending <= 1'b0;
+            end
+        end
+    end
+
+endmodule
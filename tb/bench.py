@@ -0,0 +1,186 @@
+# ====================================
+# File: bench.py
+# Author: jaimebw
+# Created: 2026-10-18 10:23:04
+# ====================================
+"""Simulation performance benchmarks with history and baseline comparison.
+
+Runs the workloads in tb/perf_workloads.py one after the other and records
+wall time, simulated time, clock cycles, cycles/s and simulator callbacks per
+cycle into results/bench/<timestamp>/bench.json, plus one line per run in
+results/bench/history.jsonl.
+
+    python tb/bench.py run [--scale 0.2] [-k uart]
+    python tb/bench.py compare [RESULTS]     # latest run vs tb/perf_baseline.json
+    python tb/bench.py baseline [RESULTS]    # make a run the stored baseline
+    python tb/bench.py history [-n 10]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.perf import compare, format_comparison, read_records
+from tblib.regression import execute_job
+from tblib.runner import resolve_simulator
+
+TB_DIR = Path(__file__).resolve().parent
+ROOT = TB_DIR.parent
+BENCH_DIR = ROOT / "results" / "bench"
+HISTORY_FILE = BENCH_DIR / "history.jsonl"
+BASELINE_FILE = TB_DIR / "perf_baseline.json"
+NAN = float("nan")
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_results(path=None):
+    """A results file, or the latest run in the history when *path* is None"""
+    if path is not None:
+        return json.loads(Path(path).read_text())
+    if not HISTORY_FILE.exists():
+        sys.exit(f"No benchmark history yet ({HISTORY_FILE}), run 'bench.py run' first")
+    lines = HISTORY_FILE.read_text().splitlines()
+    return json.loads(lines[-1])
+
+
+def format_results(results):
+    lines = [f"{'workload':24} {'items':>8} {'wall s':>8} {'sim ms':>10} {'cycles/s':>12} "
+             f"{'items/s':>10} {'cb/cycle':>8}"]
+    for name, m in results["workloads"].items():
+        # Unclocked workloads have no cycle figures: nan
+        lines.append(f"{name:24} {m['items']:8} {m['wall_s']:8.2f} {m['sim_ns'] / 1e6:10.3f} "
+                     f"{m.get('cycles_per_s', NAN):12.0f} {m['items_per_s']:10.0f} "
+                     f"{m.get('callbacks_per_cycle', NAN):8.2f}")
+    return "\n".join(lines)
+
+
+# ----------------------------------------------------------------
+# Subcommands
+# ----------------------------------------------------------------
+def cmd_run(args):
+    from perf_workloads import PERF_JOBS
+
+    jobs = [job for job in PERF_JOBS if args.filter in job.name]
+    if not jobs:
+        sys.exit(f"No workloads match {args.filter!r}")
+
+    out_dir = args.out or BENCH_DIR / time.strftime("%Y%m%d-%H%M%S")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    records_file = out_dir / "records.jsonl"
+    os.environ["PERF_OUT"] = str(records_file)
+    os.environ["PERF_SCALE"] = str(args.scale)
+    os.environ["WAVES_ON_FAIL"] = "0"
+
+    failed = []
+    for job in jobs:  # one at a time, parallel jobs would skew the timings
+        result = execute_job(job, out_dir / f"{job.name}_{job.build_tag()}", {})
+        print(f"{'PASS' if result.passed else 'FAIL':4}  {job.name}", flush=True)
+        if not result.passed:
+            failed.append(job.name)
+
+    records = read_records(records_file) if records_file.exists() else []
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "simulator": resolve_simulator(),
+            "scale": args.scale,
+            "host": platform.node(),
+            "python": platform.python_version(),
+        },
+        "workloads": {r.pop("name"): r for r in records},
+    }
+    (out_dir / "bench.json").write_text(json.dumps(results, indent=2))
+    if records:
+        BENCH_DIR.mkdir(parents=True, exist_ok=True)
+        with open(HISTORY_FILE, "a") as f:
+            f.write(json.dumps(results) + "\n")
+
+    print(format_results(results))
+    print(f"-> {out_dir / 'bench.json'}")
+    if failed:
+        sys.exit(f"Failed workloads (not recorded): {', '.join(failed)}")
+
+
+def cmd_compare(args):
+    results = load_results(args.results)
+    baseline_file = args.baseline or BASELINE_FILE
+    if not Path(baseline_file).exists():
+        sys.exit(f"No baseline at {baseline_file}, store one with 'bench.py baseline'")
+    baseline = json.loads(Path(baseline_file).read_text())
+
+    for key in ("scale", "simulator"):
+        if results["meta"].get(key) != baseline["meta"].get(key):
+            print(f"warning: {key} differs from the baseline "
+                  f"({results['meta'].get(key)} vs {baseline['meta'].get(key)})")
+
+    rows = compare(results["workloads"], baseline["workloads"], threshold=args.threshold)
+    print(format_comparison(rows))
+    regressed = sorted({row[0] for row in rows if row[5]})
+    if regressed:
+        sys.exit(f"Regressions over {args.threshold:.0%}: {', '.join(regressed)}")
+
+
+def cmd_baseline(args):
+    results = load_results(args.results)
+    BASELINE_FILE.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"Baseline ({results['meta']['timestamp']}, {results['meta']['revision']}) -> {BASELINE_FILE}")
+
+
+def cmd_history(args):
+    if not HISTORY_FILE.exists():
+        sys.exit(f"No benchmark history yet ({HISTORY_FILE})")
+    runs = [json.loads(line) for line in HISTORY_FILE.read_text().splitlines()][-args.n:]
+    print(f"{'timestamp':20} {'revision':10} {'workload':24} {'wall s':>8} {'cycles/s':>12} {'cb/cycle':>8}")
+    for run in runs:
+        meta = run["meta"]
+        for name, m in run["workloads"].items():
+            if args.filter in name:
+                print(f"{meta['timestamp']:20} {meta['revision'] or '-':10} {name:24} "
+                      f"{m['wall_s']:8.2f} {m.get('cycles_per_s', NAN):12.0f} "
+                      f"{m.get('callbacks_per_cycle', NAN):8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the workloads and record the results")
+    run.add_argument("-k", "--filter", default="", help="only workloads whose name contains this")
+    run.add_argument("--scale", type=float, default=1.0, help="multiply every workload's item count")
+    run.add_argument("--out", type=Path, help="output directory (default: results/bench/<timestamp>)")
+    run.set_defaults(func=cmd_run)
+
+    cmp = sub.add_parser("compare", help="compare a run against the baseline, exit 1 on regressions")
+    cmp.add_argument("results", nargs="?", help="bench.json to check (default: latest run)")
+    cmp.add_argument("--baseline", help=f"baseline file (default: {BASELINE_FILE.name})")
+    cmp.add_argument("--threshold", type=float, default=0.10, help="allowed growth (default: 0.10)")
+    cmp.set_defaults(func=cmd_compare)
+
+    base = sub.add_parser("baseline", help="store a run as the baseline")
+    base.add_argument("results", nargs="?", help="bench.json to store (default: latest run)")
+    base.set_defaults(func=cmd_baseline)
+
+    hist = sub.add_parser("history", help="show the recorded runs")
+    hist.add_argument("-n", type=int, default=10, help="last N runs (default: 10)")
+    hist.add_argument("-k", "--filter", default="", help="only workloads whose name contains this")
+    hist.set_defaults(func=cmd_history)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
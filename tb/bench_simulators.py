@@ -0,0 +1,119 @@
+# ====================================
+# File: bench_simulators.py
+# Author: jaimebw
+# Created: 2026-10-18 10:21:23
+# ====================================
+"""Run the same jobs on every installed simulator and compare them.
+
+For each job and simulator: a cold compile (build directory wiped, compile
+cache bypassed), then the cocotb tests on that build. Reports compile time,
+simulation time and simulated clock cycles per second, and picks the
+fastest backend per job.
+
+    python tb/bench_simulators.py                       # all jobs, all simulators found
+    python tb/bench_simulators.py -k uart --sims icarus verilator
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.config import CLK_PERIOD_NS
+from tblib.regression import discover_jobs, execute_job
+from tblib.runner import SIMULATORS
+
+ROOT = Path(__file__).resolve().parent.parent
+EXECUTABLES = {"icarus": "iverilog", "verilator": "verilator"}
+
+
+def available_simulators():
+    return [sim for sim in SIMULATORS if shutil.which(EXECUTABLES[sim])]
+
+
+def bench_job(job, simulator, build_dir):
+    """Cold compile + run of *job* on *simulator*; returns one result row"""
+    os.environ["SIM"] = simulator
+    shutil.rmtree(build_dir, ignore_errors=True)
+
+    compiled = execute_job(job, build_dir, {"compile_only": True})
+    result = execute_job(job, build_dir, {})
+
+    sim_time_s = sum(t["wall_time_s"] for t in result.tests)
+    cycles = sum(t["sim_time_ns"] for t in result.tests) / CLK_PERIOD_NS
+    return {
+        "job": job.name,
+        "simulator": simulator,
+        "passed": result.passed,
+        "compile_s": compiled.wall_time_s,
+        "run_s": result.wall_time_s,
+        "sim_s": sim_time_s,
+        "cycles": cycles,
+        "cycles_per_s": cycles / sim_time_s if sim_time_s else 0.0,
+        "error": result.error,
+    }
+
+
+def fastest(rows):
+    """Per job: the passing simulator with the lowest sim time and lowest compile + run"""
+    picks = {}
+    for name in dict.fromkeys(row["job"] for row in rows):
+        passing = [r for r in rows if r["job"] == name and r["passed"]]
+        if passing:
+            picks[name] = {
+                "run": min(passing, key=lambda r: r["sim_s"])["simulator"],
+                "total": min(passing, key=lambda r: r["compile_s"] + r["run_s"])["simulator"],
+            }
+    return picks
+
+
+def format_row(row):
+    status = "PASS" if row["passed"] else "FAIL"
+    return (f"{row['job']:32} {row['simulator']:10} {status:4} {row['compile_s']:9.2f} "
+            f"{row['run_s']:9.2f} {row['sim_s']:9.2f} {row['cycles']:14.0f} {row['cycles_per_s']:14.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--filter", default="", help="only jobs whose name contains this")
+    parser.add_argument("--sims", nargs="+", choices=SIMULATORS,
+                        help="simulators to compare (default: every one installed)")
+    parser.add_argument("--out", type=Path, help="output directory (default: results/bench_simulators/<timestamp>)")
+    args = parser.parse_args()
+
+    simulators = args.sims or available_simulators()
+    missing = [sim for sim in simulators if not shutil.which(EXECUTABLES[sim])]
+    if missing or not simulators:
+        sys.exit(f"Simulator not installed: {', '.join(missing) or 'none found'}")
+    jobs = [job for job in discover_jobs() if args.filter in job.name]
+    if not jobs:
+        sys.exit(f"No jobs match {args.filter!r}")
+
+    # Measure real compiles and plain runs
+    os.environ["SIM_CACHE"] = "0"
+    os.environ["WAVES_ON_FAIL"] = "0"
+    out_dir = args.out or ROOT / "results" / "bench_simulators" / time.strftime("%Y%m%d-%H%M%S")
+
+    print(f"{'job':32} {'simulator':10} {'':4} {'compile s':>9} {'run s':>9} {'sim s':>9} "
+          f"{'cycles':>14} {'cycles/s':>14}")
+    rows = []
+    for job in jobs:
+        for simulator in simulators:
+            row = bench_job(job, simulator, out_dir / simulator / job.name)
+            rows.append(row)
+            print(format_row(row), flush=True)
+
+    picks = fastest(rows)
+    print()
+    for name, pick in picks.items():
+        print(f"{name:32} fastest run: {pick['run']:10} fastest compile+run: {pick['total']}")
+
+    (out_dir / "bench.json").write_text(json.dumps({"rows": rows, "fastest": picks}, indent=2))
+    print(f"-> {out_dir / 'bench.json'}")
+
+
+if __name__ == "__main__":
+    main()
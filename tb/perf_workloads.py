@@ -0,0 +1,189 @@
+# ====================================
+# File: perf_workloads.py
+# Author: jaimebw
+# Created: 2026-10-18 10:22:37
+# ====================================
+# Benchmark workloads, one per DUT, run by tb/bench.py (not part of the
+# regression). Each streams PERF_SCALE x its default item count through the
+# DUT inside a PerfProbe and checks the result once at the end.
+
+import os
+import cocotb
+import numpy as np
+from cocotb.triggers import ClockCycles, Event, ReadOnly, RisingEdge
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.config import bit_time_ns, dut_parameter, uart_parameters
+from tblib.control_law_model import control_law, random_vectors, to_int32, verilog_q16
+from tblib.harness import reset, start_clock
+from tblib.perf import PerfProbe
+from tblib.pid_codec import encode_rx_words, encode_tx_words
+from tblib.runner import SRC_DIR, SimJob
+from tblib.uart import UartSource
+from tblib.vectors import drive_vectors
+from tblib.profiling import install_from_env
+
+install_from_env()  # TB_PROFILE=1: profile this run, see tblib/profiling.py
+
+PERF_SCALE = float(os.getenv("PERF_SCALE", "1"))
+PERF_SEED = 1234  # fixed, every run streams the same items
+
+
+def n_items(default):
+    return max(1, int(default * PERF_SCALE))
+
+
+@cocotb.test()
+async def uart_rx_stream(dut):
+    """UartRx: back-to-back bytes from the UART source"""
+    n = n_items(2000)
+    payload = np.random.default_rng(PERF_SEED).integers(0, 256, n, dtype=np.uint8).tobytes()
+    start_clock(dut)
+    source = UartSource(dut.rx, bit_time_ns(dut))
+    await reset(dut)
+
+    received = bytearray()
+
+    async def collect():
+        rx_done = RisingEdge(dut.rx_done)
+        for _ in range(n):
+            await rx_done
+            received.append(int(dut.rx_data.value))
+
+    with PerfProbe("uart_rx_stream", n):
+        collector = cocotb.start_soon(collect())
+        await source.send(payload, idle_bits=1)
+        await collector
+
+    assert bytes(received) == payload
+
+
+@cocotb.test()
+async def pid_buffer_frames(dut):
+    """UartRxPidBuffer: 4-byte lane frames, 8 per (a1, a2) update"""
+    n_updates = n_items(500)
+    words = np.random.default_rng(PERF_SEED).integers(0, 1 << 32, (n_updates, 2), dtype=np.uint64)
+    start_clock(dut)
+    await reset(dut)
+
+    stream = encode_rx_words(words[:, 0].tolist(), words[:, 1].tolist())
+
+    updates = []
+
+    async def collect():
+        ready = RisingEdge(dut.ready)
+        for _ in range(n_updates):
+            await ready
+            await ReadOnly()
+            updates.append((int(dut.a1.value), int(dut.a2.value)))
+
+    with PerfProbe("pid_buffer_frames", n_updates * 8):
+        collector = cocotb.start_soon(collect())
+        clk = RisingEdge(dut.clk)
+        for byte in stream:
+            dut.rx_byte.value = byte
+            dut.rx_done.value = 1
+            await clk
+            dut.rx_done.value = 0
+            await clk
+        await ClockCycles(dut.clk, 4)
+        await collector
+
+    assert updates == [tuple(w) for w in words.tolist()]
+
+
+@cocotb.test()
+async def tx_pid_buffer_words(dut):
+    """UartTxPidBuffer: 32-bit words against a modelled UART busy handshake"""
+    n = n_items(500)
+    busy_cycles = 4
+    words = np.random.default_rng(PERF_SEED).integers(0, 1 << 32, n, dtype=np.uint64).tolist()
+    start_clock(dut)
+    dut.test.value = 0
+    dut.tx_valid.value = 0
+    dut.tx_busy.value = 0
+    await reset(dut)
+
+    sent = []
+    frame_done = Event()
+
+    async def uart_model():
+        tx_start = RisingEdge(dut.tx_start)
+        clk = RisingEdge(dut.clk)
+        while True:
+            await tx_start
+            await ReadOnly()
+            sent.append(int(dut.tx_data.value))
+            await clk
+            dut.tx_busy.value = 1
+            await ClockCycles(dut.clk, busy_cycles)
+            dut.tx_busy.value = 0
+            if len(sent) % 7 == 0:
+                frame_done.set()
+
+    with PerfProbe("tx_pid_buffer_words", n):
+        model = cocotb.start_soon(uart_model())
+        clk = RisingEdge(dut.clk)
+        for word in words:
+            frame_done.clear()
+            dut.tx_float.value = word
+            dut.tx_valid.value = 1
+            await clk
+            dut.tx_valid.value = 0
+            await frame_done.wait()
+            await clk
+        model.kill()
+
+    assert bytes(sent) == encode_tx_words(words)
+
+
+@cocotb.test()
+async def control_law_vectors(dut):
+    """LandauControlLaw: random vectors, one per ns"""
+    n = n_items(50000)
+    batch = random_vectors(np.random.default_rng(PERF_SEED), n)
+    k1 = to_int32(dut_parameter(dut, "K1"))
+    k2 = to_int32(dut_parameter(dut, "K2"))
+
+    # Combinational, no clock: vectors/s, not cycles/s
+    with PerfProbe("control_law_vectors", n, clocked=False):
+        raw, xmask = await drive_vectors(dut, batch, "b")
+
+    expected = control_law(batch["a1"], batch["a2"], batch["test"], k1, k2)
+    assert not xmask.any()
+    assert np.array_equal(raw.astype(np.uint32).view(np.int32), expected)
+
+
+PERF_JOBS = [
+    SimJob(
+        name="perf_uart_rx_stream",
+        toplevel="UartRx",
+        module=Path(__file__).stem,
+        testcase="uart_rx_stream",
+        verilog_sources=[SRC_DIR / "uart_rx.v"],
+        parameters=uart_parameters(),
+    ),
+    SimJob(
+        name="perf_pid_buffer_frames",
+        toplevel="UartRxPidBuffer",
+        module=Path(__file__).stem,
+        testcase="pid_buffer_frames",
+        verilog_sources=[SRC_DIR / "uart_rx_pid_buffer.v"],
+    ),
+    SimJob(
+        name="perf_tx_pid_buffer_words",
+        toplevel="UartTxPidBuffer",
+        module=Path(__file__).stem,
+        testcase="tx_pid_buffer_words",
+        verilog_sources=[SRC_DIR / "uart_tx_pid_buffer.v"],
+    ),
+    SimJob(
+        name="perf_control_law_vectors",
+        toplevel="LandauControlLaw",
+        module=Path(__file__).stem,
+        testcase="control_law_vectors",
+        verilog_sources=[SRC_DIR / "control_law.v"],
+        parameters={"K1": verilog_q16(-13107), "K2": verilog_q16(-26214)},
+    ),
+]
@@ -0,0 +1,83 @@
+# ====================================
+# File: regress.py
+# Author: jaimebw
+# Created: 2026-10-18 10:15:17
+# ====================================
+"""Run every job declared in tb/test_*.py (their JOBS lists) on a process pool.
+
+Each job gets its own build/results directory under --out, and the results
+are aggregated into report.xml (JUnit) and summary.json.
+
+    python tb/regress.py                 # all jobs, one worker per core
+    python tb/regress.py -j 8 -k uart    # jobs whose name contains "uart"
+    python tb/regress.py --sim verilator # same jobs on Verilator
+    python tb/regress.py --changed main  # only jobs affected by the diff against main
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.regression import (default_workers, discover_jobs, format_result,
+                              format_summary, run_jobs, write_report)
+from tblib.config import RX_LEVELS
+from tblib.deps import changed_files, select_jobs
+from tblib.runner import SIMULATORS
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-j", "--jobs", type=int, default=default_workers(),
+                        help="parallel workers (default: available cores)")
+    parser.add_argument("-k", "--filter", default="", help="only run jobs whose name contains this")
+    parser.add_argument("--out", type=Path, help="output directory (default: results/regression/<timestamp>)")
+    parser.add_argument("--sim", choices=SIMULATORS,
+                        help="simulator for every job (default: SIM, else icarus)")
+    parser.add_argument("--rx-level", choices=RX_LEVELS,
+                        help="level of the UartTxAndPidBuffer jobs (default: SIM_RX_LEVEL, else tlm)")
+    parser.add_argument("--changed", nargs="?", const="HEAD", metavar="REF",
+                        help="only jobs whose dependencies changed against REF (default: HEAD)")
+    parser.add_argument("--files", nargs="+", type=Path, metavar="FILE",
+                        help="only jobs whose dependencies include one of these files")
+    parser.add_argument("--list", action="store_true", help="list the jobs and exit")
+    args = parser.parse_args()
+
+    if args.sim:
+        os.environ["SIM"] = args.sim  # read by the runner, inherited by the workers
+    if args.rx_level:
+        os.environ["SIM_RX_LEVEL"] = args.rx_level  # read when the JOBS lists are built
+
+    jobs = [job for job in discover_jobs() if args.filter in job.name]
+    if args.changed or args.files:
+        changed = args.files or changed_files(args.changed)
+        selected, reason = select_jobs(jobs, changed)
+        print(f"Selected {len(selected)}/{len(jobs)} jobs ({reason})")
+        jobs = selected
+        if not jobs:
+            return
+    if args.list:
+        for job in jobs:
+            print(f"{job.name:32} {job.toplevel:24} {job.module:28} {job.parameters}")
+        return
+    if not jobs:
+        sys.exit(f"No jobs match {args.filter!r}")
+
+    out_dir = args.out or ROOT / "results" / "regression" / time.strftime("%Y%m%d-%H%M%S")
+    print(f"Running {len(jobs)} jobs on {min(args.jobs, len(jobs))} workers -> {out_dir}")
+
+    start = time.perf_counter()
+    results = run_jobs(jobs, out_dir, workers=args.jobs,
+                       on_result=lambda r: print(format_result(r), flush=True))
+    wall_time_s = time.perf_counter() - start
+
+    write_report(results, out_dir, wall_time_s)
+    print(format_summary(results, wall_time_s))
+    sys.exit(0 if all(r.passed for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
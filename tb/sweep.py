@@ -0,0 +1,71 @@
+# ====================================
+# File: sweep.py
+# Author: jaimebw
+# Created: 2026-10-18 10:34:23
+# ====================================
+"""Run the parameter sweeps declared in tb/test_*.py (their SWEEPS lists).
+
+Every distinct build of a sweep is compiled once, its points then run on the
+same worker pool. The pass/fail and timing grid is printed and written to
+--out as grid.csv and sweep.json.
+
+    python tb/sweep.py --list            # sweeps and their number of points/builds
+    python tb/sweep.py -k uart_rx -j 16  # sweeps whose name contains "uart_rx"
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.regression import default_workers, discover, status
+from tblib.runner import SIMULATORS, resolve_simulator
+from tblib.sweep import (format_grid, format_sweep_summary, group_builds, run_sweep,
+                         write_sweep_report)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-j", "--jobs", type=int, default=default_workers(),
+                        help="parallel workers (default: available cores)")
+    parser.add_argument("-k", "--filter", default="", help="only run sweeps whose name contains this")
+    parser.add_argument("--out", type=Path, help="output directory (default: results/sweep/<timestamp>)")
+    parser.add_argument("--sim", choices=SIMULATORS,
+                        help="simulator for every point (default: SIM, else icarus)")
+    parser.add_argument("--list", action="store_true", help="list the sweeps and exit")
+    args = parser.parse_args()
+
+    if args.sim:
+        os.environ["SIM"] = args.sim  # read by the runner, inherited by the workers
+
+    sweeps = [sweep for sweep in discover("SWEEPS") if args.filter in sweep.name]
+    if not sweeps:
+        sys.exit(f"No sweeps match {args.filter!r}")
+    jobs = [entry for sweep in sweeps for entry in sweep.jobs()]
+    if args.list:
+        for sweep in sweeps:
+            sweep_jobs = [job for job, _ in sweep.jobs()]
+            n_builds = len(group_builds(sweep_jobs, resolve_simulator()))
+            print(f"{sweep.name:24} {sweep.toplevel:20} {len(sweep_jobs):5} points "
+                  f"{n_builds:5} builds  axes: {', '.join(sweep.axes())}")
+        return
+
+    out_dir = args.out or ROOT / "results" / "sweep" / time.strftime("%Y%m%d-%H%M%S")
+    print(f"Sweeping {len(jobs)} points on {min(args.jobs, len(jobs))} workers -> {out_dir}")
+
+    start = time.perf_counter()
+    results = run_sweep(jobs, out_dir, workers=args.jobs,
+                        on_result=lambda r: print(f"{status(r.job):4}  {r.job.name}", flush=True))
+    wall_time_s = time.perf_counter() - start
+
+    write_sweep_report(results, out_dir, wall_time_s)
+    print(format_grid(results))
+    print(format_sweep_summary(results, wall_time_s))
+    sys.exit(0 if all(r.job.passed for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
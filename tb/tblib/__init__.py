@@ -0,0 +1,6 @@
+# ====================================
+# File: __init__.py
+# Author: jaimebw
+# Created: 2026-10-18 10:02:11
+# ====================================
+"""Shared helpers for the cocotb testbenches in tb/"""
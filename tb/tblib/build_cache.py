@@ -0,0 +1,197 @@
+# ====================================
+# File: build_cache.py
+# Author: jaimebw
+# Created: 2026-10-18 10:14:24
+# ====================================
+"""Content-addressed cache of compiled simulation images.
+
+An image is keyed by the hash of everything that changes the compiled
+output: Verilog source contents, toplevel, parameters, defines, timescale,
+extra compile arguments, include directories (and the files in them), waves
+instrumentation, any other compile-step keyword of cocotb-test and the
+simulator/cocotb versions. Any runner with the same key reuses the image
+instead of calling the compiler again.
+
+The cache lives in tb/.sim_cache (override with SIM_CACHE_DIR, SIM_CACHE=0
+bypasses it) and is pruned
+after every store: entries older than SIM_CACHE_MAX_AGE_DAYS go first, then the
+least recently used ones until the total is below SIM_CACHE_MAX_MB.
+
+    python -m tblib.build_cache --list | --prune | --clear    (from tb/)
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import cocotb
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[1] / ".sim_cache"
+DEFAULT_MAX_MB = 512
+DEFAULT_MAX_AGE_DAYS = 14
+
+VERSION_COMMANDS = {
+    "icarus": ["iverilog", "-V"],
+    "verilator": ["verilator", "--version"],
+}
+
+
+@functools.lru_cache(maxsize=None)
+def simulator_version(simulator):
+    """First line of the simulator's version banner ("unknown" if it is not installed)"""
+    cmd = VERSION_COMMANDS.get(simulator)
+    if cmd is None:
+        return "unknown"
+    try:
+        out = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    lines = (out.stdout or out.stderr).splitlines()
+    return lines[0].strip() if lines else "unknown"
+
+
+def build_key(verilog_sources, toplevel, parameters=None, defines=None,
+              timescale=None, compile_args=None, waves=False, simulator="icarus",
+              includes=None, **compile_kwargs):
+    """Hex digest identifying one compiled image.
+
+    *compile_kwargs* are the remaining cocotb-test arguments that reach the
+    compile step (extra_args, verilog_compile_args, ...); they are hashed by value.
+    """
+    h = hashlib.sha256()
+
+    def add(*parts):
+        for part in parts:
+            h.update(str(part).encode())
+            h.update(b"\0")
+
+    add("simulator", simulator, simulator_version(simulator), "cocotb", cocotb.__version__)
+    add("toplevel", toplevel, "timescale", timescale, "waves", bool(waves))
+    for name, value in sorted((parameters or {}).items()):
+        add("P", name, value)
+    for define in defines or []:
+        add("D", define)
+    for arg in compile_args or []:
+        add("A", arg)
+    for include in includes or []:
+        include = Path(include)
+        add("I", include)
+        # -I is not recursive: only the files directly in the directory
+        for header in sorted(include.iterdir()) if include.is_dir() else []:
+            if header.is_file():
+                add("H", header.name)
+                h.update(header.read_bytes())
+    for name, value in sorted(compile_kwargs.items()):
+        add("K", name, json.dumps(value, sort_keys=True, default=str))
+    for src in verilog_sources:
+        src = Path(src)
+        add("S", src.name)
+        h.update(src.read_bytes())
+    return h.hexdigest()[:32]
+
+
+class BuildCache:
+    """One directory per key holding the compiled image and a meta.json"""
+
+    def __init__(self, root=None, max_mb=None, max_age_days=None):
+        self.root = Path(root or os.getenv("SIM_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.max_bytes = int(float(max_mb or os.getenv("SIM_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 2**20)
+        self.max_age_s = float(max_age_days or os.getenv("SIM_CACHE_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS)) * 86400
+
+    def _entry(self, key):
+        return self.root / key
+
+    def fetch(self, key, image):
+        """Copy the cached image to *image*; False on a miss.
+
+        The copy gets a fresh mtime, so cocotb-test sees it as newer than the
+        sources and skips its own compile step.
+        """
+        entry = self._entry(key)
+        cached = entry / Path(image).name
+        try:
+            shutil.copyfile(cached, image)
+            os.utime(entry)  # LRU bookkeeping
+        except OSError:
+            return False
+        return True
+
+    def store(self, key, image, meta=None):
+        entry = self._entry(key)
+        entry.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=entry, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(image, tmp)
+        os.replace(tmp, entry / Path(image).name)
+        (entry / "meta.json").write_text(json.dumps(
+            {"created": time.time(), **(meta or {})}, indent=2, default=str))
+
+    def entries(self):
+        """(key, size in bytes, last use) for every cache entry"""
+        if not self.root.is_dir():
+            return []
+        result = []
+        for entry in self.root.iterdir():
+            if not entry.is_dir():
+                continue
+            try:
+                size = sum(f.stat().st_size for f in entry.iterdir())
+                result.append((entry.name, size, entry.stat().st_mtime))
+            except OSError:
+                continue  # removed by a concurrent prune
+        return result
+
+    def prune(self):
+        """Drop expired entries, then the least recently used until under the size limit"""
+        now = time.time()
+        kept = []
+        for key, size, used in self.entries():
+            if now - used > self.max_age_s:
+                shutil.rmtree(self._entry(key), ignore_errors=True)
+            else:
+                kept.append((used, size, key))
+
+        total = sum(size for _, size, _ in kept)
+        for used, size, key in sorted(kept):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--list", action="store_true", help="list cached images")
+    action.add_argument("--prune", action="store_true", help="apply the size/age limits now")
+    action.add_argument("--clear", action="store_true", help="delete the whole cache")
+    args = parser.parse_args()
+
+    cache = BuildCache()
+    if args.clear:
+        cache.clear()
+    elif args.prune:
+        cache.prune()
+    entries = cache.entries()
+    if args.list:
+        for key, size, used in sorted(entries, key=lambda e: e[2]):
+            meta_file = cache.root / key / "meta.json"
+            meta = json.loads(meta_file.read_text()) if meta_file.exists() else {}
+            print(f"{key}  {size / 1024:8.1f} KiB  {time.ctime(used)}  "
+                  f"{meta.get('toplevel', '?')} {meta.get('parameters', {})}")
+    total = sum(size for _, size, _ in entries)
+    print(f"{len(entries)} images, {total / 2**20:.1f} MiB in {cache.root}")
+
+
+if __name__ == "__main__":
+    main()
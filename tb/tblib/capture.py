@@ -0,0 +1,97 @@
+# ====================================
+# File: capture.py
+# Author: jaimebw
+# Created: 2026-10-18 10:27:23
+# ====================================
+"""Memory-mapped UART capture files for replay.
+
+Two formats are accepted:
+
+    raw      the received bytes, nothing else (any file without the magic)
+    timed    b"UARTCAP1", <I capture baud rate>, then one 5-byte record per
+             byte: <I idle time before the byte in microseconds>, <B byte>
+
+Readers never load the file: the mmap is walked in fixed-size chunks, so a
+multi-gigabyte capture replays in constant memory.
+"""
+
+import mmap
+import struct
+from pathlib import Path
+
+MAGIC = b"UARTCAP1"
+_HEADER = struct.Struct("<8sI")
+_RECORD = struct.Struct("<IB")
+
+
+class Capture:
+    """Read-only view of a capture file; use as a context manager"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        size = self.path.stat().st_size
+        # mmap refuses empty files
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.timed = size >= _HEADER.size and self._map[:len(MAGIC)] == MAGIC
+        if self.timed:
+            _, self.baud_rate = _HEADER.unpack_from(self._map)
+            self._offset = _HEADER.size
+            self.n_bytes = (size - _HEADER.size) // _RECORD.size
+        else:
+            self.baud_rate = None
+            self._offset = 0
+            self.n_bytes = size
+        if self._map is not None and hasattr(mmap, "MADV_SEQUENTIAL"):
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def chunks(self, size=1 << 16):
+        """Yield (data, gaps_us) per chunk of up to *size* bytes.
+
+        *data* is a memoryview into the map (valid until the next chunk);
+        *gaps_us* is None for raw captures, else the idle time before each byte.
+        """
+        if self._map is None:
+            return
+        view = memoryview(self._map)
+        try:
+            if not self.timed:
+                for start in range(0, self.n_bytes, size):
+                    with view[start:start + size] as data:
+                        yield data, None
+                return
+
+            for first in range(0, self.n_bytes, size):
+                count = min(size, self.n_bytes - first)
+                start = self._offset + first * _RECORD.size
+                with view[start:start + count * _RECORD.size] as records:
+                    gaps, data = zip(*_RECORD.iter_unpack(records))
+                yield bytes(data), gaps
+        finally:
+            view.release()
+
+
+def write_capture(path, data, gaps_us=None, baud_rate=9600):
+    """Write *data* as a raw capture, or as a timed one when *gaps_us* is given"""
+    with open(path, "wb") as f:
+        if gaps_us is None:
+            f.write(bytes(data))
+            return
+        if len(gaps_us) != len(data):
+            raise ValueError("one gap per byte")
+        f.write(_HEADER.pack(MAGIC, baud_rate))
+        record = bytearray(_RECORD.size)
+        for gap, byte in zip(gaps_us, data):
+            _RECORD.pack_into(record, 0, gap, byte)
+            f.write(record)
@@ -0,0 +1,142 @@
+# ====================================
+# File: config.py
+# Author: jaimebw
+# Created: 2026-10-18 10:02:11
+# ====================================
+"""Clock and baud-rate settings shared by the UART testbenches.
+
+The regression runs the UARTs at a scaled ("fast") baud rate so one bit costs
+FAST_CLKS_PER_BIT clock edges instead of ~5200. The nightly job sets
+SIM_BAUD_MODE=full to simulate the real 9600 baud configuration.
+
+Tests of the blocks behind UartRx run at transaction level by default: the
+harness drives the rx_data/rx_done boundary directly. SIM_RX_LEVEL=bit puts
+UartRx back in and serializes every bit, for sign-off.
+"""
+
+import json
+import os
+import re
+
+CLK_FREQ = 50_000_000
+CLK_PERIOD_NS = 1_000_000_000 // CLK_FREQ  # 20ns at 50MHz
+
+FULL_BAUD_RATE = 9600
+FAST_CLKS_PER_BIT = 16
+FAST_BAUD_RATE = CLK_FREQ // FAST_CLKS_PER_BIT  # 3.125 Mbaud
+
+BAUD_MODES = {
+    "fast": FAST_BAUD_RATE,
+    "full": FULL_BAUD_RATE,
+}
+
+
+def baud_mode():
+    """Return the baud mode selected through SIM_BAUD_MODE (default: fast)"""
+    mode = os.getenv("SIM_BAUD_MODE", "fast").lower()
+    if mode not in BAUD_MODES:
+        raise ValueError(f"SIM_BAUD_MODE must be one of {sorted(BAUD_MODES)}, got {mode!r}")
+    return mode
+
+
+RX_LEVELS = ("tlm", "bit")
+
+
+def rx_level():
+    """Return the level selected through SIM_RX_LEVEL (default: tlm)"""
+    level = os.getenv("SIM_RX_LEVEL", "tlm").lower()
+    if level not in RX_LEVELS:
+        raise ValueError(f"SIM_RX_LEVEL must be one of {list(RX_LEVELS)}, got {level!r}")
+    return level
+
+
+def uart_parameters(mode=None):
+    """Verilog parameter overrides for UartRx/UartTx in the given baud mode"""
+    mode = mode or baud_mode()
+    return {"CLK_FREQ": CLK_FREQ, "BAUD_RATE": BAUD_MODES[mode]}
+
+
+# ----------------------------------------------------------------
+# DUT side: derive the timing from the elaborated parameters, so the
+# Python side can never drift from what the runner passed in.
+# ----------------------------------------------------------------
+def dut_parameter(dut, name):
+    """Elaborated parameter value. Simulators that don't expose parameters
+    (Verilator) fall back to the overrides the runner passed in SIM_PARAMETERS.
+    """
+    try:
+        return int(getattr(dut, name).value)
+    except AttributeError:
+        overrides = json.loads(os.getenv("SIM_PARAMETERS", "{}"))
+        if name not in overrides:
+            raise
+        return verilog_int(overrides[name])
+
+
+_VERILOG_INT = re.compile(r"^(-)?(?:(\d+)?'(s)?([bodh]))?([0-9a-f_]+)$", re.IGNORECASE)
+_BASES = {"b": 2, "o": 8, "d": 10, "h": 16}
+
+
+def verilog_int(value):
+    """Python int from a parameter override: 9600, "32'sd65536", "32'shFFFFCCCD", "-32'sd13107" """
+    if isinstance(value, int):
+        return value
+    match = _VERILOG_INT.match(str(value).replace(" ", ""))
+    if not match:
+        raise ValueError(f"Not a Verilog integer literal: {value!r}")
+    neg, size, signed, base, digits = match.groups()
+    result = int(digits.replace("_", ""), _BASES[(base or "d").lower()])
+    if size:
+        bits = int(size)
+        result &= (1 << bits) - 1
+        if signed and result >> (bits - 1):
+            result -= 1 << bits
+    return -result if neg else result
+
+
+def clks_per_bit(dut):
+    return dut_parameter(dut, "CLK_FREQ") // dut_parameter(dut, "BAUD_RATE")
+
+
+def phase_timing(dut):
+    """True for a UartRx/UartTx built with FRACTIONAL=1 or OVERSAMPLE=1"""
+    for name in ("FRACTIONAL", "OVERSAMPLE"):
+        try:
+            if dut_parameter(dut, name):
+                return True
+        except AttributeError:   # not a parameter of this toplevel
+            pass
+    return False
+
+
+def bit_time_ns(dut):
+    """UART bit period of the DUT in ns: whole clocks per bit, or exactly
+    1 / BAUD_RATE with the phase-accumulator timing
+    """
+    if phase_timing(dut):
+        return 1e9 / dut_parameter(dut, "BAUD_RATE")
+    return clks_per_bit(dut) * CLK_PERIOD_NS
+
+
+# ----------------------------------------------------------------
+# Simulated-time budgets: pass to @cocotb.test(timeout_time=..., timeout_unit="ns")
+# so a hung FSM fails after a few bytes worth of sim time instead of never.
+# ----------------------------------------------------------------
+BUDGET_BITS_PER_BYTE = 12  # start + 8 data + stop + idle slack
+BUDGET_MARGIN = 2
+
+
+def _budget_clks_per_bit(mode):
+    # Inside the simulator the runner's overrides are the truth (parameter sweeps)
+    overrides = json.loads(os.getenv("SIM_PARAMETERS", "{}"))
+    if mode is None and "BAUD_RATE" in overrides:
+        clk_freq = verilog_int(overrides.get("CLK_FREQ", CLK_FREQ))
+        return clk_freq // verilog_int(overrides["BAUD_RATE"])
+    return CLK_FREQ // BAUD_MODES[mode or baud_mode()]
+
+
+def sim_budget_ns(uart_bytes=0, cycles=0, mode=None):
+    """Simulated-time budget for a test that sends *uart_bytes* and runs *cycles* extra clocks"""
+    bit_ns = _budget_clks_per_bit(mode) * CLK_PERIOD_NS
+    busy_ns = uart_bytes * BUDGET_BITS_PER_BYTE * bit_ns + cycles * CLK_PERIOD_NS
+    return BUDGET_MARGIN * busy_ns + 100 * CLK_PERIOD_NS
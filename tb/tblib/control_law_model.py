@@ -0,0 +1,124 @@
+# ====================================
+# File: control_law_model.py
+# Author: jaimebw
+# Created: 2026-10-18 10:19:05
+# ====================================
+"""Bit-exact NumPy model of LandauControlLaw (src/control_law.v).
+
+    mult_wide  = a1 * K1, a2 * K2     signed 64 bit products
+    sum_wide   = mult1 + mult2        wraps at 64 bits
+    b          = sum_wide[47:16]      truncated, not rounded
+    test mode: b = a1 + 1.0           wraps at 32 bits
+
+All values are Q16.16 held in int32 arrays.
+"""
+
+import numpy as np
+
+Q16_ONE = 1 << 16
+INT32_MIN = -(1 << 31)
+INT32_MAX = (1 << 31) - 1
+
+# a1/a2 values worth hitting on every run: the extremes, sign changes
+# around zero and one, and the largest/smallest integer parts
+CORNER_VALUES = np.array([
+    0, 1, -1, Q16_ONE, -Q16_ONE, Q16_ONE - 1, -Q16_ONE + 1,
+    INT32_MIN, INT32_MIN + 1, INT32_MAX, INT32_MAX - 1,
+    0x7FFF0000, -0x7FFF0000, 0x00008000, -0x00008000,
+], dtype=np.int32)
+
+
+def to_q16(x):
+    """Float(s) to Q16.16, truncated towards zero like the fixed point literals"""
+    return np.asarray(np.trunc(np.asarray(x, dtype=np.float64) * Q16_ONE), dtype=np.int64).astype(np.int32)
+
+
+def from_q16(q):
+    return np.asarray(q, dtype=np.int64) / Q16_ONE
+
+
+def to_int32(value):
+    """Reinterpret the low 32 bits of a Python int as signed"""
+    value &= 0xFFFFFFFF
+    return value - (1 << 32) if value & 0x80000000 else value
+
+
+def verilog_q16(value):
+    """Q16.16 constant as a Verilog parameter override, e.g. 32'shFFFFCCCD"""
+    return f"32'sh{value & 0xFFFFFFFF:08X}"
+
+
+def control_law(a1, a2, test, k1, k2):
+    """Expected b for every (a1, a2, test) vector; returns an int32 array"""
+    a1 = np.asarray(a1, dtype=np.int64)
+    a2 = np.asarray(a2, dtype=np.int64)
+    # |a * K| <= 2**62 fits an int64; the sum may wrap, as in the RTL
+    sum_wide = a1 * np.int64(k1) + a2 * np.int64(k2)
+    b = ((sum_wide >> 16) & 0xFFFFFFFF).astype(np.uint32).view(np.int32)
+    test_b = ((a1 + Q16_ONE) & 0xFFFFFFFF).astype(np.uint32).view(np.int32)
+    return np.where(np.asarray(test, dtype=bool), test_b, b)
+
+
+# ----------------------------------------------------------------
+# Stimulus
+# ----------------------------------------------------------------
+def corner_vectors():
+    """Every pair of CORNER_VALUES, in both modes"""
+    a1, a2 = np.meshgrid(CORNER_VALUES, CORNER_VALUES, indexing="ij")
+    a1, a2 = a1.ravel(), a2.ravel()
+    n = a1.size
+    return {
+        "a1": np.concatenate([a1, a1]),
+        "a2": np.concatenate([a2, a2]),
+        "test": np.repeat(np.array([0, 1], dtype=np.int32), n),
+    }
+
+
+def random_vectors(rng, n, test_ratio=0.1):
+    """Half full-range int32, half small Q16.16 values (|x| < 256.0)"""
+    def column():
+        full = rng.integers(INT32_MIN, INT32_MAX, size=n, endpoint=True, dtype=np.int64)
+        small = rng.integers(-256 * Q16_ONE, 256 * Q16_ONE, size=n, dtype=np.int64)
+        return np.where(rng.random(n) < 0.5, full, small).astype(np.int32)
+
+    return {
+        "a1": column(),
+        "a2": column(),
+        "test": (rng.random(n) < test_ratio).astype(np.int32),
+    }
+
+
+def vector_batches(rng, n, batch_size=4096):
+    """Corner vectors first, then random ones, *batch_size* at a time, n in total"""
+    corners = corner_vectors()
+    n_corners = min(n, corners["a1"].size)
+    if n_corners:
+        yield {name: col[:n_corners] for name, col in corners.items()}
+    remaining = n - n_corners
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        yield random_vectors(rng, size)
+        remaining -= size
+
+
+# ----------------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------------
+def _q16_cell(value):
+    return f"{value & 0xFFFFFFFF:08X} {from_q16(value):+13.5f}"
+
+
+def mismatch_table(index, a1, a2, test, expected, got, limit=20):
+    """Compact table of the first *limit* mismatches, hex and decoded Q16.16.
+
+    *got* entries equal to None are shown as X.
+    """
+    header = f"{'vector':>8} {'t':>1}  {'a1':^22}  {'a2':^22}  {'expected':^22}  {'got':^22}"
+    lines = [header, "-" * len(header)]
+    for row in range(min(limit, len(index))):
+        got_cell = "X".center(22) if got[row] is None else _q16_cell(int(got[row]))
+        lines.append(f"{int(index[row]):8} {int(test[row]):1}  {_q16_cell(int(a1[row]))}  "
+                     f"{_q16_cell(int(a2[row]))}  {_q16_cell(int(expected[row]))}  {got_cell}")
+    if len(index) > limit:
+        lines.append(f"... and {len(index) - limit} more")
+    return "\n".join(lines)
@@ -0,0 +1,316 @@
+# ====================================
+# File: coverage.py
+# Author: jaimebw
+# Created: 2026-10-18 11:12:57
+# ====================================
+"""Functional coverage of UartRxPidBuffer and coverage-directed stimulus.
+
+PidBufferCoverage is sampled once per received byte with the registers the
+byte meets (state, pid_byte, word_left, a1_written, a2_written) and the byte
+itself. The registers come from the DUT (dut_registers()) or from
+PidBufferModel (model_registers()), so a closure run can be tuned on the
+model and replayed on the RTL. Bins:
+
+    state:*      FSM state a byte arrives in
+    arc:*        FSM transition, GOT_VAL split into END and missing END
+    pid:*        committed frame per lane PID, burst PID, test and unknown PID
+    a1_written:* / a2_written:*   mask value a byte arrives with (16 each)
+    corner:*     test frame over partial masks, repeated lane, burst over
+                 partial masks, START byte as a lane value
+    ready:*      what completed an update: lanes, burst or test
+
+DirectedFrames builds the next frames from a recipe for a random uncovered
+bin, given the current registers; uniform_frames() is the random baseline
+(uniform PID byte, random payload, occasional missing END and noise).
+"""
+
+import json
+import random
+
+from .cycle_models import PidBufferModel
+from .pid_codec import (A1_PIDS, A1_WORD_PID, A2_PIDS, A2_WORD_PID, AB_WORD_PID, END_DEL,
+                        RX_TEST_PID, RX_WORD_BYTES, START_DEL, encode_rx_burst, encode_rx_test)
+
+IDLE, GOT_START, GOT_PID, GOT_VAL, GOT_WORD = range(5)
+STATE_NAMES = ("IDLE", "GOT_START", "GOT_PID", "GOT_VAL", "GOT_WORD")
+LANE_PIDS = A1_PIDS + A2_PIDS
+BURST_PIDS = (A1_WORD_PID, A2_WORD_PID, AB_WORD_PID)
+KNOWN_PIDS = frozenset(LANE_PIDS + BURST_PIDS + (RX_TEST_PID,))
+FULL = 0xF
+
+ARCS = ("IDLE->IDLE", "IDLE->GOT_START", "GOT_START->GOT_PID", "GOT_START->GOT_WORD",
+        "GOT_PID->GOT_VAL", "GOT_WORD->GOT_WORD", "GOT_WORD->GOT_VAL",
+        "GOT_VAL->IDLE:end", "GOT_VAL->IDLE:missing_end")
+CORNERS = ("test_over_partial", "repeated_lane", "burst_over_partial", "start_as_value")
+READY = ("lanes", "burst", "test")
+
+BINS = (
+    tuple(f"state:{name}" for name in STATE_NAMES)
+    + tuple(f"arc:{arc}" for arc in ARCS)
+    + tuple(f"pid:{pid:#04x}" for pid in LANE_PIDS + BURST_PIDS)
+    + ("pid:test", "pid:unknown")
+    + tuple(f"a{word}_written:{mask:04b}" for word in (1, 2) for mask in range(16))
+    + tuple(f"corner:{corner}" for corner in CORNERS)
+    + tuple(f"ready:{kind}" for kind in READY)
+)
+
+
+def _lane_bit(pid):
+    """(word index, mask bit) a lane PID writes; 0x10 is a1 MSB = bit 3"""
+    word = 0 if pid in A1_PIDS else 1
+    return word, 1 << (3 - (pid & 0x3))
+
+
+# ----------------------------------------------------------------
+# Sampling
+# ----------------------------------------------------------------
+class PidBufferCoverage:
+    """Hit counts of BINS, sampled per received byte"""
+
+    def __init__(self):
+        self.hits = dict.fromkeys(BINS, 0)
+        self.samples = 0
+        self.first_hit = {}   # bin -> sample index it was first hit at
+
+    def _hit(self, name):
+        self.hits[name] += 1
+        if name not in self.first_hit:
+            self.first_hit[name] = self.samples
+
+    def sample(self, byte, state, pid_byte, word_left, a1_written, a2_written):
+        """One received *byte* against the registers before its rx_done edge"""
+        hit = self._hit
+        self.samples += 1
+        hit(f"state:{STATE_NAMES[state]}")
+        hit(f"a1_written:{a1_written:04b}")
+        hit(f"a2_written:{a2_written:04b}")
+
+        if state == IDLE:
+            hit("arc:IDLE->GOT_START" if byte == START_DEL else "arc:IDLE->IDLE")
+        elif state == GOT_START:
+            hit("arc:GOT_START->GOT_WORD" if byte in RX_WORD_BYTES else "arc:GOT_START->GOT_PID")
+        elif state == GOT_PID:
+            hit("arc:GOT_PID->GOT_VAL")
+            if byte == START_DEL and pid_byte in LANE_PIDS:
+                hit("corner:start_as_value")
+        elif state == GOT_WORD:
+            hit("arc:GOT_WORD->GOT_VAL" if word_left == 0 else "arc:GOT_WORD->GOT_WORD")
+        elif byte != END_DEL:
+            hit("arc:GOT_VAL->IDLE:missing_end")
+        else:
+            hit("arc:GOT_VAL->IDLE:end")
+            self._commit(pid_byte, [a1_written, a2_written])
+
+    def _commit(self, pid, written):
+        hit = self._hit
+        partial = any(written)
+        if pid == RX_TEST_PID:
+            hit("pid:test")
+            hit("ready:test")
+            if partial:
+                hit("corner:test_over_partial")
+            return
+        if pid in LANE_PIDS:
+            hit(f"pid:{pid:#04x}")
+            word, bit = _lane_bit(pid)
+            if written[word] & bit:
+                hit("corner:repeated_lane")
+            written[word] |= bit
+            kind = "lanes"
+        elif pid in BURST_PIDS:
+            hit(f"pid:{pid:#04x}")
+            if partial:
+                hit("corner:burst_over_partial")
+            if pid != A2_WORD_PID:
+                written[0] = FULL
+            if pid != A1_WORD_PID:
+                written[1] = FULL
+            kind = "burst"
+        else:
+            hit("pid:unknown")
+            return
+        if written == [FULL, FULL]:
+            hit(f"ready:{kind}")
+
+    # ------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------
+    def covered(self):
+        return [name for name, count in self.hits.items() if count]
+
+    def missing(self):
+        return [name for name, count in self.hits.items() if not count]
+
+    @property
+    def ratio(self):
+        return len(self.covered()) / len(self.hits)
+
+    def merge(self, other):
+        for name, count in other.hits.items():
+            self.hits[name] += count
+        self.samples += other.samples
+        return self
+
+    def summary(self, **extra):
+        """Coverage of a run as a dict, *extra* (cycles, seed, ...) included"""
+        groups = {}
+        for name, count in self.hits.items():
+            group = groups.setdefault(name.split(":")[0], [0, 0])
+            group[0] += bool(count)
+            group[1] += 1
+        return {
+            "coverage": round(self.ratio, 4),
+            "bins": len(self.hits),
+            "covered": len(self.covered()),
+            "bytes": self.samples,
+            "groups": {name: f"{hit}/{total}" for name, (hit, total) in groups.items()},
+            "missing": self.missing(),
+            **extra,
+        }
+
+    def report(self, **extra):
+        return json.dumps(self.summary(**extra), indent=2)
+
+
+def model_registers(model, index=0):
+    """The sampled registers of a PidBufferModel instance"""
+    return {
+        "state": int(model.state[index]),
+        "pid_byte": int(model.pid_byte[index]),
+        "word_left": int(model.word_left[index]),
+        "a1_written": int(model.written[index, 0]),
+        "a2_written": int(model.written[index, 1]),
+    }
+
+
+def dut_registers(dut):
+    """The same registers read from UartRxPidBuffer (hierarchy access)"""
+    return {
+        "state": int(dut.state.value),
+        "pid_byte": int(dut.pid_byte.value),
+        "word_left": int(dut.word_left.value),
+        "a1_written": int(dut.a1_written.value),
+        "a2_written": int(dut.a2_written.value),
+    }
+
+
+# ----------------------------------------------------------------
+# Stimulus
+# ----------------------------------------------------------------
+def lane_frame(pid, value, end=END_DEL):
+    return bytes([START_DEL, pid, value, end])
+
+
+def uniform_frames(rng):
+    """Baseline: one frame with a uniform random PID byte, sized like the RTL
+    expects for burst PIDs; 1 in 8 loses its END, 1 in 8 is preceded by noise
+    """
+    pid = rng.getrandbits(8)
+    payload = bytes(rng.getrandbits(8) for _ in range(RX_WORD_BYTES.get(pid, 1)))
+    end = END_DEL if rng.random() >= 1 / 8 else rng.getrandbits(8)
+    noise = bytes([rng.getrandbits(8)]) if rng.random() < 1 / 8 else b""
+    return noise + bytes([START_DEL, pid]) + payload + bytes([end])
+
+
+class DirectedFrames:
+    """Next frames aimed at a random uncovered bin of *coverage*.
+
+    With probability *explore*, or once everything is covered, a
+    uniform_frames() frame goes out instead.
+    """
+
+    def __init__(self, coverage, rng=None, explore=0.1):
+        self.coverage = coverage
+        self.rng = rng or random.Random()
+        self.explore = explore
+
+    def __call__(self, registers):
+        missing = self.coverage.missing()
+        if not missing or self.rng.random() < self.explore:
+            return uniform_frames(self.rng)
+        return self.recipe(self.rng.choice(missing), registers)
+
+    def _value(self):
+        return self.rng.getrandbits(8)
+
+    def _test(self):
+        return encode_rx_test(self._value())
+
+    def _unknown_pid(self):
+        return self.rng.choice([pid for pid in range(256)
+                                if pid not in KNOWN_PIDS and pid not in (START_DEL, END_DEL)])
+
+    def _lanes(self, word, bits):
+        pids = A1_PIDS if word == 0 else A2_PIDS
+        frames = [lane_frame(pid, self._value()) for pid in pids if bits & _lane_bit(pid)[1]]
+        self.rng.shuffle(frames)
+        return b"".join(frames)
+
+    def _set_mask(self, word, mask, registers):
+        """Frames after which a*word*_written == *mask* (the next byte samples it)"""
+        current = [registers["a1_written"], registers["a2_written"]]
+        other = current[1 - word]
+        # Lanes never clear bits, and a full a1 with a full a2 completes and clears both
+        if current[word] & ~mask or (mask == FULL and other == FULL):
+            return self._test() + self._lanes(word, mask)
+        return self._lanes(word, mask & ~current[word])
+
+    def recipe(self, name, registers):
+        group, _, what = name.partition(":")
+        rng = self.rng
+        if group == "a1_written" or group == "a2_written":
+            return self._set_mask(int(group[1]) - 1, int(what, 2), registers)
+        if name == "pid:test" or name == "ready:test":
+            return self._test()
+        if name == "pid:unknown":
+            return lane_frame(self._unknown_pid(), self._value())
+        if group == "pid":
+            pid = int(what, 16)
+            if pid in RX_WORD_BYTES:
+                return self._burst(pid)
+            return lane_frame(pid, self._value())
+        if name == "arc:IDLE->IDLE":
+            return bytes([rng.choice([b for b in range(256) if b != START_DEL])])
+        if name == "arc:GOT_VAL->IDLE:missing_end":
+            return lane_frame(rng.choice(LANE_PIDS), self._value(),
+                              end=rng.choice([b for b in range(256) if b != END_DEL]))
+        if name == "corner:test_over_partial":
+            return self._test() + self._lanes(rng.randrange(2), rng.randrange(1, FULL)) + self._test()
+        if name == "corner:repeated_lane":
+            pid = rng.choice(LANE_PIDS)
+            return self._test() + lane_frame(pid, self._value()) + lane_frame(pid, self._value())
+        if name == "corner:burst_over_partial":
+            word = rng.randrange(2)
+            return self._test() + self._lanes(word, rng.randrange(1, FULL)) + self._burst(
+                rng.choice(BURST_PIDS))
+        if name == "corner:start_as_value":
+            return lane_frame(rng.choice(LANE_PIDS), START_DEL)
+        if name == "ready:lanes":
+            return self._test() + self._lanes(0, FULL) + self._lanes(1, FULL)
+        if name == "ready:burst":
+            return self._burst(AB_WORD_PID)
+        # States and the remaining arcs: any lane or burst frame walks through them
+        if rng.random() < 0.5:
+            return self._burst(rng.choice(BURST_PIDS))
+        return lane_frame(rng.choice(LANE_PIDS), self._value())
+
+    def _burst(self, pid):
+        a1 = self.rng.getrandbits(32) if pid != A2_WORD_PID else None
+        a2 = self.rng.getrandbits(32) if pid != A1_WORD_PID else None
+        return encode_rx_burst(a1, a2)
+
+
+def close_on_model(next_frames, max_bytes, coverage=None):
+    """Feed *next_frames*(registers) into a PidBufferModel, sampling coverage
+    on every byte, until everything is covered or *max_bytes* went in.
+    Returns the coverage; coverage.samples is the number of bytes sent.
+    """
+    coverage = coverage or PidBufferCoverage()
+    model = PidBufferModel()
+    while coverage.samples < max_bytes and coverage.missing():
+        for byte in next_frames(model_registers(model)):
+            coverage.sample(byte, **model_registers(model))
+            model.step(rx_done=1, rx_byte=byte)
+            if coverage.samples >= max_bytes:
+                break
+    return coverage
@@ -0,0 +1,514 @@
+# ====================================
+# File: cycle_models.py
+# Author: jaimebw
+# Created: 2026-10-18 10:30:40
+# ====================================
+"""Cycle-accurate NumPy models of the UART/PID blocks.
+
+Every model holds the registers of *n* independent instances in arrays, and
+step() advances all of them by one rising clk edge like the RTL does: the
+next values are computed from the current registers and the inputs sampled
+at the edge, then committed together. Inputs are scalars or length-n arrays;
+outputs are attributes named after the RTL ports. rst (asynchronous in the
+RTL) is sampled at the edge and resets the instances it is set for.
+
+    UartRxModel          src/uart_rx.v
+    FracUartRxModel      src/uart_rx.v with FRACTIONAL=1 and/or OVERSAMPLE=1
+    RxFifoModel          src/uart_rx_fifo.v
+    PidBufferModel       src/uart_rx_pid_buffer.v
+    TxPidBufferModel     src/uart_tx_pid_buffer.v
+    TxPidFifoModel       src/uart_tx_pid_fifo.v
+    ControlLawModel      src/control_law.v, combinational: step() evaluates b
+
+simulate() runs a model over per-cycle input streams; tblib.lockstep checks a
+model against the HDL edge by edge inside cocotb.
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from .control_law_model import control_law
+from .pid_codec import (A1_PIDS, A1_WORD_PID, A2_PIDS, A2_WORD_PID, AB_WORD_PID, END_DEL, RX_TEST_PID,
+                        RX_WORD_BYTES, START_DEL, TX_DATA_PID, TX_TEST_PID)
+
+STOP_BIT = 1
+
+
+class _CycleModel(ABC):
+    INPUTS = ()
+    OUTPUTS = ()
+
+    def __init__(self, n=1):
+        self.n = n
+        self.cycles = 0
+        self.reset()
+
+    @abstractmethod
+    def reset(self):
+        """(Re)create every register array at its RTL reset value"""
+
+    @abstractmethod
+    def _step(self, **inputs):
+        """Compute the next registers from the current ones and *inputs*, then commit"""
+
+    def _input(self, value, dtype=np.uint32):
+        return np.broadcast_to(np.asarray(value).astype(dtype), (self.n,))
+
+    def _registers(self):
+        return [name for name, value in vars(self).items() if isinstance(value, np.ndarray)]
+
+    def _reset_where(self, rst):
+        """Reset the instances selected by *rst* (after the edge was computed)"""
+        rst = self._input(rst, bool)
+        if not rst.any():
+            return
+        saved = {name: getattr(self, name) for name in self._registers()}
+        self.reset()
+        for name, value in saved.items():
+            setattr(self, name, np.where(rst.reshape((-1,) + (1,) * (value.ndim - 1)),
+                                         getattr(self, name), value))
+
+    def step(self, rst=None, **inputs):
+        self._step(**inputs)
+        if rst is not None:
+            self._reset_where(rst)
+        self.cycles += 1
+
+    def outputs(self):
+        """Current outputs as {port: array}"""
+        return {name: getattr(self, name).copy() for name in self.OUTPUTS}
+
+
+def _next_state(conditions, states, current):
+    """np.select over FSM states, keeping *current* where no condition holds"""
+    return np.select(conditions, states, current.astype(np.int64)).astype(current.dtype)
+
+
+def simulate(model, cycles, **streams):
+    """Step *model* *cycles* times; every stream is a scalar, a (cycles,) or a
+    (cycles, n) array. Returns {output: (cycles, n) array} sampled after each edge.
+    """
+    streams = {name: np.asarray(value) for name, value in streams.items()}
+    trace = {name: np.empty((cycles, model.n), getattr(model, name).dtype) for name in model.OUTPUTS}
+    for cycle in range(cycles):
+        model.step(**{name: value if value.ndim == 0 else value[cycle]
+                      for name, value in streams.items()})
+        for name, values in trace.items():
+            values[cycle] = getattr(model, name)
+    return trace
+
+
+def uart_levels(data, clks_per_bit, idle_bits=1, lead_cycles=0, data_bits=8):
+    """Per-cycle rx levels (uint8) that serialize *data* like tblib.uart.UartSource.
+    A fractional *clks_per_bit* (a transmitter off the receiver's clock, or a
+    baud rate that doesn't divide it) puts bit k at cycle floor(k * clks_per_bit).
+    """
+    bits = []
+    for value in data:
+        bits.append(0)
+        bits += [(value >> i) & 1 for i in range(data_bits)]
+        bits += [STOP_BIT] * (1 + idle_bits)
+    bits = np.array(bits, np.uint8)
+    if float(clks_per_bit).is_integer():
+        levels = np.repeat(bits, int(clks_per_bit))
+    else:
+        edges = np.floor(np.arange(len(bits) + 1) * clks_per_bit).astype(np.int64)
+        levels = np.repeat(bits, np.diff(edges))
+    return np.concatenate([np.full(lead_cycles, STOP_BIT, np.uint8), levels])
+
+
+def phase_increment(clk_freq, baud_rate, ticks=1, acc_bits=32):
+    """ACC_INC of the fractional UartRx/UartTx: ticks per clock in 2**-acc_bits units"""
+    return ((baud_rate * ticks << acc_bits) + clk_freq // 2) // clk_freq
+
+
+# ----------------------------------------------------------------
+# UartRx
+# ----------------------------------------------------------------
+class UartRxModel(_CycleModel):
+    INPUTS = ("rx",)
+    OUTPUTS = ("rx_data", "rx_done", "rx_busy")
+    IDLE, START, READ, DONE = range(4)
+
+    def __init__(self, n=1, clks_per_bit=16, frame_bits=8):
+        self.clks_per_bit = clks_per_bit
+        self.mid_bit = clks_per_bit // 2
+        self.frame_bits = frame_bits
+        super().__init__(n)
+
+    def reset(self):
+        n = self.n
+        self.state = np.zeros(n, np.uint8)
+        self.clk_count = np.zeros(n, np.uint16)
+        self.bit_index = np.zeros(n, np.uint8)
+        self.shift_reg = np.zeros(n, np.uint32)
+        self.rx_data = np.zeros(n, np.uint32)
+        self.rx_done = np.zeros(n, np.uint8)
+        self.rx_busy = np.zeros(n, np.uint8)
+
+    def _step(self, rx):
+        low = self._input(rx, np.uint8) == 0
+        state, count, index = self.state, self.clk_count, self.bit_index
+        idle = state == self.IDLE
+        start = state == self.START
+        read = state == self.READ
+        done = state == self.DONE
+
+        at_mid = start & (count == self.mid_bit)
+        confirmed = at_mid & low
+        counting = read & (count < self.clks_per_bit - 1)
+        sample = read & ~counting
+        last = sample & (index == self.frame_bits - 1)
+
+        bit = np.left_shift(np.uint32(1), index.astype(np.uint32))
+        self.rx_data = np.where(done, self.shift_reg, self.rx_data)
+        self.rx_done = np.where(idle, 0, np.where(done, 1, self.rx_done)).astype(np.uint8)
+        self.rx_busy = np.where(idle, low, np.where(done, 0, self.rx_busy)).astype(np.uint8)
+        self.shift_reg = np.where(sample & low, self.shift_reg & ~bit,
+                                  np.where(sample, self.shift_reg | bit, self.shift_reg))
+        self.state = _next_state(
+            [idle & low, confirmed, at_mid, last, done],
+            [self.START, self.READ, self.IDLE, self.DONE, self.IDLE], state)
+        self.clk_count = np.where(idle | confirmed | sample, 0,
+                                  np.where((start & ~at_mid) | counting, count + 1, count)
+                                  ).astype(np.uint16)
+        self.bit_index = np.where(idle | confirmed, 0,
+                                  np.where(sample & ~last, (index + 1) & 0xF, index)).astype(np.uint8)
+
+
+class FracUartRxModel(_CycleModel):
+    """UartRx with phase-accumulator timing (the phase_timing branch)"""
+    INPUTS = ("rx",)
+    OUTPUTS = ("rx_data", "rx_done", "rx_busy")
+    IDLE, START, READ, DONE, STOP = range(5)
+    ACC_BITS = 32
+
+    def __init__(self, n=1, clk_freq=50_000_000, baud_rate=3_000_000, frame_bits=8, oversample=False):
+        self.oversample = oversample
+        self.inc = phase_increment(clk_freq, baud_rate, 16 if oversample else 1, self.ACC_BITS)
+        self.acc_start = 0 if oversample else 1 << (self.ACC_BITS - 1)
+        self.frame_bits = frame_bits
+        super().__init__(n)
+
+    def reset(self):
+        n = self.n
+        self.state = np.zeros(n, np.uint8)
+        self.phase = np.zeros(n, np.uint64)
+        self.tick_count = np.zeros(n, np.uint8)
+        self.votes = np.zeros(n, np.uint8)
+        self.bit_index = np.zeros(n, np.uint8)
+        self.shift_reg = np.zeros(n, np.uint32)
+        self.rx_data = np.zeros(n, np.uint32)
+        self.rx_done = np.zeros(n, np.uint8)
+        self.rx_busy = np.zeros(n, np.uint8)
+
+    def _step(self, rx):
+        rx = self._input(rx, np.uint8) & 1
+        low = rx == 0
+        state, index = self.state, self.bit_index
+        idle = state == self.IDLE
+        done = state == self.DONE
+
+        phase_next = self.phase + np.uint64(self.inc)
+        tick = (phase_next >> np.uint64(self.ACC_BITS)) != 0
+        if self.oversample:
+            decide = tick & (self.tick_count == 8)
+            stop_end = tick & (self.tick_count == 7)
+            v0, v1 = self.votes & 1, self.votes >> 1
+            bit_val = (v0 & v1) | (v0 & rx) | (v1 & rx)
+        else:
+            decide = stop_end = tick
+            bit_val = rx
+        start = decide & (state == self.START)
+        sample = decide & (state == self.READ)
+        last = sample & (index == self.frame_bits - 1)
+        edge = idle & low
+
+        bit = np.left_shift(np.uint32(1), index.astype(np.uint32))
+        self.rx_data = np.where(done, self.shift_reg, self.rx_data)
+        self.rx_done = np.where(idle, 0, np.where(done, 1, self.rx_done)).astype(np.uint8)
+        self.rx_busy = np.where(idle, low, np.where(done, 0, self.rx_busy)).astype(np.uint8)
+        self.shift_reg = np.where(sample & (bit_val == 0), self.shift_reg & ~bit,
+                                  np.where(sample, self.shift_reg | bit, self.shift_reg))
+        self.votes = np.where(tick & ((self.tick_count == 6) | (self.tick_count == 7)),
+                              ((self.votes << 1) | rx) & 3, self.votes).astype(np.uint8)
+        self.tick_count = np.where(edge, 0, np.where(tick, (self.tick_count + 1) & 0xF, self.tick_count)
+                                   ).astype(np.uint8)
+        self.phase = np.where(edge, np.uint64(self.acc_start),
+                              phase_next & np.uint64((1 << self.ACC_BITS) - 1)).astype(np.uint64)
+        self.state = _next_state(
+            [edge, start & (bit_val == 0), start, last, stop_end & (state == self.STOP), done],
+            [self.START, self.READ, self.IDLE, self.STOP, self.DONE, self.IDLE], state)
+        self.bit_index = np.where(idle, 0, np.where(sample & ~last, (index + 1) & 0xF, index)).astype(np.uint8)
+
+
+# ----------------------------------------------------------------
+# UartRxFifo
+# ----------------------------------------------------------------
+class RxFifoModel(_CycleModel):
+    INPUTS = ("wr_data", "wr_en", "rd_en")
+    OUTPUTS = ("rd_data", "rd_valid", "full", "level", "max_level", "overflows")
+
+    def __init__(self, n=1, depth_log2=4, count_bits=16):
+        self.depth = 1 << depth_log2
+        self.count_max = (1 << count_bits) - 1
+        super().__init__(n)
+
+    def reset(self):
+        n = self.n
+        self.mem = np.zeros((n, self.depth), np.uint8)
+        self.wr_ptr = np.zeros(n, np.uint16)                # modulo 2 * depth
+        self.rd_ptr = np.zeros(n, np.uint16)
+        self.max_level = np.zeros(n, np.uint16)
+        self.overflows = np.zeros(n, np.uint32)
+        self._update_outputs()
+
+    def _update_outputs(self):
+        self.level = ((self.wr_ptr.astype(np.int32) - self.rd_ptr) % (2 * self.depth)).astype(np.uint16)
+        self.full = (self.level == self.depth).astype(np.uint8)
+        self.rd_valid = (self.level != 0).astype(np.uint8)
+        self.rd_data = np.where(self.rd_valid, self.mem[np.arange(self.n), self.rd_ptr % self.depth], 0
+                                ).astype(np.uint8)
+
+    def _step(self, wr_data, wr_en, rd_en):
+        data = self._input(wr_data, np.uint8)
+        wr_en = self._input(wr_en, bool)
+        pop = self._input(rd_en, bool) & self.rd_valid.astype(bool)
+        push = wr_en & (~self.full.astype(bool) | pop)
+
+        rows = np.nonzero(push)[0]
+        mem = self.mem.copy()
+        mem[rows, self.wr_ptr[rows] % self.depth] = data[rows]
+        self.mem = mem
+        self.overflows = np.where(wr_en & ~push & (self.overflows != self.count_max),
+                                  self.overflows + 1, self.overflows).astype(np.uint32)
+        self.max_level = np.maximum(self.max_level, self.level)
+        self.wr_ptr = ((self.wr_ptr + push) % (2 * self.depth)).astype(np.uint16)
+        self.rd_ptr = ((self.rd_ptr + pop) % (2 * self.depth)).astype(np.uint16)
+        self._update_outputs()
+
+# ----------------------------------------------------------------
+# UartRxPidBuffer
+# ----------------------------------------------------------------
+_PID_WORD = np.full(256, -1, np.int8)    # 0: a1, 1: a2, -1: not a lane PID
+_PID_LANE = np.zeros(256, np.uint8)      # byte lane, 0 = LSB
+for _word, _pids in enumerate((A1_PIDS, A2_PIDS)):
+    for _n, _pid in enumerate(_pids):
+        _PID_WORD[_pid] = _word
+        _PID_LANE[_pid] = 3 - _n
+_BURST_WORDS = np.zeros((256, 2), bool)  # words a burst PID writes
+_BURST_WORDS[[A1_WORD_PID, AB_WORD_PID], 0] = True
+_BURST_WORDS[[A2_WORD_PID, AB_WORD_PID], 1] = True
+_BURST_LEFT = np.zeros(256, np.uint8)    # word_left loaded after a burst PID
+for _pid, _size in RX_WORD_BYTES.items():
+    _BURST_LEFT[_pid] = _size - 1
+
+
+class PidBufferModel(_CycleModel):
+    """Clocked twin of pid_codec.RxPidBufferModel; test_cycle_models.py keeps the two in step"""
+
+    INPUTS = ("rx_done", "rx_byte")
+    OUTPUTS = ("a1", "a2", "ready", "test")
+    IDLE, GOT_START, GOT_PID, GOT_VAL, GOT_WORD = range(5)
+
+    def reset(self):
+        n = self.n
+        self.state = np.zeros(n, np.uint8)
+        self.pid_byte = np.zeros(n, np.uint8)
+        self.value_byte = np.zeros(n, np.uint8)
+        self.word_buf = np.zeros(n, np.uint64)
+        self.word_left = np.zeros(n, np.uint8)
+        self.lanes = np.zeros((n, 2, 4), np.uint8)   # a1_bytes, a2_bytes
+        self.written = np.zeros((n, 2), np.uint8)    # a1_written, a2_written
+        self.set_ready = np.zeros(n, bool)
+        self.set_ready_ff = np.zeros(n, bool)
+        self.a1 = np.zeros(n, np.uint32)
+        self.a2 = np.zeros(n, np.uint32)
+        self.ready = np.zeros(n, np.uint8)
+        self.test = np.zeros(n, np.uint8)
+
+    def _step(self, rx_done, rx_byte):
+        done = self._input(rx_done, bool)
+        byte = self._input(rx_byte, np.uint8)
+        state, pid = self.state, self.pid_byte
+
+        # Output block, from the registers before the edge
+        packed = np.ascontiguousarray(self.lanes[:, :, ::-1]).view(">u4")[:, :, 0]
+        self.a1 = np.where(self.set_ready_ff, packed[:, 0], self.a1).astype(np.uint32)
+        self.a2 = np.where(self.set_ready_ff, packed[:, 1], self.a2).astype(np.uint32)
+        self.ready = self.set_ready_ff.astype(np.uint8)
+        self.set_ready_ff = self.set_ready
+        self.test = (pid == RX_TEST_PID).astype(np.uint8)
+
+        # Byte-reception FSM
+        commit = done & (state == self.GOT_VAL) & (byte == END_DEL)
+        is_test = commit & (pid == RX_TEST_PID)
+        word = _PID_WORD[pid]
+        hit = np.nonzero(commit & (word >= 0))[0]
+        lanes = self.lanes.copy()
+        written_n = self.written.copy()
+        lanes[hit, word[hit], _PID_LANE[pid[hit]]] = self.value_byte[hit]
+        written_n[hit, word[hit]] |= np.left_shift(1, _PID_LANE[pid[hit]]).astype(np.uint8)
+        lanes[is_test, :, 0] = self.value_byte[is_test, None]
+        written_n[is_test] = 0
+        # Burst frames: a1 is the high word of a 0x32 payload, else the low one
+        burst = commit[:, None] & _BURST_WORDS[pid]
+        low = (self.word_buf & 0xFFFFFFFF).astype(np.uint32)
+        high = (self.word_buf >> np.uint64(32)).astype(np.uint32)
+        words = np.stack([np.where(pid == AB_WORD_PID, high, low), low], axis=1)
+        lanes = np.where(burst[:, :, None], words.astype("<u4").view(np.uint8).reshape(-1, 2, 4), lanes)
+        written_n[burst] = 0xF
+        complete = commit & ~is_test & (written_n == 0xF).all(axis=1)
+        written_n[complete] = 0
+
+        self.lanes = lanes
+        self.written = np.where(commit[:, None], written_n, self.written)
+        self.set_ready = is_test | complete
+        self.pid_byte = np.where(done & (state == self.GOT_START), byte, pid)
+        self.value_byte = np.where(done & (state == self.GOT_PID), byte, self.value_byte)
+        in_word = done & (state == self.GOT_WORD)
+        is_burst = _BURST_LEFT[byte] > 0
+        last_byte = self.word_left == 0
+        self.word_buf = np.where(in_word, (self.word_buf << np.uint64(8)) | byte, self.word_buf)
+        self.word_left = np.select(
+            [in_word, done & (state == self.GOT_START) & is_burst],
+            [(self.word_left - 1) & 0x7, _BURST_LEFT[byte]], self.word_left).astype(np.uint8)
+        self.state = np.where(
+            done,
+            np.select([state == self.IDLE, state == self.GOT_START, state == self.GOT_PID,
+                       state == self.GOT_WORD],
+                      [np.where(byte == START_DEL, self.GOT_START, self.IDLE),
+                       np.where(is_burst, self.GOT_WORD, self.GOT_PID), self.GOT_VAL,
+                       np.where(last_byte, self.GOT_VAL, self.GOT_WORD)], self.IDLE),
+            state).astype(np.uint8)
+
+
+# ----------------------------------------------------------------
+# UartTxPidBuffer
+# ----------------------------------------------------------------
+class TxPidBufferModel(_CycleModel):
+    INPUTS = ("tx_float", "tx_valid", "tx_busy", "test")
+    OUTPUTS = ("tx_data", "tx_start")
+    S_IDLE, S_LOAD, S_WAITBUSY, S_WAITFREE = range(4)
+
+    def reset(self):
+        n = self.n
+        self.state = np.zeros(n, np.uint8)
+        self.byte_index = np.zeros(n, np.uint8)
+        self.buffer = np.zeros(n, np.uint32)
+        self.pending_valid = np.zeros(n, bool)
+        self.tx_data = np.zeros(n, np.uint8)
+        self.tx_start = np.zeros(n, np.uint8)
+
+    def _step(self, tx_float, tx_valid, tx_busy, test):
+        word = self._input(tx_float, np.uint32)
+        valid = self._input(tx_valid, bool)
+        busy = self._input(tx_busy, bool)
+        test = self._input(test, bool)
+        state, index = self.state, self.byte_index
+
+        idle = state == self.S_IDLE
+        load = state == self.S_LOAD
+        launch = idle & (valid | self.pending_valid) & ~busy
+        free = (state == self.S_WAITFREE) & ~busy
+        finished = free & (index == 6)
+
+        # Frame byte for the current index: START, PID, 4 bytes LSB first, END
+        frame = np.select(
+            [index == 0, index == 1, index < 6, index == 6],
+            [START_DEL, np.where(test, TX_TEST_PID, TX_DATA_PID),
+             (self.buffer >> (8 * (index.astype(np.uint32) - 2) & 31)) & 0xFF, END_DEL], 0)
+        self.tx_data = np.where(load, frame, self.tx_data).astype(np.uint8)
+        self.tx_start = load.astype(np.uint8)
+        self.pending_valid = np.where(launch, False, self.pending_valid | (valid & idle & busy))
+        self.buffer = np.where(launch, word, self.buffer)
+        self.byte_index = np.where(launch, 0, np.where(free & ~finished, index + 1, index)).astype(np.uint8)
+        self.state = _next_state(
+            [launch, load, (state == self.S_WAITBUSY) & busy, finished, free],
+            [self.S_LOAD, self.S_WAITBUSY, self.S_WAITFREE, self.S_IDLE, self.S_LOAD], state)
+
+
+
+class TxPidFifoModel(_CycleModel):
+    INPUTS = ("tx_float", "tx_valid", "tx_busy", "test")
+    OUTPUTS = ("tx_data", "tx_start", "tx_ready", "full")
+
+    def __init__(self, n=1, depth_log2=1):
+        self.depth = 1 << depth_log2
+        super().__init__(n)
+
+    def reset(self):
+        n = self.n
+        self.fifo = np.zeros((n, self.depth), np.uint64)   # test << 32 | word
+        self.wr_ptr = np.zeros(n, np.uint8)                # modulo 2 * depth
+        self.rd_ptr = np.zeros(n, np.uint8)
+        self.sending = np.zeros(n, bool)
+        self.byte_index = np.zeros(n, np.uint8)
+        self.word = np.zeros(n, np.uint32)
+        self.word_test = np.zeros(n, bool)
+        self.wait_busy = np.zeros(n, bool)
+        self.tx_data = np.zeros(n, np.uint8)
+        self.tx_start = np.zeros(n, np.uint8)
+        self._update_flags()
+
+    def _update_flags(self):
+        count = (self.wr_ptr.astype(np.int16) - self.rd_ptr) % (2 * self.depth)
+        self.full = (count == self.depth).astype(np.uint8)
+        self.tx_ready = 1 - self.full
+
+    def _step(self, tx_float, tx_valid, tx_busy, test):
+        word = self._input(tx_float, np.uint32)
+        valid = self._input(tx_valid, bool)
+        busy = self._input(tx_busy, bool)
+        test = self._input(test, bool)
+        rows = np.arange(self.n)
+        index = self.byte_index
+
+        push = valid & ~self.full.astype(bool)
+        pop = ~self.sending & (self.wr_ptr != self.rd_ptr)
+        issue = self.sending & ~busy & ~self.wait_busy
+        head = self.fifo[rows, self.rd_ptr % self.depth]
+
+        frame = np.select(
+            [index == 0, index == 1, index < 6],
+            [START_DEL, np.where(self.word_test, TX_TEST_PID, TX_DATA_PID),
+             (self.word >> (8 * (index.astype(np.uint32) - 2) & 31)) & 0xFF], END_DEL)
+        self.tx_data = np.where(issue, frame, self.tx_data).astype(np.uint8)
+        self.tx_start = issue.astype(np.uint8)
+        self.wait_busy = issue | (self.wait_busy & ~busy)
+
+        fifo = self.fifo.copy()
+        fifo[rows[push], self.wr_ptr[push] % self.depth] = (
+            test[push].astype(np.uint64) << np.uint64(32)) | word[push]
+        self.fifo = fifo
+        self.wr_ptr = ((self.wr_ptr + push) % (2 * self.depth)).astype(np.uint8)
+        self.rd_ptr = ((self.rd_ptr + pop) % (2 * self.depth)).astype(np.uint8)
+        self.word = np.where(pop, head & 0xFFFFFFFF, self.word).astype(np.uint32)
+        self.word_test = np.where(pop, (head >> np.uint64(32)) == 1, self.word_test)
+        self.byte_index = np.where(pop, 0, np.where(issue, (index + 1) & 0x7, index)).astype(np.uint8)
+        self.sending = np.where(pop, True, np.where(issue & (index == 6), False, self.sending))
+        self._update_flags()
+
+# ----------------------------------------------------------------
+# LandauControlLaw
+# ----------------------------------------------------------------
+class ControlLawModel(_CycleModel):
+    """Combinational: step() evaluates b for the current inputs (rst is ignored)"""
+    INPUTS = ("a1", "a2", "test")
+    OUTPUTS = ("b",)
+
+    def __init__(self, n=1, k1=1 << 16, k2=1 << 16):
+        self.k1, self.k2 = k1, k2
+        super().__init__(n)
+
+    def reset(self):
+        self.b = np.zeros(self.n, np.int32)
+
+    def _step(self, a1, a2, test):
+        a1 = self._input(a1, np.int64).astype(np.int32)
+        a2 = self._input(a2, np.int64).astype(np.int32)
+        self.b = control_law(a1, a2, self._input(test, bool), self.k1, self.k2)
+
+    def _reset_where(self, rst):
+        pass
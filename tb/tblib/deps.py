@@ -0,0 +1,184 @@
+# ====================================
+# File: deps.py
+# Author: jaimebw
+# Created: 2026-10-18 10:35:53
+# ====================================
+"""Module dependency graph of the Verilog sources and change-based job selection.
+
+The graph is built from the module declarations and instantiations found in
+src/*.v and tb/*.v (comments stripped, instantiations recognised as
+``Module #(...) inst (`` or ``Module inst (`` of a module declared somewhere
+in the tree). It gives every toplevel its verilog_sources, and tells which
+jobs a set of changed files can affect:
+
+    .v file             jobs whose sources contain it
+    tb/<module>.py      the jobs of that test module
+    tb/tblib/*.py       jobs whose test module imports it, directly or not
+    requirements.txt    everything
+    anything else       nothing (docs, scripts)
+
+    python -m tblib.deps --graph | --sources TOP | --closure FILE    (from tb/)
+"""
+
+import argparse
+import ast
+import re
+import subprocess
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+TB_DIR = Path(__file__).resolve().parents[1]
+ROOT = TB_DIR.parent
+SRC_DIR = ROOT / "src"
+VERILOG_DIRS = (SRC_DIR, TB_DIR)
+SELECT_ALL = {"requirements.txt"}
+
+_COMMENTS = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+_MODULE = re.compile(r"\bmodule\s+([A-Za-z_]\w*)(.*?)\bendmodule\b", re.DOTALL)
+_INSTANCE = re.compile(r"\b([A-Za-z_]\w*)\s*(?:#\s*\(|[A-Za-z_]\w*\s*\()")
+
+
+def parse_verilog(path):
+    """{module: names that might be instantiated in it} for one file"""
+    text = _COMMENTS.sub(" ", Path(path).read_text(errors="replace"))
+    return {name: set(_INSTANCE.findall(body)) for name, body in _MODULE.findall(text)}
+
+
+class ModuleGraph:
+    def __init__(self, dirs=VERILOG_DIRS):
+        self.files = {}      # module -> defining file
+        candidates = {}
+        for directory in dirs:
+            for path in sorted(Path(directory).glob("*.v")):
+                for module, names in parse_verilog(path).items():
+                    self.files.setdefault(module, path.resolve())
+                    candidates[module] = names
+        # Only names of modules declared in the tree are instantiations
+        self.children = {module: sorted((names & self.files.keys()) - {module})
+                         for module, names in candidates.items()}
+
+    def closure(self, toplevel):
+        """Modules under *toplevel*, the toplevel first, each module once"""
+        if toplevel not in self.files:
+            raise KeyError(f"No Verilog module {toplevel!r} in {', '.join(map(str, VERILOG_DIRS))}")
+        order, stack = [], [toplevel]
+        while stack:
+            module = stack.pop()
+            if module in order:
+                continue
+            order.append(module)
+            stack.extend(reversed(self.children[module]))
+        return order
+
+    def sources(self, toplevel):
+        """verilog_sources for *toplevel*: the defining files of its closure, in order"""
+        return list(dict.fromkeys(self.files[module] for module in self.closure(toplevel)))
+
+    def modules_in(self, path):
+        path = Path(path).resolve()
+        return [module for module, file in self.files.items() if file == path]
+
+
+@lru_cache(maxsize=None)
+def module_graph():
+    return ModuleGraph()
+
+
+def verilog_sources(toplevel):
+    """Source files of *toplevel* and everything it instantiates"""
+    return module_graph().sources(toplevel)
+
+
+# ----------------------------------------------------------------
+# Python side: which tblib modules a test module pulls in
+# ----------------------------------------------------------------
+def _tblib_imports(path):
+    """tblib module names imported by *path* (absolute tblib.x or relative .x)"""
+    tree = ast.parse(Path(path).read_text())
+    found = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level == 1 or base == "tblib":
+                # from . import x / from tblib import x: x may be a module
+                found.update(alias.name for alias in node.names)
+            if node.level == 1 and base:
+                found.add(base.split(".")[0])
+            elif base.startswith("tblib."):
+                found.add(base.split(".")[1])
+        elif isinstance(node, ast.Import):
+            found.update(alias.name.split(".")[1] for alias in node.names
+                         if alias.name.startswith("tblib."))
+    return found
+
+
+def python_closure(path, tblib_dir=TB_DIR / "tblib"):
+    """Files of *path* and every tblib module it imports, directly or not"""
+    seen = []
+    stack = [Path(path).resolve(), (tblib_dir / "__init__.py").resolve()]
+    while stack:
+        current = stack.pop()
+        if current in seen or not current.exists():
+            continue
+        seen.append(current)
+        stack.extend((tblib_dir / f"{name}.py").resolve() for name in _tblib_imports(current))
+    return seen
+
+
+# ----------------------------------------------------------------
+# Change-based selection
+# ----------------------------------------------------------------
+def changed_files(base="HEAD", root=ROOT):
+    """Files changed against *base* in the working tree, plus untracked ones"""
+    def git(*args):
+        out = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True, check=True)
+        return out.stdout.splitlines()
+
+    names = git("diff", "--name-only", base) + git("ls-files", "--others", "--exclude-standard")
+    return sorted({(root / name).resolve() for name in names})
+
+
+def job_dependencies(job, tb_dir=TB_DIR):
+    """Every file *job* depends on: its Verilog sources and its Python closure"""
+    files = {Path(src).resolve() for src in job.verilog_sources}
+    files.update(python_closure(Path(tb_dir) / f"{job.module}.py"))
+    return files
+
+
+def select_jobs(jobs, changed, root=ROOT):
+    """(selected jobs, reason) for the *changed* files"""
+    changed = [Path(path).resolve() for path in changed]
+    if any(path.name in SELECT_ALL and path.parent == root for path in changed):
+        return list(jobs), "dependency manifest changed"
+    changed = set(changed)
+    selected = [job for job in jobs if job_dependencies(job) & changed]
+    return selected, f"{len(changed)} changed files"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--graph", action="store_true", help="print every module and its children")
+    group.add_argument("--sources", metavar="TOP", help="print the source files of a toplevel")
+    group.add_argument("--closure", metavar="FILE",
+                       help="print the source files of every module declared in FILE")
+    args = parser.parse_args()
+
+    graph = module_graph()
+    if args.graph:
+        for module, children in sorted(graph.children.items()):
+            print(f"{module:28} {graph.files[module].relative_to(ROOT)}  -> {', '.join(children) or '-'}")
+        return
+    try:
+        tops = [args.sources] if args.sources else graph.modules_in(args.closure)
+        files = dict.fromkeys(path for top in tops for path in graph.sources(top))
+    except KeyError as exc:
+        sys.exit(exc.args[0])
+    if not files:
+        sys.exit(f"No Verilog module declared in {args.closure}")
+    print("\n".join(map(str, files)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# ====================================
+# File: harness.py
+# Author: jaimebw
+# Created: 2026-10-18 10:11:57
+# ====================================
+"""Clock and reset boilerplate shared by the testbenches"""
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles, RisingEdge
+
+from .config import CLK_PERIOD_NS
+
+
+def start_clock(dut, period_ns=CLK_PERIOD_NS):
+    """Start the free-running dut.clk (50 MHz by default)"""
+    return cocotb.start_soon(Clock(dut.clk, period_ns, units="ns").start())
+
+
+async def reset(dut):
+    """Pulse rst for one clock edge and leave one more edge for the outputs to settle"""
+    dut.rst.value = 1
+    await RisingEdge(dut.clk)
+    dut.rst.value = 0
+    await RisingEdge(dut.clk)
+
+
+async def run_cycles(dut, n):
+    await ClockCycles(dut.clk, n)
@@ -0,0 +1,83 @@
+# ====================================
+# File: lockstep.py
+# Author: jaimebw
+# Created: 2026-10-18 10:31:26
+# ====================================
+"""Run a tblib.cycle_models model in lockstep with the DUT.
+
+On every rising clk edge the model's inputs (and rst) are read from the DUT,
+the model is stepped, and in the ReadOnly phase every output port is compared
+with the model. Comparison starts at the first edge with rst high, so the
+checker can be started before the reset. Inputs are sampled in the edge
+callback, before any write the testbench makes at that edge lands, which is
+what the RTL sees too.
+
+    lockstep = Lockstep(dut, UartRxModel(clks_per_bit=clks_per_bit(dut))).start()
+    ...
+    lockstep.check()
+"""
+
+import cocotb
+from cocotb.triggers import ReadOnly, RisingEdge
+
+MAX_REPORTED = 20
+
+
+def _sample(signal):
+    value = signal.value
+    return int(value) if value.is_resolvable else 0  # X/Z inputs read as 0, the outputs will tell
+
+
+class Lockstep:
+    def __init__(self, dut, model, clk=None):
+        if model.n != 1:
+            raise ValueError("lockstep needs a single-instance model")
+        self.dut = dut
+        self.model = model
+        self.clk = clk if clk is not None else dut.clk
+        self.compared = 0
+        self.mismatches = []   # (cycle, port, expected, got)
+        self._task = None
+
+    def start(self):
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    async def _run(self):
+        dut, model = self.dut, self.model
+        inputs = [(name, getattr(dut, name)) for name in model.INPUTS]
+        outputs = [(name, getattr(dut, name)) for name in model.OUTPUTS]
+        rst = dut.rst
+        edge, read_only = RisingEdge(self.clk), ReadOnly()
+        in_reset = False
+
+        while True:
+            await edge
+            values = {name: _sample(signal) for name, signal in inputs}
+            reset = _sample(rst)
+            in_reset = in_reset or bool(reset)
+            await read_only
+            model.step(rst=reset, **values)
+            if not in_reset:
+                continue
+            for name, signal in outputs:
+                got = signal.value
+                want = int(getattr(model, name)[0])
+                if not got.is_resolvable or int(got) != want:
+                    self.mismatches.append((model.cycles, name, want, str(got)))
+            self.compared += 1
+
+    def check(self):
+        """Stop the checker and fail on any mismatch"""
+        self.stop()
+        assert self.compared, "no clock edge was compared (was rst ever asserted?)"
+        rows = "\n".join(f"  cycle {cycle}: {name} expected {want:#x}, got {got}"
+                         for cycle, name, want, got in self.mismatches[:MAX_REPORTED])
+        assert not self.mismatches, (
+            f"{len(self.mismatches)} mismatches against {type(self.model).__name__} "
+            f"in {self.compared} cycles\n{rows}")
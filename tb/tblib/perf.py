@@ -0,0 +1,145 @@
+# ====================================
+# File: perf.py
+# Author: jaimebw
+# Created: 2026-10-18 10:22:10
+# ====================================
+"""Performance counters for the benchmark workloads (tb/perf_workloads.py)
+and the results/baseline files written by tb/bench.py.
+
+Inside the simulator a PerfProbe measures one workload: wall time, simulated
+time, clock cycles and the number of simulator -> Python callbacks (every
+trigger that fires wakes the scheduler once). A workload that drives no clock
+(clocked=False, e.g. a combinational DUT stepped once per ns) reports items/s
+and callbacks per item only: its sim time is not a cycle count. Each workload appends one JSON
+line to the file named by PERF_OUT.
+
+Callbacks are counted by wrapping the scheduler's private ``_react``, so only
+on the cocotb versions in CALLBACK_COUNT_VERSIONS; on any other the probe
+warns and leaves callbacks and callbacks_per_cycle out of the metrics.
+"""
+
+import json
+import logging
+import os
+import time
+
+import cocotb
+from cocotb.utils import get_sim_time
+
+from .config import CLK_PERIOD_NS
+
+# Metrics compared against the baseline; all of them are "lower is better"
+TRACKED_METRICS = ("wall_s", "wall_per_item_us", "callbacks_per_cycle", "callbacks_per_item")
+
+# cocotb releases whose Scheduler._react(trigger) is the single entry point of
+# every fired trigger
+CALLBACK_COUNT_VERSIONS = ("1.9.2",)
+
+logger = logging.getLogger("cocotb")
+
+
+def counts_callbacks(version=None):
+    return (version or cocotb.__version__) in CALLBACK_COUNT_VERSIONS
+
+
+class PerfProbe:
+    """Measure the workload run inside ``with PerfProbe(name, items) as probe:``"""
+
+    def __init__(self, name, items, clocked=True):
+        self.name = name
+        self.items = items
+        self.clocked = clocked
+        self.callbacks = 0
+        self.metrics = {}
+
+    def __enter__(self):
+        self._scheduler = None
+        if counts_callbacks():
+            # Scheduler._react is what every primed trigger calls back into; a
+            # counting wrapper on the instance is picked up by every trigger
+            # primed from here on
+            self._scheduler = cocotb.scheduler
+            react = self._scheduler._react
+
+            def counting_react(trigger):
+                self.callbacks += 1
+                return react(trigger)
+
+            self._scheduler._react = counting_react
+        else:
+            logger.warning("PerfProbe %s: callback counting needs cocotb %s, not %s",
+                           self.name, " / ".join(CALLBACK_COUNT_VERSIONS), cocotb.__version__)
+        self._sim_start = get_sim_time("ns")
+        self._wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall_s = time.perf_counter() - self._wall_start
+        sim_ns = get_sim_time("ns") - self._sim_start
+        if self._scheduler is not None:
+            del self._scheduler._react  # back to the class method
+
+        self.metrics = {
+            "name": self.name,
+            "items": self.items,
+            "wall_s": wall_s,
+            "sim_ns": sim_ns,
+            "items_per_s": self.items / wall_s if wall_s else 0.0,
+            "wall_per_item_us": 1e6 * wall_s / self.items if self.items else 0.0,
+        }
+        cycles = sim_ns / CLK_PERIOD_NS if self.clocked else None
+        if cycles is not None:
+            self.metrics["cycles"] = cycles
+            self.metrics["cycles_per_s"] = cycles / wall_s if wall_s else 0.0
+        if self._scheduler is not None:
+            self.metrics["callbacks"] = self.callbacks
+            if cycles is not None:
+                self.metrics["callbacks_per_cycle"] = self.callbacks / cycles if cycles else 0.0
+            else:
+                self.metrics["callbacks_per_item"] = self.callbacks / self.items if self.items else 0.0
+        if exc_info[0] is None:
+            record(self.metrics)
+        return False
+
+
+def record(metrics, path=None):
+    """Append one workload's metrics to PERF_OUT (no-op when it is unset)"""
+    path = path or os.getenv("PERF_OUT")
+    if path:
+        with open(path, "a") as f:
+            f.write(json.dumps(metrics) + "\n")
+
+
+def read_records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ----------------------------------------------------------------
+# Comparison against a baseline
+# ----------------------------------------------------------------
+def compare(results, baseline, threshold=0.10):
+    """Rows (workload, metric, baseline, current, change, regressed) for every
+    tracked metric present in both *results* and *baseline* (workload -> metrics).
+
+    A metric regresses when it grew by more than *threshold* (0.10 = 10%).
+    """
+    rows = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in TRACKED_METRICS:
+            if metric not in current or not base.get(metric):
+                continue
+            change = current[metric] / base[metric] - 1.0
+            rows.append((name, metric, base[metric], current[metric], change, change > threshold))
+    return rows
+
+
+def format_comparison(rows):
+    lines = [f"{'workload':24} {'metric':20} {'baseline':>12} {'current':>12} {'change':>8}"]
+    for name, metric, base, current, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        lines.append(f"{name:24} {metric:20} {base:12.4g} {current:12.4g} {change:+8.1%}{flag}")
+    return "\n".join(lines)
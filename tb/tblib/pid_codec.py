@@ -0,0 +1,342 @@
+# ====================================
+# File: pid_codec.py
+# Author: jaimebw
+# Created: 2026-10-18 10:25:43
+# ====================================
+"""Bulk codec for the two PID frame formats.
+
+RX (UartRxPidBuffer), one 4-byte frame per byte lane:
+
+    START(0xAA) PID VALUE END(0x55)
+    PIDs 0x10..0x13 carry a1 MSB..LSB, 0x20..0x23 a2 MSB..LSB; a full
+    (a1, a2) update is 8 frames = 32 bytes. PID 0x69 is the test frame.
+
+RX burst frames, a whole word per frame, MSB first:
+
+    START(0xAA) 0x30 a1[31:24..7:0] END(0x55)                7 bytes
+    START(0xAA) 0x31 a2[31:24..7:0] END(0x55)                7 bytes
+    START(0xAA) 0x32 a1[31:24..7:0] a2[31:24..7:0] END(0x55) 11 bytes
+
+    Burst and lane frames fill the same lanes and can be mixed; ready pulses
+    once every lane of a1 and a2 was written, so a 0x32 frame alone is a full
+    update in 11 bytes instead of 32.
+
+TX (UartTxPidBuffer), one 7-byte frame per word:
+
+    START(0xAA) PID(0x69 data / 0x42 test) b0 b1 b2 b3 END(0x55), little endian
+
+Everything works on whole buffers with extended-slice copies and struct, so
+the per-frame cost stays in C; the *_into variants write into a caller's
+bytearray/memoryview without allocating the output.
+"""
+
+import struct
+from functools import lru_cache
+
+START_DEL = 0xAA
+END_DEL = 0x55
+
+RX_TEST_PID = 0x69
+A1_PIDS = (0x10, 0x11, 0x12, 0x13)  # MSB first
+A2_PIDS = (0x20, 0x21, 0x22, 0x23)
+RX_FRAME_LEN = 4
+RX_UPDATE_LEN = RX_FRAME_LEN * (len(A1_PIDS) + len(A2_PIDS))  # 32 bytes per (a1, a2)
+
+A1_WORD_PID = 0x30
+A2_WORD_PID = 0x31
+AB_WORD_PID = 0x32
+RX_WORD_BYTES = {A1_WORD_PID: 4, A2_WORD_PID: 4, AB_WORD_PID: 8}  # payload per burst PID
+RX_BURST_LEN = 3 + RX_WORD_BYTES[AB_WORD_PID]                  # 11 bytes per (a1, a2)
+
+TX_DATA_PID = 0x69
+TX_TEST_PID = 0x42
+TX_FRAME_LEN = 7
+TX_PIDS = bytes([TX_DATA_PID, TX_TEST_PID])
+
+_RX_UPDATE_TEMPLATE = bytes(
+    byte for pid in A1_PIDS + A2_PIDS for byte in (START_DEL, pid, 0, END_DEL)
+)
+
+
+@lru_cache(maxsize=64)
+def _words(count, order):
+    return struct.Struct(f"{order}{count}I")
+
+
+def _tile(view, template):
+    """Fill *view* with repeats of *template* by doubling in place (no temporaries)"""
+    size = len(view)
+    filled = min(len(template), size)
+    view[:filled] = template[:filled]
+    while filled < size:
+        step = min(filled, size - filled)
+        view[filled:filled + step] = view[:step]
+        filled += step
+
+
+# ----------------------------------------------------------------
+# RX lane frames
+# ----------------------------------------------------------------
+def encode_rx_words_into(buf, a1_words, a2_words, offset=0):
+    """Write the 8 lane frames of every (a1, a2) pair into buf[offset:].
+
+    Returns the number of bytes written (32 per pair).
+    """
+    n = len(a1_words)
+    if len(a2_words) != n:
+        raise ValueError("a1_words and a2_words must have the same length")
+    size = n * RX_UPDATE_LEN
+    view = memoryview(buf)[offset:offset + size]
+    if len(view) != size:
+        raise ValueError(f"buffer too small: need {size} bytes at offset {offset}")
+
+    words = [0] * (2 * n)
+    words[0::2] = a1_words
+    words[1::2] = a2_words
+    _tile(view, _RX_UPDATE_TEMPLATE)
+    # Big endian a1, a2 pairs are exactly the VALUE bytes in frame order
+    view[2::RX_FRAME_LEN] = _words(2 * n, ">").pack(*words)
+    return size
+
+
+def encode_rx_words(a1_words, a2_words):
+    """Lane frames for every (a1, a2) pair as a new bytearray"""
+    buf = bytearray(len(a1_words) * RX_UPDATE_LEN)
+    encode_rx_words_into(buf, a1_words, a2_words)
+    return buf
+
+
+def encode_rx_bursts_into(buf, a1_words, a2_words, offset=0):
+    """Write one 0x32 burst frame per (a1, a2) pair into buf[offset:].
+
+    Returns the number of bytes written (11 per pair).
+    """
+    n = len(a1_words)
+    if len(a2_words) != n:
+        raise ValueError("a1_words and a2_words must have the same length")
+    size = n * RX_BURST_LEN
+    view = memoryview(buf)[offset:offset + size]
+    if len(view) != size:
+        raise ValueError(f"buffer too small: need {size} bytes at offset {offset}")
+    if not n:
+        return 0
+
+    words = [0] * (2 * n)
+    words[0::2] = a1_words
+    words[1::2] = a2_words
+    _tile(view, bytes([START_DEL, AB_WORD_PID]) + bytes(8) + bytes([END_DEL]))
+    packed = memoryview(_words(2 * n, ">").pack(*words))
+    for lane in range(8):
+        view[2 + lane::RX_BURST_LEN] = packed[lane::8]
+    return size
+
+
+def encode_rx_bursts(a1_words, a2_words):
+    """One 0x32 burst frame per (a1, a2) pair as a new bytearray"""
+    buf = bytearray(len(a1_words) * RX_BURST_LEN)
+    encode_rx_bursts_into(buf, a1_words, a2_words)
+    return buf
+
+
+def encode_rx_burst(a1=None, a2=None):
+    """Burst frame for a1, a2 or both (0x30, 0x31 or 0x32)"""
+    if a1 is None and a2 is None:
+        raise ValueError("need a1, a2 or both")
+    if a2 is None:
+        return bytes([START_DEL, A1_WORD_PID]) + struct.pack(">I", a1) + bytes([END_DEL])
+    if a1 is None:
+        return bytes([START_DEL, A2_WORD_PID]) + struct.pack(">I", a2) + bytes([END_DEL])
+    return bytes(encode_rx_bursts([a1], [a2]))
+
+
+def encode_rx_test(value):
+    """Test frame: sets the low byte of a1 and a2 and pulses ready"""
+    return bytes([START_DEL, RX_TEST_PID, value & 0xFF, END_DEL])
+
+
+class RxPidBufferModel:
+    """Byte-level model of UartRxPidBuffer for streaming checks.
+
+    feed() takes received bytes and returns the (a1, a2, test) values the DUT
+    presents on each ready pulse. Mirrors the RTL, including its quirks: any
+    byte after START is taken as the PID, a frame whose END byte is wrong is
+    dropped, a test frame only replaces the low byte of a1/a2 and restarts the
+    lane bookkeeping. Burst frames write all lanes of their word(s).
+    test_cycle_models.py checks it against the clocked cycle_models.PidBufferModel.
+    """
+
+    _IDLE, _GOT_START, _GOT_PID, _GOT_VAL, _GOT_WORD = range(5)
+    _LANES = {pid: (0, 3 - n) for n, pid in enumerate(A1_PIDS)}
+    _LANES.update({pid: (1, 3 - n) for n, pid in enumerate(A2_PIDS)})
+
+    def __init__(self):
+        self.state = self._IDLE
+        self.pid = 0
+        self.value = 0
+        self.payload = bytearray()                 # burst bytes so far
+        self.lanes = [bytearray(4), bytearray(4)]  # [a1, a2], index 0 = LSB
+        self.written = [0, 0]                      # lane bitmasks
+        self.updates = 0
+
+    def _word(self, n):
+        return int.from_bytes(self.lanes[n], "little")
+
+    def feed(self, data):
+        updates = []
+        state, lanes_of = self.state, self._LANES
+        for byte in data:
+            if state == self._IDLE:
+                if byte == START_DEL:
+                    state = self._GOT_START
+            elif state == self._GOT_START:
+                self.pid = byte
+                del self.payload[:]
+                state = self._GOT_WORD if byte in RX_WORD_BYTES else self._GOT_PID
+            elif state == self._GOT_WORD:
+                self.payload.append(byte)
+                if len(self.payload) == RX_WORD_BYTES[self.pid]:
+                    state = self._GOT_VAL
+            elif state == self._GOT_PID:
+                self.value = byte
+                state = self._GOT_VAL
+            else:
+                state = self._IDLE
+                if byte != END_DEL:
+                    continue
+                pid = self.pid
+                if pid == RX_TEST_PID:
+                    self.lanes[0][0] = self.lanes[1][0] = self.value
+                    self.written = [0, 0]
+                    updates.append((self._word(0), self._word(1), 1))
+                elif pid in lanes_of:
+                    word, lane = lanes_of[pid]
+                    self.lanes[word][lane] = self.value
+                    self.written[word] |= 1 << lane
+                elif pid in RX_WORD_BYTES:
+                    words = (0, 1) if pid == AB_WORD_PID else (pid - A1_WORD_PID,)
+                    for n, word in enumerate(words):
+                        self.lanes[word][:] = self.payload[4 * n:4 * n + 4][::-1]
+                        self.written[word] = 0xF
+                else:
+                    continue
+                if pid != RX_TEST_PID and self.written == [0xF, 0xF]:
+                    self.written = [0, 0]
+                    updates.append((self._word(0), self._word(1), 0))
+        self.state = state
+        self.updates += len(updates)
+        return updates
+
+
+# ----------------------------------------------------------------
+# TX word frames
+# ----------------------------------------------------------------
+def encode_tx_words_into(buf, words, test=False, offset=0):
+    """Write the 7-byte frame UartTxPidBuffer sends for every word; returns bytes written"""
+    n = len(words)
+    size = n * TX_FRAME_LEN
+    view = memoryview(buf)[offset:offset + size]
+    if len(view) != size:
+        raise ValueError(f"buffer too small: need {size} bytes at offset {offset}")
+    if not n:
+        return 0
+
+    pid = TX_TEST_PID if test else TX_DATA_PID
+    _tile(view, bytes([START_DEL, pid, 0, 0, 0, 0, END_DEL]))
+    packed = memoryview(_words(n, "<").pack(*words))
+    for lane in range(4):
+        view[2 + lane::TX_FRAME_LEN] = packed[lane::4]
+    return size
+
+
+def encode_tx_words(words, test=False):
+    buf = bytearray(len(words) * TX_FRAME_LEN)
+    encode_tx_words_into(buf, words, test)
+    return buf
+
+
+_TX_PID_OK = bytes(1 if byte in TX_PIDS else 0 for byte in range(256))  # translate table
+
+
+def _valid_tx_prefix(view):
+    """Number of leading valid frames in *view* (a multiple of 7 bytes long)"""
+    n = len(view) // TX_FRAME_LEN
+    good = n - len(bytes(view[0::TX_FRAME_LEN]).lstrip(bytes([START_DEL])))
+    good = min(good, n - len(bytes(view[6::TX_FRAME_LEN]).lstrip(bytes([END_DEL]))))
+    bad_pid = bytes(view[1::TX_FRAME_LEN]).translate(_TX_PID_OK).find(0)
+    return good if bad_pid < 0 else min(good, bad_pid)
+
+
+def _unpack_tx_frames(view, scratch=None):
+    """PIDs (bytes) and words (tuple) of the valid frames filling *view*"""
+    n = len(view) // TX_FRAME_LEN
+    if scratch is None or len(scratch) < 4 * n:
+        scratch = bytearray(4 * n)
+    with memoryview(scratch)[:4 * n] as lanes:
+        for lane in range(4):
+            lanes[lane::4] = view[2 + lane::TX_FRAME_LEN]
+        return bytes(view[1::TX_FRAME_LEN]), _words(n, "<").unpack_from(lanes)
+
+
+def decode_tx_frames(buf):
+    """[(pid, word), ...] for a buffer of back-to-back TX frames; ValueError if misframed"""
+    view = memoryview(buf)
+    n = len(view) // TX_FRAME_LEN
+    if len(view) % TX_FRAME_LEN or _valid_tx_prefix(view) != n:
+        raise ValueError("not a sequence of START/PID/4 bytes/END frames")
+    pids, words = _unpack_tx_frames(view)
+    return list(zip(pids, words))
+
+
+class TxFrameDecoder:
+    """Streaming TX frame decoder.
+
+    feed() takes chunks of any size and returns the complete frames they
+    finish. Bytes that cannot start a valid frame (no START, wrong PID, no END
+    six bytes later) are skipped and counted in ``dropped``, so the decoder
+    resynchronizes on the next START delimiter after line noise or a cut.
+
+    Runs of valid frames are decoded in blocks whose size doubles while the
+    stream stays aligned (up to MAX_BLOCK frames), so a clean stream costs a
+    few slice copies per block and a noisy one never rescans much data.
+    """
+
+    MIN_BLOCK = 64
+    MAX_BLOCK = 1 << 16
+
+    def __init__(self):
+        self._pending = bytearray()
+        self._scratch = bytearray(4 * self.MAX_BLOCK)
+        self._block = self.MIN_BLOCK
+        self.frames = 0
+        self.dropped = 0
+
+    def feed(self, data):
+        buf = self._pending
+        buf += data
+        frames = []
+        with memoryview(buf) as view:
+            pos = self._scan(buf, view, frames)
+        del buf[:pos]
+        self.frames += len(frames)
+        return frames
+
+    def _scan(self, buf, view, frames):
+        pos = 0
+        end = len(buf)
+        while end - pos >= TX_FRAME_LEN:
+            if buf[pos] == START_DEL and buf[pos + 1] in TX_PIDS and buf[pos + 6] == END_DEL:
+                n = min(self._block, (end - pos) // TX_FRAME_LEN)
+                with view[pos:pos + n * TX_FRAME_LEN] as block:
+                    good = _valid_tx_prefix(block)
+                    with block[:good * TX_FRAME_LEN] as valid:
+                        pids, words = _unpack_tx_frames(valid, self._scratch)
+                frames.extend(zip(pids, words))
+                pos += good * TX_FRAME_LEN
+                self._block = min(2 * self._block, self.MAX_BLOCK) if good == n else self.MIN_BLOCK
+            else:
+                # Resynchronize on the next START delimiter
+                nxt = buf.find(START_DEL, pos + 1)
+                nxt = end if nxt < 0 else nxt
+                self.dropped += nxt - pos
+                pos = nxt
+        return pos
@@ -0,0 +1,83 @@
+# ====================================
+# File: plant.py
+# Author: jaimebw
+# Created: 2026-10-18 11:05:58
+# ====================================
+"""Discrete-time plant models to close the loop around LandauControlLaw.
+
+The plant state is measured as (a1, a2) in Q16.16, the controller answers
+with b, and the plant applies it for one step:
+
+    x[k+1] = A x[k] + B u[k] + w[k],   u[k] = b[k] / 2**16
+
+w is seeded Gaussian process noise, so the loop keeps moving instead of
+settling at zero. closed_loop() runs the same plant against the NumPy
+control law: the trajectory the HDL loop must reproduce bit for bit.
+"""
+
+import numpy as np
+
+from .control_law_model import Q16_ONE, control_law, to_q16
+
+Q16_RANGE = 32767.0   # largest magnitude a Q16.16 measurement holds
+
+
+class LinearPlant:
+    """x[k+1] = A x[k] + B u + w with scalar input u; measures the whole state"""
+
+    def __init__(self, a, b, x0, noise=0.0, seed=0):
+        self.a = np.asarray(a, np.float64)
+        self.b = np.asarray(b, np.float64).reshape(-1)
+        self.x = np.asarray(x0, np.float64).copy()
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+        self.steps = 0
+
+    def measure(self):
+        """(a1, a2) words: the state in Q16.16, saturated to what the format holds"""
+        a1, a2 = to_q16(np.clip(self.x[:2], -Q16_RANGE, Q16_RANGE))
+        return int(a1) & 0xFFFFFFFF, int(a2) & 0xFFFFFFFF
+
+    def step(self, b):
+        """Apply the controller output *b* (Q16.16 word) for one step"""
+        u = float(to_float([b & 0xFFFFFFFF])[0])
+        self.x = self.a @ self.x + self.b * u
+        if self.noise:
+            self.x = self.x + self.rng.normal(0.0, self.noise, self.x.shape)
+        self.steps += 1
+        return self.x
+
+
+def double_integrator(dt=1.0, x0=(4.0, 0.0), noise=0.05, seed=0):
+    """Position/velocity plant: a1 = position, a2 = velocity, b = acceleration.
+    With the real gains (K1 = -0.2, K2 = -0.4) and dt = 1 the closed loop
+    poles are 0.75 +/- 0.37j, |z| = 0.84.
+    """
+    return LinearPlant([[1.0, dt], [0.0, 1.0]], [0.5 * dt * dt, dt], x0, noise, seed)
+
+
+def closed_loop(plant, steps, k1, k2):
+    """Run *plant* against the NumPy control law; returns (a1, a2, b) uint32 arrays"""
+    trace = np.zeros((3, steps), np.uint32)
+    for k in range(steps):
+        a1, a2 = plant.measure()
+        b = int(control_law(as_int32([a1]), as_int32([a2]), [0], k1, k2).view(np.uint32)[0])
+        trace[:, k] = a1, a2, b
+        plant.step(b)
+    return trace
+
+
+def as_int32(words):
+    return np.asarray(words, np.uint32).view(np.int32)
+
+
+def to_float(words):
+    """Q16.16 words (uint32) to floats"""
+    return as_int32(words) / Q16_ONE
+
+
+def loop_rate_bound(baud_rate, rx_bytes, tx_bytes, bits_per_byte=10):
+    """Highest update rate (Hz) of a ping-pong loop over one UART: the
+    measurement and the answer take turns on the line
+    """
+    return baud_rate / (bits_per_byte * (rx_bytes + tx_bytes))
@@ -0,0 +1,172 @@
+# ====================================
+# File: probes.py
+# Author: jaimebw
+# Created: 2026-10-18 11:08:29
+# ====================================
+"""Cycle-level latency and throughput probes on the DUT interfaces.
+
+An EventProbe timestamps the rising edges of a 1-bit pulse (rx_done, ready,
+tx_valid, tx_start, ...) with the cocotb sim time, in clock cycles. Like
+tblib.triggers it waits on the signal's own edges: one wakeup per pulse, not
+one per clock.
+
+The analysis takes plain arrays of event times in cycles, so the same
+functions measure a probe in the simulator and a cycle-model trace
+(pulse_cycles()):
+
+    latencies(cause, effect)   cycles from each cause to the first effect after it
+    histogram(latencies)       {cycles: count}
+    throughput(events)         events per clock between the first and the last
+    check_budget(latencies, max_cycles, what)   AssertionError with the histogram
+
+The budgets below are checked on the cycle models (tb/test_probes.py) and on
+the RTL (the *_latency_budget cocotb tests). END_TO_READY_CYCLES and
+VALID_TO_START_CYCLES are fixed latencies, checked for equality with
+min_cycles; rx_stop_to_done_budget() is an upper bound.
+
+Latencies are between rising edges and rounded up to whole clocks: a pulse
+registered on the edge after its cause is 1 cycle.
+"""
+
+import math
+from collections import Counter
+
+import cocotb
+import numpy as np
+from cocotb.triggers import RisingEdge
+from cocotb.utils import get_sim_time
+
+from .config import CLK_PERIOD_NS
+
+
+# ----------------------------------------------------------------
+# Cycle budgets of the RTL, shared by the cocotb tests and the cycle-model
+# checks in test_probes.py: a change that adds pipeline latency fails both
+# ----------------------------------------------------------------
+END_TO_READY_CYCLES = 3     # UartRxPidBuffer: rx_done of the END byte -> ready (set_ready, set_ready_ff)
+VALID_TO_START_CYCLES = 2   # UartTxPidBuffer: tx_valid -> first tx_start (S_LOAD)
+RX_SAMPLE_TO_DONE_CYCLES = 3  # integer UartRx: last data bit sample -> rx_done (READ, DONE)
+RX_STOP_TICK_TO_DONE_CYCLES = 2  # phase-timed UartRx: mid stop bit tick -> rx_done (STOP, DONE)
+
+
+def rx_stop_to_done_budget(clks_per_bit, phase_timing=False):
+    """Cycles from the start of the stop bit to rx_done in UartRx.
+
+    The integer receiver completes on the middle of the last data bit, half a
+    bit before the stop bit: the budget is negative. The phase-timed one
+    ticks within a clock after the middle of the stop bit.
+    """
+    if phase_timing:
+        return math.ceil(clks_per_bit / 2) + RX_STOP_TICK_TO_DONE_CYCLES
+    return RX_SAMPLE_TO_DONE_CYCLES - (clks_per_bit - clks_per_bit // 2)
+
+
+# ----------------------------------------------------------------
+# Event sources
+# ----------------------------------------------------------------
+def ns_to_cycles(t_ns, clk_period_ns=CLK_PERIOD_NS):
+    """Sim time(s) in ns as (fractional) clock cycles since time 0"""
+    return np.asarray(t_ns, np.float64) / clk_period_ns
+
+
+class EventProbe:
+    """Record the rising edges of a 1-bit *signal*, optionally only those for
+    which when() (called at the edge, may read other signals) is true
+    """
+
+    def __init__(self, signal, when=None, clk_period_ns=CLK_PERIOD_NS):
+        self.signal = signal
+        self.when = when
+        self.clk_period_ns = clk_period_ns
+        self.times_ns = []
+        self._task = None
+
+    def start(self):
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    async def _run(self):
+        rising = RisingEdge(self.signal)
+        when, times = self.when, self.times_ns
+        while True:
+            await rising
+            if when is None or when():
+                times.append(get_sim_time("ns"))
+
+    def __len__(self):
+        return len(self.times_ns)
+
+    @property
+    def cycles(self):
+        return ns_to_cycles(self.times_ns, self.clk_period_ns)
+
+
+def pulse_cycles(values, driven=False):
+    """Rising edges of a per-cycle 0/1 trace, in cycles.
+
+    simulate() outputs (driven=False) hold the value after edge k, so a pulse
+    at index k rose on edge k. Input streams (driven=True) are sampled on edge
+    k, so the testbench raised them just after edge k - 1.
+    """
+    values = np.asarray(values).astype(bool)
+    rising = np.nonzero(values & ~np.concatenate([[False], values[:-1]]))[0]
+    return rising - 1 if driven else rising
+
+
+# ----------------------------------------------------------------
+# Analysis
+# ----------------------------------------------------------------
+def latencies(cause, effect, min_cycles=0):
+    """Cycles from each cause to the first effect at or after cause + min_cycles,
+    rounded up. A negative *min_cycles* lets an effect come before its cause
+    (UartRx raises rx_done before the stop bit). Causes with no effect after
+    them are left out.
+    """
+    cause = np.asarray(cause, np.float64)
+    effect = np.sort(np.asarray(effect, np.float64))
+    index = np.searchsorted(effect, cause + min_cycles, side="left")
+    matched = index < len(effect)
+    delta = effect[index[matched]] - cause[matched]
+    return np.ceil(np.round(delta, 6)).astype(np.int64)
+
+
+def histogram(cycles):
+    """{latency in cycles: count}, ascending"""
+    return dict(sorted(Counter(np.asarray(cycles).tolist()).items()))
+
+
+def format_histogram(cycles, width=40):
+    counts = histogram(cycles)
+    if not counts:
+        return "(no events)"
+    peak = max(counts.values())
+    return "\n".join(f"{latency:6d} cycles {count:7d} {'#' * max(1, count * width // peak)}"
+                     for latency, count in counts.items())
+
+
+def throughput(events):
+    """Events per clock between the first and the last event"""
+    events = np.sort(np.asarray(events, np.float64))
+    if len(events) < 2 or events[-1] == events[0]:
+        return 0.0
+    return (len(events) - 1) / (events[-1] - events[0])
+
+
+def check_budget(cycles, max_cycles, what, expected_count=None, min_cycles=None):
+    """Assert every latency is within *max_cycles* (and at least *min_cycles*),
+    with the histogram on failure. min_cycles=max_cycles pins a fixed latency.
+    """
+    cycles = np.asarray(cycles)
+    if expected_count is not None and len(cycles) != expected_count:
+        raise AssertionError(f"{what}: {len(cycles)} latencies measured, expected {expected_count}")
+    if len(cycles) and cycles.max() > max_cycles:
+        raise AssertionError(f"{what}: max {cycles.max()} cycles, budget {max_cycles}\n"
+                             + format_histogram(cycles))
+    if min_cycles is not None and len(cycles) and cycles.min() < min_cycles:
+        raise AssertionError(f"{what}: min {cycles.min()} cycles, expected at least {min_cycles}\n"
+                             + format_histogram(cycles))
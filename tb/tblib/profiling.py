@@ -0,0 +1,231 @@
+# ====================================
+# File: profiling.py
+# Author: jaimebw
+# Created: 2026-10-18 10:24:06
+# ====================================
+"""Opt-in profiler for the cocotb testbenches: TB_PROFILE=1 pytest tb/...
+
+Every cocotb test module calls install_from_env() after its imports; with
+TB_PROFILE set it hooks three places inside the simulator:
+
+- Task._advance: every resumption of a coroutine. The Python time of the
+  resumption is charged to the await stack the coroutine suspends on
+  (task coroutine -> nested coroutines -> trigger), and the trigger it
+  awaits next is counted.
+- the .value property of the signal handles: reads and writes per signal,
+  and per task.
+- RegressionManager._record_result: at the end of every test the profile
+  is written to <sim_build>/profile/<test>.folded (flame-graph folded
+  stacks, microseconds) and <test>.json (per-coroutine summary), then reset.
+
+TB_PROFILE_DIR overrides the output directory. Render a profile with
+flamegraph.pl, speedscope or ``python -m tblib.profiling <file>.folded``.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import cocotb
+import cocotb.handle
+import cocotb.regression
+import cocotb.task
+import cocotb.triggers
+
+_profiler = None
+
+
+def _trigger_name(trigger):
+    signal = getattr(trigger, "signal", None)
+    if signal is not None:
+        return f"{type(trigger).__name__}({signal._name})"
+    return type(trigger).__name__
+
+
+def _await_stack(task):
+    """Qualified names from the task's coroutine down to the innermost awaited coroutine"""
+    frames = []
+    coro = task._coro
+    while coro is not None and hasattr(coro, "cr_code"):
+        frames.append(coro.__qualname__)
+        coro = coro.cr_await
+    return frames
+
+
+class CoroutineProfiler:
+    def __init__(self, out_dir):
+        self.out_dir = Path(out_dir)
+        self.reset()
+
+    def reset(self):
+        self.folded = Counter()            # stack -> microseconds of Python time
+        self.resumes = Counter()           # task coroutine -> resumptions
+        self.python_s = Counter()          # task coroutine -> Python seconds
+        self.max_resume_s = Counter()
+        self.triggers = defaultdict(Counter)  # task coroutine -> trigger -> count
+        self.reads = Counter()             # signal path -> reads
+        self.writes = Counter()
+        self.task_reads = Counter()        # task coroutine -> signal reads
+        self.task_writes = Counter()
+        self._nested_s = 0.0
+        self._start = time.perf_counter()
+
+    # ------------------------------------------------------------
+    # Hooks
+    # ------------------------------------------------------------
+    def advance(self, advance, task, outcome):
+        outer_nested = self._nested_s
+        self._nested_s = 0.0
+        result = None
+        start = time.perf_counter()
+        try:
+            result = advance(task, outcome)
+            return result
+        finally:
+            total = time.perf_counter() - start
+            own = total - self._nested_s
+            self._nested_s = outer_nested + total
+
+            name = task._coro.__qualname__
+            stack = _await_stack(task) or [name]
+            if not task.done():
+                leaf = _trigger_name(result) if isinstance(result, cocotb.triggers.Trigger) else "await"
+                self.triggers[name][leaf] += 1
+                stack.append(leaf)
+            self.folded[";".join(stack)] += own * 1e6
+            self.resumes[name] += 1
+            self.python_s[name] += own
+            self.max_resume_s[name] = max(self.max_resume_s[name], own)
+
+    def _current(self):
+        task = cocotb.scheduler._current_task
+        return task._coro.__qualname__ if task is not None else "<scheduler>"
+
+    def read(self, handle):
+        self.reads[handle._path] += 1
+        self.task_reads[self._current()] += 1
+
+    def write(self, handle):
+        self.writes[handle._path] += 1
+        self.task_writes[self._current()] += 1
+
+    # ------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------
+    def summary(self, test_name):
+        coroutines = {
+            name: {
+                "resumes": self.resumes[name],
+                "python_s": self.python_s[name],
+                "max_resume_s": self.max_resume_s[name],
+                "triggers": dict(self.triggers[name]),
+                "reads": self.task_reads[name],
+                "writes": self.task_writes[name],
+            }
+            for name in sorted(self.python_s, key=self.python_s.get, reverse=True)
+        }
+        return {
+            "test": test_name,
+            "wall_s": time.perf_counter() - self._start,
+            "python_s": sum(self.python_s.values()),
+            "coroutines": coroutines,
+            "signals": {path: {"reads": self.reads[path], "writes": self.writes[path]}
+                        for path in sorted(set(self.reads) | set(self.writes))},
+        }
+
+    def dump(self, test_name):
+        if not self.resumes:
+            return None
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        folded = self.out_dir / f"{test_name}.folded"
+        # flamegraph.pl wants integer counts; prefix every stack with the test
+        folded.write_text("".join(f"{test_name};{stack} {max(1, round(us))}\n"
+                                  for stack, us in sorted(self.folded.items())))
+        summary = self.summary(test_name)
+        (self.out_dir / f"{test_name}.json").write_text(json.dumps(summary, indent=2))
+
+        log = logging.getLogger("cocotb")
+        log.info(f"Profile of {test_name}: {summary['python_s']:.3f} s Python "
+                 f"of {summary['wall_s']:.3f} s wall -> {folded}")
+        for name, stats in list(summary["coroutines"].items())[:5]:
+            log.info(f"  {stats['python_s']:8.3f} s {stats['resumes']:9} resumes "
+                     f"{stats['reads']:9} reads {stats['writes']:9} writes  {name}")
+        return folded
+
+
+# ----------------------------------------------------------------
+# Installation
+# ----------------------------------------------------------------
+def _wrap_value_property(cls, profiler):
+    prop = cls.__dict__["value"]
+
+    def fget(handle):
+        profiler.read(handle)
+        return prop.fget(handle)
+
+    def fset(handle, value):
+        profiler.write(handle)
+        prop.fset(handle, value)
+
+    setattr(cls, "value", property(fget, fset if prop.fset else None, doc=prop.__doc__))
+
+
+def install(out_dir=None):
+    """Hook the profiler into the running cocotb; returns it (idempotent)"""
+    global _profiler
+    if _profiler is not None:
+        return _profiler
+    profiler = _profiler = CoroutineProfiler(out_dir or os.getenv("TB_PROFILE_DIR") or "profile")
+
+    advance = cocotb.task.Task._advance
+    cocotb.task.Task._advance = lambda task, outcome: profiler.advance(advance, task, outcome)
+
+    for cls in vars(cocotb.handle).values():
+        if (isinstance(cls, type) and issubclass(cls, cocotb.handle.NonHierarchyObject)
+                and "value" in cls.__dict__):
+            _wrap_value_property(cls, profiler)
+
+    record_result = cocotb.regression.RegressionManager._record_result
+
+    def _record_result(manager, test, outcome, wall_time_s, sim_time_ns):
+        profiler.dump(test.__qualname__)
+        profiler.reset()
+        return record_result(manager, test, outcome, wall_time_s, sim_time_ns)
+
+    cocotb.regression.RegressionManager._record_result = _record_result
+    return profiler
+
+
+def install_from_env():
+    """Install when TB_PROFILE is set and we are running inside a simulator"""
+    # cocotb.top is set before the test modules are imported, the scheduler only after
+    if os.getenv("TB_PROFILE", "0") not in ("", "0") and cocotb.top is not None:
+        install()
+
+
+# ----------------------------------------------------------------
+# Text report for a folded file
+# ----------------------------------------------------------------
+def top_stacks(folded_file, n=20):
+    totals = Counter()
+    for line in Path(folded_file).read_text().splitlines():
+        stack, _, us = line.rpartition(" ")
+        totals[stack] += int(us)
+    return totals.most_common(n)
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("usage: python -m tblib.profiling <test>.folded")
+    stacks = top_stacks(sys.argv[1])
+    total = sum(us for _, us in stacks) or 1
+    for stack, us in stacks:
+        print(f"{us / 1e3:10.1f} ms {100 * us / total:5.1f}%  {stack}")
+
+
+if __name__ == "__main__":
+    main()
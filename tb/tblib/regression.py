@@ -0,0 +1,185 @@
+# ====================================
+# File: regression.py
+# Author: jaimebw
+# Created: 2026-10-18 10:15:48
+# ====================================
+"""Run SimJobs on a process pool, one isolated build/results directory per job"""
+
+import importlib
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+from .results import latest_results_file, parse_results
+from .runner import TB_DIR, run_job
+
+
+@dataclass
+class JobResult:
+    name: str
+    toplevel: str
+    module: str
+    parameters: dict
+    passed: bool
+    wall_time_s: float
+    tests: list = field(default_factory=list)
+    error: str = ""
+    log_file: str = ""  # cocotb-test output of the run
+
+
+def discover(attr, tb_dir=TB_DIR, pattern="test_*.py"):
+    """Concatenate the *attr* list (JOBS, SWEEPS) of every test module in *tb_dir*"""
+    if str(tb_dir) not in sys.path:
+        sys.path.insert(0, str(tb_dir))
+    found = []
+    for path in sorted(Path(tb_dir).glob(pattern)):
+        module = importlib.import_module(path.stem)
+        found.extend(getattr(module, attr, []))
+    return found
+
+
+def discover_jobs(tb_dir=TB_DIR, pattern="test_*.py"):
+    """Collect the JOBS list of every test module in *tb_dir*"""
+    jobs = discover("JOBS", tb_dir, pattern)
+
+    names = [job.name for job in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Job names must be unique, repeated: {duplicates}")
+    return jobs
+
+
+def default_workers():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def log_to(path):
+    """Send the cocotb-test output of this (worker) process to *path*"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    logger = logging.getLogger("cocotb")
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers = [logging.FileHandler(path, mode="w")]
+    logger.propagate = False
+
+
+def execute_job(job, build_dir, run_kwargs, log_file=None):
+    """Run one job, cocotb-test output goes to build_dir/run.log (or *log_file*); never raises"""
+    build_dir.mkdir(parents=True, exist_ok=True)
+    log_file = log_file or build_dir / "run.log"
+    log_to(log_file)
+
+    error = ""
+    start = time.perf_counter()
+    try:
+        run_job(job, sim_build=build_dir, **run_kwargs)
+    except (SystemExit, Exception) as exc:
+        error = str(exc) or type(exc).__name__
+    wall_time_s = time.perf_counter() - start
+
+    results_file = latest_results_file(build_dir)
+    tests = parse_results(results_file) if results_file else []
+    passed = not error and bool(tests) and all(t.passed or t.skipped for t in tests)
+    return JobResult(
+        name=job.name,
+        toplevel=job.toplevel,
+        module=job.module,
+        parameters=job.parameters,
+        passed=passed,
+        wall_time_s=wall_time_s,
+        tests=[t._asdict() for t in tests],
+        error=error,
+        log_file=str(log_file),
+    )
+
+
+def run_jobs(jobs, out_dir, workers=None, on_result=None, **run_kwargs):
+    """Run *jobs* in parallel under out_dir/<job name>; results keep the job order"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = max(1, min(workers or default_workers(), len(jobs)))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(execute_job, job, out_dir / f"{job.name}_{job.build_tag()}", run_kwargs)
+                   for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+    order = {job.name: n for n, job in enumerate(jobs)}
+    results.sort(key=lambda r: order[r.name])
+    return results
+
+
+# ----------------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------------
+def status(result):
+    return "PASS" if result.passed else "FAIL"
+
+
+def format_result(result):
+    n_pass = sum(t["passed"] for t in result.tests)
+    sim_ns = sum(t["sim_time_ns"] for t in result.tests)
+    line = (f"{status(result):4}  {result.name:32} {n_pass:3}/{len(result.tests):<3} tests"
+            f"  sim {sim_ns / 1e6:10.3f} ms  wall {result.wall_time_s:8.2f} s")
+    if result.error:
+        line += f"  ({result.error})"
+    return line
+
+
+def format_summary(results, wall_time_s):
+    lines = [format_result(r) for r in results]
+    failed = [r.name for r in results if not r.passed]
+    slowest = max((r.wall_time_s for r in results), default=0.0)
+    lines.append(f"{len(results) - len(failed)}/{len(results)} jobs passed in {wall_time_s:.2f} s "
+                 f"(slowest job {slowest:.2f} s)")
+    if failed:
+        lines.append("Failed: " + ", ".join(failed))
+    return "\n".join(lines)
+
+
+def report_path(path, out_dir):
+    """*path* relative to the report directory when it is inside it"""
+    try:
+        return str(Path(path).relative_to(out_dir))
+    except ValueError:
+        return str(path)
+
+
+def write_report(results, out_dir, wall_time_s):
+    """Write out_dir/report.xml (JUnit, one testsuite per job) and out_dir/summary.json"""
+    out_dir = Path(out_dir)
+    suites = ET.Element("testsuites", time=f"{wall_time_s:.3f}")
+    for result in results:
+        failures = sum(not t["passed"] and not t["skipped"] for t in result.tests)
+        suite = ET.SubElement(suites, "testsuite", name=result.name,
+                              tests=str(len(result.tests)), failures=str(failures),
+                              time=f"{result.wall_time_s:.3f}")
+        if result.error and not result.tests:
+            case = ET.SubElement(suite, "testcase", classname=result.name, name="simulation")
+            ET.SubElement(case, "error", message=result.error)
+        for t in result.tests:
+            case = ET.SubElement(suite, "testcase", classname=f"{result.name}.{t['module']}",
+                                 name=t["name"], time=f"{t['wall_time_s']:.3f}",
+                                 sim_time_ns=repr(t["sim_time_ns"]))
+            if t["skipped"]:
+                ET.SubElement(case, "skipped")
+            elif not t["passed"]:
+                ET.SubElement(case, "failure", message=f"see {report_path(result.log_file, out_dir)}")
+    ET.ElementTree(suites).write(out_dir / "report.xml", encoding="utf-8", xml_declaration=True)
+
+    summary = {"wall_time_s": wall_time_s, "jobs": [asdict(r) for r in results]}
+    (out_dir / "summary.json").write_text(json.dumps(summary, indent=2, default=str))
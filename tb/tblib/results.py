@@ -0,0 +1,41 @@
+# ====================================
+# File: results.py
+# Author: jaimebw
+# Created: 2026-10-18 10:16:04
+# ====================================
+"""Read the JUnit results files written by cocotb"""
+
+from collections import namedtuple
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+TestResult = namedtuple("TestResult", "name module passed skipped wall_time_s sim_time_ns")
+
+
+def parse_results(xml_file):
+    """One TestResult per <testcase> in a cocotb results file"""
+    tree = ET.parse(xml_file)
+    results = []
+    for tc in tree.iter("testcase"):
+        skipped = tc.find("skipped") is not None
+        failed = tc.find("failure") is not None or tc.find("error") is not None
+        results.append(TestResult(
+            name=tc.get("name"),
+            module=tc.get("classname"),
+            passed=not failed and not skipped,
+            skipped=skipped,
+            wall_time_s=float(tc.get("time", 0)),
+            sim_time_ns=float(tc.get("sim_time_ns", 0)),
+        ))
+    return results
+
+
+def latest_results_file(sim_build):
+    """Newest non-empty *_results.xml cocotb-test left in *sim_build*, or None.
+
+    cocotb-test creates the file before launching the simulator, so it stays
+    empty when the compile or the simulator itself fails.
+    """
+    files = [f for f in Path(sim_build).glob("*_results.xml") if f.stat().st_size]
+    files.sort(key=lambda f: f.stat().st_mtime)
+    return files[-1] if files else None
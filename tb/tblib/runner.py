@@ -0,0 +1,247 @@
+# ====================================
+# File: runner.py
+# Author: jaimebw
+# Created: 2026-10-18 10:14:31
+# ====================================
+"""cocotb-test runner with the compiled-image cache in front of it.
+
+Every test module describes its simulator invocations as a JOBS list of
+SimJob; the pytest runner in the module and the parallel regression
+(tb/regress.py) both execute those same jobs. A job builds in
+tb/sim_<name>_<build tag> (plus _<simulator> off Icarus); SIM=verilator runs
+every job on Verilator.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from cocotb_test.simulator import run
+
+from .build_cache import BuildCache, build_key
+from .config import rx_level, uart_parameters
+from .deps import verilog_sources
+from .results import latest_results_file, parse_results
+from .waves import (DUMP_MODULE, dump_plusargs, wave_format, wave_scope,
+                    wave_window_ns, waves_requested, write_dump_module)
+
+
+SIMULATORS = ("icarus", "verilator")
+
+# cocotb-test arguments that only affect the simulation run, not the compiled
+# image; every other keyword of run_sim goes into the cache key
+RUN_ONLY_KWARGS = frozenset({
+    "module", "sim_build", "testcase", "plus_args", "sim_args", "simulation_args",
+    "extra_env", "seed", "python_search", "gui", "compile_only",
+})
+
+# Verilator treats its lint warnings (width mismatches, unused bits) as errors
+SIMULATOR_COMPILE_ARGS = {"verilator": ["-Wno-fatal"]}
+
+
+def resolve_simulator(simulator=None):
+    """The SIM environment variable wins (as in cocotb-test), then *simulator*, then icarus"""
+    return os.getenv("SIM") or simulator or "icarus"
+
+
+def run_sim(verilog_sources, toplevel, module, sim_build, parameters=None,
+            defines=None, timescale=None, waves=False, compile_args=None,
+            simulator=None, **kwargs):
+    """Same arguments as cocotb_test.simulator.run, but reuses cached Icarus images.
+
+    SIM_CACHE=0 disables the cache. Other simulators are passed straight through.
+    """
+    simulator = resolve_simulator(simulator)
+    run_kwargs = dict(
+        verilog_sources=verilog_sources,
+        toplevel=toplevel,
+        module=module,
+        sim_build=sim_build,
+        parameters=parameters,
+        defines=defines,
+        timescale=timescale,
+        waves=waves,
+        compile_args=compile_args,
+        **kwargs,
+    )
+    if os.getenv("SIM") is None:
+        run_kwargs["simulator"] = simulator
+    if simulator != "icarus" or os.getenv("SIM_CACHE", "1") == "0":
+        return run(**run_kwargs)
+
+    compile_kwargs = {name: value for name, value in kwargs.items()
+                      if name not in RUN_ONLY_KWARGS and value is not None}
+    key = build_key(verilog_sources, toplevel, parameters=parameters, defines=defines,
+                    timescale=timescale, compile_args=compile_args, waves=waves,
+                    simulator=simulator, **compile_kwargs)
+    cache = BuildCache()
+    image = Path(sim_build) / f"{toplevel}.vvp"
+    image.parent.mkdir(parents=True, exist_ok=True)
+
+    hit = cache.fetch(key, image)
+    if not hit:
+        # Whatever is there was built with another key; never let
+        # cocotb-test's mtime check pick it up.
+        image.unlink(missing_ok=True)
+    try:
+        return run(**run_kwargs)
+    finally:
+        if not hit and image.exists():
+            cache.store(key, image, meta={
+                "toplevel": toplevel,
+                "parameters": parameters or {},
+                "defines": defines or [],
+                "sources": [str(s) for s in verilog_sources],
+            })
+            cache.prune()
+
+
+TB_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = TB_DIR.parent / "src"
+
+logger = logging.getLogger("cocotb")
+
+
+@dataclass
+class SimJob:
+    """One simulator invocation: toplevel + parameter set + cocotb test module"""
+    name: str
+    toplevel: str
+    module: str
+    verilog_sources: list = None  # None: the toplevel's file and everything it instantiates
+    parameters: dict = field(default_factory=dict)
+    defines: list = field(default_factory=list)
+    timescale: str = "1ns/1ps"
+    waves: bool = None       # None: follow the WAVES environment variable
+    waves_scope: str = None  # only dump this instance, e.g. "rx_pid_buffer"
+    simulator: str = None    # None: SIM environment variable, else icarus
+    testcase: str = None     # only run this cocotb test of the module
+    extra_env: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.verilog_sources is None:
+            self.verilog_sources = verilog_sources(self.toplevel)
+
+    def build_tag(self):
+        """Short hash of the parameters and defines: one build directory per
+        elaborated design, so an uncached build never reuses the image of
+        another baud mode or parameter set
+        """
+        config = json.dumps([sorted(self.parameters.items()), sorted(self.defines)], default=str)
+        return hashlib.sha1(config.encode()).hexdigest()[:8]
+
+    def default_build_dir(self, simulator="icarus"):
+        if simulator == "icarus":
+            return TB_DIR / f"sim_{self.name}_{self.build_tag()}"
+        return TB_DIR / f"sim_{self.name}_{self.build_tag()}_{simulator}"
+
+
+def rx_and_buffer_job(name, module, level=None, **kwargs):
+    """SimJob for UartTxAndPidBuffer at the SIM_RX_LEVEL level.
+
+    tlm wraps the real top in tb/uart_tx_and_buffer_tlm.v, which forces its
+    UartRx outputs from rx_data/rx_done ports instead of the rx line; bit drives
+    the rx line itself (job name + "_bit").
+    The level is passed on to the simulator so tblib.uart.rx_source matches it.
+    """
+    level = level or rx_level()
+    if level == "tlm":
+        toplevel = "UartTxAndPidBufferTlm"
+    else:
+        name = f"{name}_bit"
+        toplevel = "UartTxAndPidBuffer"
+    extra_env = dict(kwargs.pop("extra_env", {}), SIM_RX_LEVEL=level)
+    return SimJob(name=name, toplevel=toplevel, module=module,
+                  parameters=kwargs.pop("parameters", uart_parameters()),
+                  extra_env=extra_env, **kwargs)
+
+
+def _run_job(job, sim_build, waves, dump_start_ns=None, **kwargs):
+    sources = [str(src) for src in job.verilog_sources]
+    compile_args = list(kwargs.pop("compile_args", None) or [])
+    plus_args = list(kwargs.pop("plus_args", None) or [])
+    simulator = resolve_simulator(kwargs.pop("simulator", None) or job.simulator)
+    compile_args += SIMULATOR_COMPILE_ARGS.get(simulator, [])
+    simulator_waves = False
+    # Verilator does not expose parameters through VPI; config.dut_parameter
+    # falls back to these overrides
+    extra_env = dict(job.extra_env, SIM_PARAMETERS=json.dumps(job.parameters))
+    kwargs.setdefault("testcase", job.testcase)
+
+    if waves:
+        if simulator == "icarus":
+            fmt = wave_format()
+            scope = wave_scope(job.waves_scope)
+            sources.append(str(write_dump_module(sim_build, job.toplevel, scope, fmt)))
+            compile_args += ["-s", DUMP_MODULE]
+            plus_args += dump_plusargs(fmt, start_ns=dump_start_ns)
+        else:
+            simulator_waves = True  # the simulator's own full-hierarchy trace
+
+    return run_sim(
+        verilog_sources=sources,
+        toplevel=job.toplevel,
+        module=job.module,
+        sim_build=sim_build,
+        parameters=job.parameters,
+        defines=job.defines,
+        timescale=job.timescale,
+        waves=simulator_waves,
+        compile_args=compile_args or None,
+        plus_args=plus_args or None,
+        simulator=simulator,
+        extra_env=extra_env,
+        **kwargs,
+    )
+
+
+def capture_failure_waves(job, sim_build, **kwargs):
+    """Re-run every failed test of the last run in sim_build/waves/<test> with waves on"""
+    results_file = latest_results_file(sim_build)
+    if results_file is None:
+        return []  # nothing ran (compile error, simulator crash)
+
+    window_ns = wave_window_ns()
+    captured = []
+    for test in parse_results(results_file):
+        if test.passed or test.skipped:
+            continue
+        # Run alone the test starts at t=0, so it fails around its own sim time
+        start_ns = max(0, test.sim_time_ns - window_ns) if window_ns else None
+        wave_dir = Path(sim_build) / "waves" / test.name
+        wave_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            _run_job(job, wave_dir, waves=True, testcase=test.name,
+                     dump_start_ns=start_ns, **kwargs)
+        except SystemExit:
+            pass  # expected, it failed the first time
+        logger.error(f"Waves for failing test {test.name}: {wave_dir}")
+        captured.append(wave_dir)
+    return captured
+
+
+def run_job(job, sim_build=None, **kwargs):
+    """Run *job* in *sim_build* (tb/sim_<name>_<build tag>[_<simulator>] by default).
+
+    If the job fails without waves, its failing tests are re-run one by one
+    with waves on before the failure is re-raised (WAVES_ON_FAIL=0 disables it).
+    """
+    for src in job.verilog_sources:
+        assert Path(src).exists(), f"Missing Verilog source: {src}"
+
+    simulator = resolve_simulator(kwargs.get("simulator") or job.simulator)
+    sim_build = Path(sim_build or job.default_build_dir(simulator))
+    sim_build.mkdir(parents=True, exist_ok=True)
+    for stale in sim_build.glob("*_results.xml"):
+        stale.unlink()
+
+    waves = waves_requested(job.waves)
+    try:
+        return _run_job(job, sim_build, waves, **kwargs)
+    except SystemExit:
+        if not waves and os.getenv("WAVES_ON_FAIL", "1") != "0":
+            capture_failure_waves(job, sim_build, **kwargs)
+        raise
@@ -0,0 +1,322 @@
+# ====================================
+# File: soak.py
+# Author: jaimebw
+# Created: 2026-10-18 11:16:55
+# ====================================
+"""Seeded, resumable soak stimulus for the receive path of UartTxAndPidBuffer
+(UartRx -> UartRxPidBuffer) and its scoreboard.
+
+The stream is cut into chunks of CHUNK_BYTES bytes. Chunk k is generated
+from (seed, k) alone and starts with a sync preamble: SYNC_GUARD zero bytes
+walk UartRxPidBuffer back to IDLE from any state, then a 0x32 burst writes
+every lane and clears the masks. A run that starts at chunk k is therefore
+the continuous run from chunk k on, and a failure at byte 40M replays from
+the chunk it falls in: SOAK_OFFSET rounds down to a chunk boundary.
+
+Between the sync preambles each chunk holds whole updates (test frame, 0x32
+burst, a1 + a2 bursts, 8 shuffled lane frames, lanes + a burst), sometimes
+preceded by an unknown-PID frame or noise, and zero filler up to the chunk
+size. Line impairments, per byte:
+
+    gap       1..MAX_GAP_BITS idle bits before the byte
+    glitch    a low pulse shorter than half a bit in an idle slot before the
+              byte: UartRx must reject it on the MID_BIT re-sample
+    framing   the stop bit held low, then GUARD_BITS idle: the byte is still
+              received (UartRx never samples the stop bit), and the low stop
+              bit may be taken for a start bit, one spurious byte
+    drift     the sender's bit time off by drift(k), a slow sinusoid over
+              the chunks within +/- max_drift
+
+Only the stream position is kept; every chunk is built on demand, so a run
+of any length uses constant memory. SoakScoreboard checks the received
+bytes against the stream, every ready pulse against RxPidBufferModel fed
+with what UartRx actually produced, and that UartRxPidBuffer resynchronises:
+an intended update may only go missing within RESYNC_BYTES of a framing
+error.
+"""
+
+import math
+import random
+from collections import deque
+from dataclasses import dataclass, field
+
+from .pid_codec import (A1_PIDS, A2_PIDS, END_DEL, RX_BURST_LEN, START_DEL, RxPidBufferModel,
+                        encode_rx_burst, encode_rx_test)
+
+CHUNK_BYTES = 4096
+SYNC_GUARD = bytes(10)      # enough non-START bytes to end the longest frame (0x32 burst)
+SYNC_LEN = len(SYNC_GUARD) + RX_BURST_LEN
+GUARD_BITS = 10             # idle after a framing error: the spurious byte ends inside it
+GLITCH_SLOT_BITS = 2        # idle slot around a glitch, the START state times out inside it
+MAX_GAP_BITS = 16
+DRIFT_PERIOD_CHUNKS = 64
+RESYNC_BYTES = 64           # lost updates allowed after a framing error
+MAX_REPORTED = 20
+
+CLEAN, GLITCH, FRAMING = range(3)
+
+
+@dataclass
+class SoakProfile:
+    """Impairment rates, per byte, and the peak baud drift"""
+    gap: float = 0.02
+    glitch: float = 1e-3
+    framing: float = 2e-4
+    max_drift: float = 0.015
+
+
+@dataclass
+class SoakChunk:
+    index: int
+    offset: int                 # absolute byte offset of data[0]
+    data: bytes
+    idle_bits: bytearray        # idle bits before each byte
+    impairment: bytearray       # CLEAN, GLITCH (before the byte) or FRAMING per byte
+    glitch_bits: dict           # byte position -> glitch width in bits
+    drift: float
+    updates: list = field(default_factory=list)   # (start, end offset, (a1, a2, test)) intended
+
+    def byte_runs(self, pos):
+        """(level, bits) runs that put data[pos] on the line, with its impairments"""
+        runs = []
+        if self.idle_bits[pos]:
+            runs.append((1, self.idle_bits[pos]))
+        impairment = self.impairment[pos]
+        if impairment == GLITCH:
+            width = self.glitch_bits[pos]
+            runs += [(0, width), (1, GLITCH_SLOT_BITS - width)]
+        value = self.data[pos]
+        bits = [(value >> i) & 1 for i in range(8)] + [0 if impairment == FRAMING else 1]
+        level, length = 0, 1          # start bit
+        for bit in bits:
+            if bit == level:
+                length += 1
+            else:
+                runs.append((level, length))
+                level, length = bit, 1
+        runs.append((level, length))
+        if impairment == FRAMING:
+            runs.append((1, GUARD_BITS))
+        return runs
+
+    def runs(self):
+        for pos in range(len(self.data)):
+            yield from self.byte_runs(pos)
+
+
+class SoakStream:
+    """Chunks of the soak stream for *seed*, from any byte offset"""
+
+    def __init__(self, seed, profile=None, chunk_bytes=CHUNK_BYTES):
+        self.seed = seed
+        self.profile = profile or SoakProfile()
+        self.chunk_bytes = chunk_bytes
+
+    def start_of(self, offset):
+        """The chunk boundary a run asked to start at *offset* resumes from"""
+        return offset - offset % self.chunk_bytes
+
+    def drift(self, index):
+        phase = random.Random(f"soak-drift:{self.seed}").random() * 2 * math.pi
+        return self.profile.max_drift * math.sin(2 * math.pi * index / DRIFT_PERIOD_CHUNKS + phase)
+
+    def chunks(self, offset=0, n_bytes=None):
+        """Chunks from the one holding *offset* until *n_bytes* more were covered"""
+        index = offset // self.chunk_bytes
+        end = None if n_bytes is None else offset + n_bytes
+        while end is None or index * self.chunk_bytes < end:
+            yield self.chunk(index)
+            index += 1
+
+    def chunk(self, index):
+        rng = random.Random(f"soak:{self.seed}:{index}")
+        size = self.chunk_bytes
+        data = bytearray(SYNC_GUARD)
+        spans = [(len(data), len(data) + RX_BURST_LEN)]
+        data += encode_rx_burst(rng.getrandbits(32), rng.getrandbits(32))
+        while True:
+            unit = self._prefix(rng) + self._update(rng)
+            if len(data) + len(unit) > size:
+                break
+            spans.append((len(data), len(data) + len(unit)))
+            data += unit
+        data += bytes(size - len(data))   # filler, ignored in IDLE
+
+        profile = self.profile
+        idle_bits = bytearray(size)
+        impairment = bytearray(size)
+        glitch_bits = {}
+        for pos in range(SYNC_LEN, size):
+            if rng.random() < profile.gap:
+                idle_bits[pos] = rng.randint(1, MAX_GAP_BITS)
+            draw = rng.random()
+            if draw < profile.framing:
+                impairment[pos] = FRAMING
+            elif draw < profile.framing + profile.glitch:
+                impairment[pos] = GLITCH
+                glitch_bits[pos] = rng.uniform(0.1, 0.4)
+
+        offset = index * size
+        chunk = SoakChunk(index, offset, bytes(data), idle_bits, impairment, glitch_bits,
+                          self.drift(index))
+        # The intended updates, from the clean bytes: a fresh model is exact,
+        # every chunk ends in IDLE with the masks clear
+        model = RxPidBufferModel()
+        for start, end in spans:
+            chunk.updates += [(offset + start, offset + end, update)
+                              for update in model.feed(data[start:end])]
+        return chunk
+
+    @staticmethod
+    def _prefix(rng):
+        draw = rng.random()
+        if draw < 0.05:
+            # unknown PID, ignored
+            return bytes([START_DEL, rng.randrange(0x40, 0x60), rng.getrandbits(8), END_DEL])
+        if draw < 0.10:
+            return bytes(rng.choice([b for b in range(256) if b != START_DEL])
+                         for _ in range(rng.randint(1, 3)))
+        return b""
+
+    @staticmethod
+    def _update(rng):
+        """Frames that produce exactly one ready pulse"""
+        draw = rng.random()
+        a1, a2 = rng.getrandbits(32), rng.getrandbits(32)
+        if draw < 0.15:
+            return encode_rx_test(rng.getrandbits(8))
+        if draw < 0.50:
+            return encode_rx_burst(a1, a2)
+        if draw < 0.65:
+            frames = [encode_rx_burst(a1=a1), encode_rx_burst(a2=a2)]
+            rng.shuffle(frames)
+            return b"".join(frames)
+        lanes = [bytes([START_DEL, pid, (word >> (8 * (3 - n))) & 0xFF, END_DEL])
+                 for pids, word in ((A1_PIDS, a1), (A2_PIDS, a2)) for n, pid in enumerate(pids)]
+        if draw < 0.90:
+            rng.shuffle(lanes)
+            return b"".join(lanes)
+        # One word in lanes, the other as a burst that completes the update
+        if rng.random() < 0.5:
+            return b"".join(lanes[:4]) + encode_rx_burst(a2=a2)
+        return b"".join(lanes[4:]) + encode_rx_burst(a1=a1)
+
+
+def levels(runs, clks_per_bit):
+    """Per-cycle line levels of (level, bits) runs, run boundaries at floor(t * clks_per_bit)"""
+    out, t, start = [], 0.0, 0
+    for level, bits in runs:
+        t += bits
+        end = math.floor(t * clks_per_bit)
+        out.append(bytes([level]) * (end - start))
+        start = end
+    return b"".join(out)
+
+
+# ----------------------------------------------------------------
+# Scoreboard
+# ----------------------------------------------------------------
+class SoakScoreboard:
+    """Streaming checks of a soak run; memory bounded by the bytes in flight.
+
+    expect(chunk) before the chunk goes out, received(byte) for every
+    rx_done, guard_done() once the idle after a framing error is over and
+    ready(a1, a2, test) for every ready pulse.
+    """
+
+    def __init__(self, resync_bytes=RESYNC_BYTES):
+        self.resync_bytes = resync_bytes
+        self.pending = deque()          # (offset, byte, framing) not received yet
+        self.model = RxPidBufferModel() # fed with the bytes UartRx produced
+        self.expected = deque()         # its updates, not seen on ready yet
+        self.intended = deque()         # (start, end, update) from the clean stream
+        self.framing_offsets = deque()
+        self.window = False             # between a framing byte and the end of its guard
+        self.next_offset = 0            # offset after the last byte received
+        self.errors = []
+        self.first_error_offset = None
+        self.stats = dict.fromkeys(("bytes", "updates", "spurious_bytes", "lost_updates",
+                                    "spurious_updates", "gaps", "glitches", "framing_errors"), 0)
+
+    def error(self, offset, message):
+        if self.first_error_offset is None:
+            self.first_error_offset = offset
+        if len(self.errors) < MAX_REPORTED:
+            self.errors.append(f"byte {offset}: {message}")
+
+    def expect(self, chunk):
+        stats = self.stats
+        for pos, byte in enumerate(chunk.data):
+            self.pending.append((chunk.offset + pos, byte, chunk.impairment[pos] == FRAMING))
+        stats["gaps"] += sum(1 for bits in chunk.idle_bits if bits)
+        stats["glitches"] += chunk.impairment.count(GLITCH)
+        stats["framing_errors"] += chunk.impairment.count(FRAMING)
+        self.intended.extend(chunk.updates)
+
+    def received(self, byte):
+        self.expected.extend(self.model.feed((byte,)))
+        if self.window:
+            self.window = False
+            self.stats["spurious_bytes"] += 1
+            return
+        if not self.pending:
+            self.error(None, f"unexpected byte {byte:#04x} after the end of the stream")
+            return
+        offset, want, framing = self.pending.popleft()
+        self.next_offset = offset + 1
+        self.stats["bytes"] += 1
+        if byte != want:
+            self.error(offset, f"UartRx gave {byte:#04x}, sent {want:#04x}")
+        if framing:
+            self.framing_offsets.append(offset)
+            self.window = True
+
+    def guard_done(self):
+        self.window = False
+
+    def ready(self, a1, a2, test):
+        got = (a1, a2, test)
+        offset = self.next_offset
+        self.stats["updates"] += 1
+        want = self.expected.popleft() if self.expected else None
+        if got != want:
+            self.error(offset, f"ready with {got}, RxPidBufferModel expected {want}")
+
+        # Resynchronisation: match against the intended updates, in order
+        self._prune()
+        for n, (_, _, update) in enumerate(self.intended):
+            if update == got:
+                for _ in range(n):
+                    self._lost(*self.intended.popleft())
+                self.intended.popleft()
+                return
+        self.stats["spurious_updates"] += 1
+        if not self._near_framing_error(offset, offset):
+            self.error(offset, f"update {got} matches nothing sent, no framing error before it")
+
+    def finish(self):
+        """Every intended update left over was lost"""
+        while self.intended:
+            self._lost(*self.intended.popleft())
+        if self.pending:
+            self.error(self.pending[0][0], f"{len(self.pending)} bytes never received")
+
+    def _lost(self, start, end, update):
+        self.stats["lost_updates"] += 1
+        if not self._near_framing_error(start, end):
+            self.error(start, f"update {update} (bytes {start}..{end}) lost, no framing error before it")
+
+    def _prune(self):
+        # Later checks start at the oldest intended update or at the current byte
+        oldest = self.intended[0][0] if self.intended else self.next_offset
+        offsets = self.framing_offsets
+        while offsets and offsets[0] < oldest - self.resync_bytes:
+            offsets.popleft()
+
+    def _near_framing_error(self, start, end):
+        """A framing error in [start - resync_bytes, end)"""
+        return any(start - self.resync_bytes <= offset < end for offset in self.framing_offsets)
+
+    def summary(self, **extra):
+        return {**self.stats, "errors": len(self.errors), "first_error_offset": self.first_error_offset,
+                **extra}
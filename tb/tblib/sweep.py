@@ -0,0 +1,242 @@
+# ====================================
+# File: sweep.py
+# Author: jaimebw
+# Created: 2026-10-18 10:33:55
+# ====================================
+"""Parameter sweeps: declarative matrices expanded into SimJobs.
+
+A test module declares SWEEPS next to its JOBS:
+
+    SWEEPS = [Sweep(name="uart_rx", toplevel="UartRx", module=..., verilog_sources=[...],
+                    parameters={"BAUD_RATE": [9600, 115200], "FRAME_BITS": [8, 9]},
+                    defines=[[], ["SIM_MODE"]], env={"RANDOM_SEED": [1, 2]})]
+
+parameters and defines change the compiled image, env only the run. Points
+that give the same build are compiled once: run_sweep() compiles every
+distinct build on the worker pool and schedules its runs as soon as it is
+done. Icarus runs take the image from the build cache; other simulators (and
+SIM_CACHE=0) run a build's points one after another in its build directory.
+"""
+
+import csv
+import itertools
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from .build_cache import build_key
+from .regression import JobResult, default_workers, execute_job, log_to, status
+from .runner import SimJob, resolve_simulator, run_job
+
+DEFINES = "defines"
+
+
+@dataclass
+class Sweep:
+    """Cartesian product of parameter, define and env values for one toplevel"""
+    name: str
+    toplevel: str
+    module: str
+    verilog_sources: list
+    parameters: dict = field(default_factory=dict)        # name -> values, None: RTL default
+    defines: list = field(default_factory=lambda: [[]])   # alternative define lists
+    env: dict = field(default_factory=dict)               # run-time only: name -> values
+    where: object = None      # predicate on a point, drops the points it rejects
+    testcase: str = None
+    timescale: str = "1ns/1ps"
+
+    def axes(self):
+        axes = dict(self.parameters)
+        axes[DEFINES] = [tuple(d) for d in self.defines]
+        axes.update(self.env)
+        return axes
+
+    def points(self):
+        """Every point of the matrix as {axis: value}, duplicates and rejects removed"""
+        axes = self.axes()
+        seen = set()
+        for values in itertools.product(*axes.values()):
+            point = dict(zip(axes, values))
+            frozen = tuple(point.items())
+            if frozen in seen or (self.where is not None and not self.where(point)):
+                continue
+            seen.add(frozen)
+            yield point
+
+    def job(self, index, point):
+        parameters = {name: point[name] for name in self.parameters if point[name] is not None}
+        return SimJob(
+            name=f"{self.name}_{index:04d}",
+            toplevel=self.toplevel,
+            module=self.module,
+            verilog_sources=self.verilog_sources,
+            parameters=parameters,
+            defines=list(point[DEFINES]),
+            timescale=self.timescale,
+            testcase=self.testcase,
+            extra_env={name: str(point[name]) for name in self.env},
+        )
+
+    def jobs(self):
+        """[(SimJob, point), ...] for every point"""
+        return [(self.job(n, point), point) for n, point in enumerate(self.points())]
+
+
+def job_build_key(job, simulator):
+    return build_key(job.verilog_sources, job.toplevel, parameters=job.parameters,
+                     defines=job.defines, timescale=job.timescale, simulator=simulator)
+
+
+def group_builds(jobs, simulator):
+    """{build key: [jobs]} in first-seen order"""
+    groups = {}
+    for job in jobs:
+        groups.setdefault(job_build_key(job, simulator), []).append(job)
+    return groups
+
+
+# ----------------------------------------------------------------
+# Worker tasks (run in the pool processes)
+# ----------------------------------------------------------------
+def compile_build(job, build_dir):
+    """Compile *job* in build_dir; returns (ok, seconds, error)"""
+    log_to(build_dir / "compile.log")
+    start = time.perf_counter()
+    try:
+        run_job(job, sim_build=build_dir, compile_only=True)
+    except (SystemExit, Exception) as exc:
+        return False, time.perf_counter() - start, str(exc) or type(exc).__name__
+    return True, time.perf_counter() - start, ""
+
+
+def run_in_build(jobs, build_dir, out_dir):
+    """Run jobs sharing one build, in order, in that build's directory"""
+    return [execute_job(job, build_dir, {}, log_file=out_dir / job.name / "run.log") for job in jobs]
+
+
+def run_alone(job, out_dir):
+    return [execute_job(job, out_dir / job.name, {})]
+
+
+# ----------------------------------------------------------------
+# Scheduling
+# ----------------------------------------------------------------
+@dataclass
+class SweepResult:
+    job: JobResult
+    point: dict
+    build: str
+    compile_s: float = 0.0
+    reused: bool = False      # the build was compiled for an earlier point
+
+
+def run_sweep(jobs, out_dir, workers=None, on_result=None):
+    """Compile each distinct build once, then run every (job, point); returns SweepResults in order"""
+    out_dir = Path(out_dir)
+    simulator = resolve_simulator()
+    points = {job.name: point for job, point in jobs}
+    groups = group_builds([job for job, _ in jobs], simulator)
+    shared_dir = simulator != "icarus" or os.getenv("SIM_CACHE", "1") == "0"
+    workers = max(1, min(workers or default_workers(), len(jobs)))
+
+    compile_s = {}
+    results = {}
+
+    def record(key, job_result, reused):
+        result = SweepResult(job_result, points[job_result.name], key, compile_s[key], reused)
+        results[job_result.name] = result
+        if on_result is not None:
+            on_result(result)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(compile_build, group[0], out_dir / "builds" / key): ("compile", key)
+                   for key, group in groups.items()}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, key = pending.pop(future)
+                if kind == "run":
+                    for job_result in future.result():
+                        record(key, job_result, reused=job_result.name != groups[key][0].name)
+                    continue
+
+                ok, seconds, error = future.result()
+                compile_s[key] = seconds
+                group = groups[key]
+                if not ok:
+                    for job in group:
+                        record(key, JobResult(job.name, job.toplevel, job.module, job.parameters,
+                                              passed=False, wall_time_s=0.0,
+                                              error=f"compile failed: {error}"),
+                               reused=job is not group[0])
+                elif shared_dir:
+                    pending[pool.submit(run_in_build, group, out_dir / "builds" / key, out_dir)] = ("run", key)
+                else:
+                    for job in group:
+                        pending[pool.submit(run_alone, job, out_dir)] = ("run", key)
+
+    return [results[job.name] for job, _ in jobs]
+
+
+# ----------------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------------
+def _cell(value):
+    if isinstance(value, tuple):
+        return "+".join(value) or "-"
+    return "default" if value is None else str(value)
+
+
+def grid_rows(results):
+    """One flat row per point: the axis values, status and timings"""
+    rows = []
+    for r in results:
+        sim_ns = sum(t["sim_time_ns"] for t in r.job.tests)
+        row = {axis: _cell(value) for axis, value in r.point.items()}
+        row.update(job=r.job.name, status=status(r.job), build=r.build[:8],
+                   compile_s=0.0 if r.reused else round(r.compile_s, 3),
+                   run_s=round(r.job.wall_time_s, 3), sim_ms=round(sim_ns / 1e6, 3),
+                   error=r.job.error)
+        rows.append(row)
+    return rows
+
+
+def format_grid(results):
+    rows = grid_rows(results)
+    if not rows:
+        return "no points"
+    columns = [c for c in rows[0] if c != "error"]
+    widths = {c: max(len(c), *(len(str(row[c])) for row in rows)) for c in columns}
+    lines = ["  ".join(c.ljust(widths[c]) for c in columns)]
+    lines += ["  ".join(str(row[c]).ljust(widths[c]) for c in columns) for row in rows]
+    return "\n".join(lines)
+
+
+def format_sweep_summary(results, wall_time_s):
+    builds = {r.build for r in results}
+    failed = [r.job.name for r in results if not r.job.passed]
+    compile_total = sum(r.compile_s for r in results if not r.reused)
+    lines = [f"{len(results) - len(failed)}/{len(results)} points passed, {len(builds)} builds "
+             f"for {len(results)} points ({compile_total:.1f} s compiling) in {wall_time_s:.2f} s"]
+    if failed:
+        lines.append("Failed: " + ", ".join(failed))
+    return "\n".join(lines)
+
+
+def write_sweep_report(results, out_dir, wall_time_s):
+    """out_dir/grid.csv (one row per point) and out_dir/sweep.json"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rows = grid_rows(results)
+    columns = list(dict.fromkeys(c for row in rows for c in row))
+    with open(out_dir / "grid.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+    summary = {"wall_time_s": wall_time_s,
+               "points": [dict(asdict(r), point={k: _cell(v) for k, v in r.point.items()})
+                          for r in results]}
+    (out_dir / "sweep.json").write_text(json.dumps(summary, indent=2, default=str))
@@ -0,0 +1,56 @@
+# ====================================
+# File: triggers.py
+# Author: jaimebw
+# Created: 2026-10-18 10:13:17
+# ====================================
+"""Event-driven waits with simulated-time timeouts.
+
+Every wait is built on an edge trigger of the watched signal itself, so the
+Python scheduler only wakes up when that signal changes instead of on every
+clock edge. A timeout raises SimTimeoutError with the signal name, which fails
+the test immediately instead of hanging the run.
+"""
+
+from cocotb.result import SimTimeoutError
+from cocotb.triggers import Edge, RisingEdge, with_timeout
+
+
+async def _until_value(signal, value):
+    edge = Edge(signal)
+    while signal.value != value:
+        await edge
+
+
+async def _count_pulses(signal, count):
+    rising = RisingEdge(signal)
+    for _ in range(count):
+        await rising
+
+
+async def _timed(coro, timeout_ns, what):
+    if timeout_ns is None:
+        return await coro
+    try:
+        return await with_timeout(coro, timeout_ns, "ns", round_mode="round")
+    except SimTimeoutError:
+        raise SimTimeoutError(f"{what} within {timeout_ns} ns") from None
+
+
+async def wait_for_value(signal, value, timeout_ns=None):
+    """Return once *signal* equals *value* (immediately if it already does)"""
+    if signal.value == value:
+        return
+    await _timed(_until_value(signal, value), timeout_ns,
+                 f"{signal._name} never reached {value}")
+
+
+async def wait_for_pulse(signal, timeout_ns=None):
+    """Wait for the next rising edge of a 1-bit *signal*"""
+    await _timed(_count_pulses(signal, 1), timeout_ns,
+                 f"no pulse on {signal._name}")
+
+
+async def wait_for_pulses(signal, count, timeout_ns=None):
+    """Wait for *count* rising edges of a 1-bit *signal*, *timeout_ns* for all of them"""
+    await _timed(_count_pulses(signal, count), timeout_ns,
+                 f"fewer than {count} pulses on {signal._name}")
@@ -0,0 +1,191 @@
+# ====================================
+# File: uart.py
+# Author: jaimebw
+# Created: 2026-10-18 10:12:26
+# ====================================
+"""UART line drivers: UartSource bit-bangs a payload into an rx line and
+UartSink decodes a tx line into a byte queue. UartByteSource is the
+transaction-level stand-in for UartSource: it drives the rx_data/rx_done
+boundary UartRx would, one byte per two clocks.
+
+The bit patterns are precomputed once per driver. Runs of equal bits are
+merged into a single Timer, so sending a byte costs at most one await per
+level change and no Python objects are created per bit.
+"""
+
+import cocotb
+from cocotb.triggers import ClockCycles, Event, FallingEdge, RisingEdge, Timer
+
+from .config import bit_time_ns, rx_level
+
+START_BIT = 0
+STOP_BIT = 1
+
+
+def uart_frame(data_byte, data_bits=8):
+    """Pack start + data + stop bits into the word UartTx shifts out LSB first"""
+    return (STOP_BIT << (data_bits + 1)) | (data_byte << 1) | START_BIT
+
+
+class UartSource:
+    """Drive a UART line with bytes, bytearray, memoryview or int payloads"""
+
+    def __init__(self, signal, bit_time_ns, data_bits=8, stop_bits=1):
+        self._signal = signal
+        self.bit_time_ns = bit_time_ns
+        self.data_bits = data_bits
+        self.bytes_sent = 0
+
+        frame_len = 1 + data_bits + stop_bits
+        # _timers[k] waits k bit times, shared by every byte pattern
+        self._timers = [None] + [
+            Timer(k * bit_time_ns, units="ns", round_mode="round")
+            for k in range(1, frame_len + 1)
+        ]
+        self._runs = tuple(
+            self._level_runs(value, stop_bits) for value in range(1 << data_bits)
+        )
+        signal.value = STOP_BIT  # line idle
+
+    def _timer(self, bits):
+        """Timer of *bits* bit times; gaps longer than a frame are added on first use"""
+        while len(self._timers) <= bits:
+            self._timers.append(Timer(len(self._timers) * self.bit_time_ns, units="ns", round_mode="round"))
+        return self._timers[bits]
+
+    def _level_runs(self, value, stop_bits):
+        bits = [START_BIT]
+        bits += [(value >> i) & 1 for i in range(self.data_bits)]
+        bits += [STOP_BIT] * stop_bits
+
+        runs = []
+        level, length = bits[0], 0
+        for bit in bits:
+            if bit == level:
+                length += 1
+            else:
+                runs.append((level, self._timers[length]))
+                level, length = bit, 1
+        runs.append((level, self._timers[length]))
+        return tuple(runs)
+
+    async def send(self, data, idle_bits=0):
+        """Send every byte of *data*, optionally followed by *idle_bits* of idle line"""
+        if isinstance(data, int):
+            data = (data,)
+        signal = self._signal
+        runs = self._runs
+        idle = self._timer(idle_bits) if idle_bits else None
+
+        for value in data:
+            for level, timer in runs[value]:
+                signal.value = level
+                await timer
+            if idle is not None:
+                await idle
+        self.bytes_sent += len(data)
+
+    async def idle(self, bit_times=1):
+        """Hold the line idle for *bit_times* bit periods"""
+        self._signal.value = STOP_BIT
+        await Timer(bit_times * self.bit_time_ns, units="ns", round_mode="round")
+
+
+class UartByteSource:
+    """Same interface as UartSource, but pulses rx_done for each byte like UartRx"""
+
+    def __init__(self, clk, rx_data, rx_done):
+        self._clk = clk
+        self._rx_data = rx_data
+        self._rx_done = rx_done
+        self._edge = RisingEdge(clk)
+        self.bytes_sent = 0
+        rx_done.value = 0
+
+    async def send(self, data, idle_bits=0):
+        """Present every byte of *data* for one clock; *idle_bits* only add clocks"""
+        if isinstance(data, int):
+            data = (data,)
+        edge = self._edge
+        rx_data, rx_done = self._rx_data, self._rx_done
+
+        for value in data:
+            rx_data.value = value
+            rx_done.value = 1
+            await edge
+            rx_done.value = 0
+            await edge  # UartRx never raises rx_done two clocks in a row
+            if idle_bits:
+                await ClockCycles(self._clk, idle_bits)
+        self.bytes_sent += len(data)
+
+    async def idle(self, bit_times=1):
+        """Idle time carries no information here: one clock per bit time"""
+        await ClockCycles(self._clk, bit_times)
+
+
+def rx_source(dut):
+    """Byte source for a toplevel built by runner.rx_and_buffer_job (SIM_RX_LEVEL)"""
+    if rx_level() == "tlm":
+        return UartByteSource(dut.clk, dut.rx_data, dut.rx_done)
+    return UartSource(dut.rx, bit_time_ns(dut))
+
+
+class UartSink:
+    """Decode a UART line into ``queue``; call start() before traffic begins"""
+
+    def __init__(self, signal, bit_time_ns, data_bits=8):
+        self._signal = signal
+        self.bit_time_ns = bit_time_ns
+        self.data_bits = data_bits
+        self.queue = bytearray()
+        self.framing_errors = 0
+
+        self._weights = tuple(1 << i for i in range(data_bits))
+        self._half_bit = Timer(bit_time_ns / 2, units="ns", round_mode="round")
+        self._bit = Timer(bit_time_ns, units="ns", round_mode="round")
+        self._received = Event()
+        self._task = None
+
+    def start(self):
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    async def _run(self):
+        signal = self._signal
+        falling = FallingEdge(signal)
+        half_bit, bit = self._half_bit, self._bit
+        weights = self._weights
+
+        while True:
+            await falling
+            await half_bit
+            if int(signal.value) != START_BIT:
+                continue  # glitch, not a start bit
+
+            value = 0
+            for weight in weights:
+                await bit
+                if int(signal.value):
+                    value |= weight
+
+            await bit
+            if int(signal.value) != STOP_BIT:
+                self.framing_errors += 1
+
+            self.queue.append(value)
+            self._received.set()
+
+    async def read(self, count=1):
+        """Wait for *count* bytes and pop them from the queue"""
+        while len(self.queue) < count:
+            self._received.clear()
+            await self._received.wait()
+        data = bytes(self.queue[:count])
+        del self.queue[:count]
+        return data
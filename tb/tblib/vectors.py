@@ -0,0 +1,67 @@
+# ====================================
+# File: vectors.py
+# Author: jaimebw
+# Created: 2026-10-18 10:19:22
+# ====================================
+"""Stream input vectors through a combinational DUT and check them in batches.
+
+Results land in a preallocated array and are compared against the model with
+NumPy once per batch, instead of one Python assert per vector.
+"""
+
+import numpy as np
+from cocotb.triggers import Timer
+
+
+async def drive_vectors(dut, inputs, output, settle_ns=1):
+    """Apply the equal-length arrays in *inputs* (signal name -> values) one
+    vector every *settle_ns* and sample *output* after each.
+
+    Returns (values, xmask): the raw unsigned output bits as int64 and a bool
+    array marking samples that were X/Z.
+    """
+    handles = [getattr(dut, name) for name in inputs]
+    # Python ints, masked to the port width, are by far the cheapest to assign
+    columns = [(np.asarray(col, dtype=np.int64) & ((1 << len(h)) - 1)).tolist()
+               for h, col in zip(handles, inputs.values())]
+    out = getattr(dut, output)
+    n = len(columns[0])
+    values = np.zeros(n, dtype=np.int64)
+    xmask = np.zeros(n, dtype=bool)
+    settle = Timer(settle_ns, units="ns")
+
+    for i, row in enumerate(zip(*columns)):
+        for handle, value in zip(handles, row):
+            handle.value = value
+        await settle
+        try:
+            values[i] = int(out.value)
+        except ValueError:
+            xmask[i] = True
+    return values, xmask
+
+
+class BatchChecker:
+    """Accumulates mismatches between model and DUT over many batches"""
+
+    def __init__(self, max_rows=1000):
+        self.max_rows = max_rows
+        self.checked = 0
+        self.failures = 0
+        self.rows = []  # (vector index, inputs row dict, expected, got or None)
+
+    def check(self, inputs, expected, got, xmask):
+        """Compare one batch; *got* must already have the dtype of *expected*"""
+        bad = np.flatnonzero((got != expected) | xmask)
+        for i in bad[:max(0, self.max_rows - len(self.rows))]:
+            row = {name: col[i] for name, col in inputs.items()}
+            self.rows.append((self.checked + i, row, expected[i], None if xmask[i] else got[i]))
+        self.checked += len(expected)
+        self.failures += len(bad)
+        return len(bad)
+
+    def column(self, name):
+        return [row[name] for _, row, _, _ in self.rows]
+
+    def __bool__(self):
+        return self.failures > 0
@@ -0,0 +1,370 @@
+# ====================================
+# File: wavelog.py
+# Author: jaimebw
+# Created: 2026-10-18 10:38:06
+# ====================================
+"""Streaming transaction log of a VCD/FST dump.
+
+The dump is read in chunks (FST through GTKWave's fst2vcd, as a pipe), so
+memory stays bounded whatever its size. Only the watched signals are decoded:
+
+- every 1-bit ``rx``/``tx`` line: UART bytes, then PID frames (4-byte lane
+  and 7/11-byte burst frames on rx, 7-byte word frames on tx)
+- the ``state`` register of every UartRxPidBuffer/UartTxPidBuffer instance
+  (recognised by its registers): one entry per FSM state change
+
+The bit time comes from --baud, else from the CLK_FREQ/BAUD_RATE parameters
+Icarus dumps in the line's scope. The log is JSON lines, one transaction per
+line, with the time in ns:
+
+    python -m tblib.wavelog sim_uart_replay/UartTxAndPidBufferTlm.vcd -o replay.jsonl   (from tb/)
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+from .pid_codec import END_DEL, RX_FRAME_LEN, RX_WORD_BYTES, START_DEL, TxFrameDecoder
+
+_UNITS_NS = {"s": 1e9, "ms": 1e6, "us": 1e3, "ns": 1.0, "ps": 1e-3, "fs": 1e-6}
+_SCALAR = frozenset(b"01xzXZ")
+_VECTOR = frozenset(b"bBrR")
+
+# FSM encodings of the RTL, keyed by a register only that block has
+FSM_STATES = {
+    "UartRxPidBuffer": ("pid_byte", ("IDLE", "GOT_START", "GOT_PID", "GOT_VAL", "GOT_WORD")),
+    "UartTxPidBuffer": ("pending_valid", ("S_IDLE", "S_LOAD", "S_WAITBUSY", "S_WAITFREE")),
+}
+TIMING_PARAMETERS = ("CLK_FREQ", "BAUD_RATE", "FRACTIONAL", "OVERSAMPLE")
+UART_LINES = ("rx", "tx")
+
+
+def _vcd_int(value):
+    """Integer of a VCD value (b-prefix stripped); None if it has x/z bits"""
+    try:
+        return int(value, 2)
+    except ValueError:
+        return None
+
+
+# ----------------------------------------------------------------
+# Decoders
+# ----------------------------------------------------------------
+class UartLineDecoder:
+    """Bytes from the level changes of a UART line, sampled at mid bit"""
+
+    def __init__(self, bit_ns, data_bits=8):
+        self.bit_ns = bit_ns
+        self.data_bits = data_bits
+        self.level = 1
+        self._start = None      # time of the start bit's falling edge
+        self._samples = []      # levels at the mid-bit points so far
+
+    def _sample_until(self, t, out):
+        # Sample points between the last change and t see the current level
+        while self._start is not None:
+            n = len(self._samples)
+            at = self._start + (n + 0.5) * self.bit_ns
+            if at >= t:
+                return
+            self._samples.append(self.level)
+            if n == 0 and self.level != 0:
+                self._start, self._samples = None, []  # glitch, not a start bit
+            elif n == self.data_bits + 1:
+                value = sum(bit << i for i, bit in enumerate(self._samples[1:-1]))
+                out.append((self._start, value, self._samples[-1] == 1))
+                self._start, self._samples = None, []
+
+    def change(self, t, level):
+        """Apply a level change at t; returns [(start_ns, byte, stop_bit_ok), ...] completed before t"""
+        out = []
+        self._sample_until(t, out)
+        if self._start is None and self.level == 1 and level == 0:
+            self._start, self._samples = t, []
+        self.level = level
+        return out
+
+    def finish(self, t):
+        out = []
+        self._sample_until(t, out)
+        return out
+
+
+class RxFrameDecoder:
+    """START PID VALUE END lane frames and START PID WORD(S) END burst frames,
+    framed like UartRxPidBuffer does"""
+
+    def __init__(self):
+        self._frame = []
+
+    def feed(self, t, byte):
+        """Returns (start_ns, pid, value, end_ok) once a frame's last byte arrives.
+
+        value is the VALUE byte of a lane frame, or the big-endian payload of
+        a burst frame (a1 in the high word for PID 0x32).
+        """
+        frame = self._frame
+        if not frame and byte != START_DEL:
+            return None
+        frame.append((t, byte))
+        if len(frame) < 2 or len(frame) < 3 + RX_WORD_BYTES.get(frame[1][1], RX_FRAME_LEN - 3):
+            return None
+        self._frame = []
+        value = int.from_bytes(bytes(b for _, b in frame[2:-1]), "big")
+        return frame[0][0], frame[1][1], value, frame[-1][1] == END_DEL
+
+
+# ----------------------------------------------------------------
+# VCD reader
+# ----------------------------------------------------------------
+class VcdReader:
+    """Header of a VCD stream and an iterator over the changes of chosen ids"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self.ns_per_unit = 1.0
+        self.time_ns = 0.0      # last timestamp read
+        self.vars = []          # (scope path, name, id, size, var type)
+        self._read_header()
+
+    def _tokens(self):
+        for line in self._stream:
+            yield from line.split()
+
+    def _read_header(self):
+        tokens = self._tokens()
+        scope = []
+        for token in tokens:
+            if token == b"$enddefinitions":
+                next(tokens)  # $end
+                return
+            if token == b"$scope":
+                _, name, _ = next(tokens), next(tokens), next(tokens)
+                scope.append(name.decode())
+            elif token == b"$upscope":
+                next(tokens)
+                scope.pop()
+            elif token == b"$var":
+                fields = []
+                for field in tokens:
+                    if field == b"$end":
+                        break
+                    fields.append(field)
+                var_type, size, code, name = fields[:4]
+                self.vars.append((".".join(scope), name.decode(), code, int(size), var_type.decode()))
+            elif token == b"$timescale":
+                spec = b""
+                for field in tokens:
+                    if field == b"$end":
+                        break
+                    spec += field
+                digits = spec.rstrip(b"afmnpsu")
+                self.ns_per_unit = int(digits) * _UNITS_NS[spec[len(digits):].decode()]
+            elif token.startswith(b"$"):
+                for field in tokens:   # $date, $version, $comment: skip to $end
+                    if field == b"$end":
+                        break
+
+    def changes(self, codes, chunk_size=1 << 22):
+        """Yield (time_ns, id, value bytes) for every change of an id in *codes*.
+
+        The body is read in chunks and searched for "<id>\\n" with bytes.find,
+        one pass per watched id; the time of a change is the last "#" line
+        before it. The lines of other signals are never split or decoded.
+        """
+        needles = [(code, code + b"\n") for code in codes]
+        scale = self.ns_per_unit
+        tail = b"\n"
+        while True:
+            chunk = self._stream.read(chunk_size)
+            buf = (tail + chunk if chunk else tail + b"\n").replace(b"\r", b"")
+            # Only complete lines; the rest waits for the next chunk
+            cut = buf.rfind(b"\n") + 1
+            hits = []
+            for code, needle in needles:
+                pos = buf.find(needle, 1, cut)
+                while pos >= 0:
+                    line = buf.rfind(b"\n", 0, pos) + 1
+                    if pos - line == 1 and buf[line] in _SCALAR:
+                        hits.append((pos, code, buf[line:pos]))
+                    elif buf[line] in _VECTOR and buf[pos - 1] == 0x20:
+                        hits.append((pos, code, buf[line + 1:pos - 1]))
+                    pos = buf.find(needle, pos + len(needle), cut)
+            hits.sort()
+            searched = 0
+            for pos, code, value in hits:
+                stamp = buf.rfind(b"\n#", searched, pos)
+                if stamp >= 0:
+                    self.time_ns = int(buf[stamp + 2:buf.index(b"\n", stamp + 1)]) * scale
+                searched = pos
+                yield self.time_ns, code, value
+            stamp = buf.rfind(b"\n#", searched, cut)
+            if stamp >= 0:
+                self.time_ns = int(buf[stamp + 2:buf.index(b"\n", stamp + 1)]) * scale
+            if not chunk:
+                return
+            tail = b"\n" + buf[cut:]
+
+
+# ----------------------------------------------------------------
+# Transaction log
+# ----------------------------------------------------------------
+class WaveLog:
+    """Decode a VCD stream into transaction records (dicts)"""
+
+    def __init__(self, reader, baud=None, data_bits=8):
+        self.reader = reader
+        self.baud = baud
+        self.data_bits = data_bits
+        self.counts = Counter()
+        self.state_time_ns = Counter()
+        self.end_ns = 0.0
+
+        by_scope = {}
+        for scope, name, code, size, var_type in reader.vars:
+            by_scope.setdefault(scope, {})[name] = (code, size, var_type)
+        self._handlers = {}   # id -> [callback(t, value)]
+        self._params = {}     # (scope, name) -> value
+        self._finish = []
+        lines = set()
+
+        for scope, names in by_scope.items():
+            for name, (code, size, var_type) in names.items():
+                if var_type == "parameter" and name in TIMING_PARAMETERS:
+                    self._watch(code, self._param_handler(scope, name))
+            for name in UART_LINES:
+                # The same net seen from an instance port shares the id: decode it once
+                code = names.get(name, (None,))[0]
+                if code is not None and code not in lines and names[name][1] == 1:
+                    lines.add(code)
+                    self._watch(code, self._line_handler(scope, name))
+            for module, (marker, states) in FSM_STATES.items():
+                if "state" in names and marker in names:
+                    self._watch(names["state"][0], self._fsm_handler(scope, module, states))
+
+    def _watch(self, code, handler):
+        self._handlers.setdefault(code, []).append(handler)
+
+    def _param_handler(self, scope, name):
+        def handle(t, value):
+            self._params[(scope, name)] = _vcd_int(value)
+            return ()
+        return handle
+
+    def _bit_ns(self, scope):
+        if self.baud:
+            return 1e9 / self.baud
+        clk = self._params.get((scope, "CLK_FREQ"))
+        baud = self._params.get((scope, "BAUD_RATE"))
+        if not clk or not baud:
+            raise ValueError(f"No CLK_FREQ/BAUD_RATE parameters dumped in {scope}, pass --baud")
+        if self._params.get((scope, "FRACTIONAL")) or self._params.get((scope, "OVERSAMPLE")):
+            return 1e9 / baud                  # phase-accumulator timing
+        return 1e9 * (clk // baud) / clk   # UartRx/UartTx count whole clocks per bit
+
+    def _line_handler(self, scope, name):
+        signal = f"{scope}.{name}"
+        frames = RxFrameDecoder() if name == "rx" else TxFrameDecoder()
+        decoder = None
+
+        def records(decoded):
+            for start, byte, stop_ok in decoded:
+                self.counts[f"{name}_bytes"] += 1
+                yield {"t_ns": start, "kind": "uart", "signal": signal, "byte": byte,
+                       **({} if stop_ok else {"framing_error": True})}
+                if name == "rx":
+                    frame = frames.feed(start, byte)
+                    if frame is not None:
+                        t0, pid, value, end_ok = frame
+                        self.counts["rx_frames"] += 1
+                        yield {"t_ns": t0, "kind": "rx_frame", "signal": signal, "pid": pid,
+                               "value": value, **({} if end_ok else {"bad_end": True})}
+                else:
+                    for pid, word in frames.feed(bytes([byte])):
+                        self.counts["tx_frames"] += 1
+                        yield {"t_ns": start, "kind": "tx_frame", "signal": signal,
+                               "pid": pid, "word": word}
+
+        def handle(t, value):
+            nonlocal decoder
+            level = _vcd_int(value)
+            if level is None:
+                return ()
+            if decoder is None:
+                decoder = UartLineDecoder(self._bit_ns(scope), self.data_bits)
+            return records(decoder.change(t, level))
+
+        self._finish.append(lambda t: records(decoder.finish(t)) if decoder else ())
+        return handle
+
+    def _fsm_handler(self, scope, module, states):
+        current = [None, 0.0]
+
+        def handle(t, value):
+            state = _vcd_int(value)
+            name = states[state] if state is not None and state < len(states) else "X"
+            if name == current[0]:
+                return ()
+            if current[0] is not None:
+                self.state_time_ns[(scope, current[0])] += t - current[1]
+            current[:] = [name, t]
+            self.counts["fsm_changes"] += 1
+            return ({"t_ns": t, "kind": "fsm", "scope": scope, "module": module, "state": name},)
+
+        def finish(t):
+            if current[0] is not None:
+                self.state_time_ns[(scope, current[0])] += t - current[1]
+            return ()
+
+        self._finish.append(finish)
+        return handle
+
+    def records(self):
+        """Yield every transaction as soon as it is complete"""
+        handlers = self._handlers
+        for t, code, value in self.reader.changes(handlers):
+            for handler in handlers[code]:
+                yield from handler(t, value)
+        self.end_ns = self.reader.time_ns
+        for finish in self._finish:
+            yield from finish(self.end_ns)
+
+
+def open_dump(path):
+    """Binary stream of a VCD, or of an FST converted on the fly by fst2vcd"""
+    path = Path(path)
+    if path.suffix == ".fst":
+        try:
+            proc = subprocess.Popen(["fst2vcd", "-f", str(path)], stdout=subprocess.PIPE)
+        except FileNotFoundError:
+            sys.exit("FST dumps need fst2vcd (GTKWave) on PATH, or dump VCD: WAVES_FORMAT=vcd")
+        return proc.stdout
+    return open(path, "rb", buffering=1 << 20)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dump", type=Path, help=".vcd or .fst file")
+    parser.add_argument("-o", "--out", type=Path, help="JSON lines log (default: <dump>.jsonl)")
+    parser.add_argument("--baud", type=int, help="UART baud rate (default: dumped BAUD_RATE parameter)")
+    parser.add_argument("--data-bits", type=int, default=8)
+    args = parser.parse_args()
+
+    out_path = args.out or args.dump.with_suffix(".jsonl")
+    with open_dump(args.dump) as stream, open(out_path, "w") as out:
+        log = WaveLog(VcdReader(stream), baud=args.baud, data_bits=args.data_bits)
+        for record in log.records():
+            out.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    print(f"{args.dump} -> {out_path} ({log.end_ns / 1e6:.3f} ms simulated)")
+    for kind, count in sorted(log.counts.items()):
+        print(f"  {kind:14} {count}")
+    for (scope, state), ns in sorted(log.state_time_ns.items()):
+        print(f"  {scope}.state {state:11} {100 * ns / (log.end_ns or 1):6.2f}%")
+
+
+if __name__ == "__main__":
+    main()
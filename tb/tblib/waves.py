@@ -0,0 +1,98 @@
+# ====================================
+# File: waves.py
+# Author: jaimebw
+# Created: 2026-10-18 10:17:15
+# ====================================
+"""On-demand waveform capture for the Icarus runs.
+
+Waves are off unless WAVES=1 (or SimJob.waves=True). When a job fails
+without them, run_job re-runs each failing test on its own with waves on.
+Instead of cocotb-test's full-hierarchy iverilog_dump, a small sim_dump
+module is compiled in:
+
+    WAVES_FORMAT=fst|vcd          dump format (default fst)
+    WAVES_SCOPE=rx_pid_buffer     only dump this instance (relative to the toplevel)
+    WAVES_WINDOW_NS=200000        on a failure re-run, only dump the last N ns before the failure
+
+The window is applied at run time through +dump_start/+dump_stop plusargs,
+so moving it never forces a recompile.
+"""
+
+import os
+from pathlib import Path
+
+WAVE_FORMATS = ("fst", "vcd")
+DUMP_MODULE = "sim_dump"
+
+DUMP_TEMPLATE = """\
+`timescale 1ns/1ps
+module {module}();
+    reg [63:0] dump_start;
+    reg [63:0] dump_stop;
+
+    initial begin
+        if (!$value$plusargs("dump_start=%d", dump_start)) dump_start = 0;
+        if (!$value$plusargs("dump_stop=%d", dump_stop)) dump_stop = 0;
+
+        $dumpfile("{dump_file}");
+        $dumpvars(0, {scope});
+
+        if (dump_start > 0) begin
+            $dumpoff;
+            #(dump_start) $dumpon;
+        end
+        if (dump_stop > dump_start) begin
+            #(dump_stop - dump_start) $dumpoff;
+        end
+    end
+endmodule
+"""
+
+
+def waves_requested(waves=None):
+    """Explicit *waves* wins, otherwise the WAVES environment variable"""
+    if waves is not None:
+        return bool(waves)
+    return os.getenv("WAVES", "0") not in ("", "0")
+
+
+def wave_format(fmt=None):
+    fmt = (fmt or os.getenv("WAVES_FORMAT") or "fst").lower()
+    if fmt not in WAVE_FORMATS:
+        raise ValueError(f"WAVES_FORMAT must be one of {WAVE_FORMATS}, got {fmt!r}")
+    return fmt
+
+
+def wave_scope(scope=None):
+    return scope or os.getenv("WAVES_SCOPE") or None
+
+
+def wave_window_ns():
+    window = os.getenv("WAVES_WINDOW_NS")
+    return int(window) if window else None
+
+
+def dump_file_name(toplevel, fmt):
+    return f"{toplevel}.{fmt}"
+
+
+def write_dump_module(sim_build, toplevel, scope=None, fmt="fst"):
+    """Write the sim_dump module for *toplevel* into *sim_build* and return its path"""
+    hierarchy = toplevel if not scope else f"{toplevel}.{scope}"
+    source = DUMP_TEMPLATE.format(module=DUMP_MODULE, scope=hierarchy,
+                                  dump_file=dump_file_name(toplevel, fmt))
+    path = Path(sim_build) / f"{DUMP_MODULE}.v"
+    # Only rewrite on change, the mtime feeds cocotb-test's rebuild check
+    if not path.exists() or path.read_text() != source:
+        path.write_text(source)
+    return path
+
+
+def dump_plusargs(fmt="fst", start_ns=None, stop_ns=None):
+    """vvp arguments selecting the dump format and the time window"""
+    args = ["-fst"] if fmt == "fst" else []
+    if start_ns:
+        args.append(f"+dump_start={int(start_ns)}")
+    if stop_ns:
+        args.append(f"+dump_stop={int(stop_ns)}")
+    return args
@@ -0,0 +1,75 @@
+# ====================================
+# File: test_build_cache.py
+# Author: jaimebw
+# Created: 2026-10-18 10:14:45
+# ====================================
+
+import os
+import time
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.build_cache import BuildCache, build_key
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def test_build_key_tracks_compile_inputs(tmp_path):
+    rtl = [SRC_DIR / "uart_rx.v"]
+    key = build_key(rtl, "UartRx", parameters={"BAUD_RATE": 9600})
+
+    assert key == build_key(rtl, "UartRx", parameters={"BAUD_RATE": 9600})
+    assert key != build_key(rtl, "UartRx", parameters={"BAUD_RATE": 115200})
+    assert key != build_key(rtl, "UartRx", parameters={"BAUD_RATE": 9600}, timescale="1ns/1ps")
+    assert key != build_key(rtl, "UartRx", parameters={"BAUD_RATE": 9600}, defines=["SIM_MODE"])
+
+    # Same name, different contents
+    edited = tmp_path / "uart_rx.v"
+    edited.write_text(rtl[0].read_text() + "\n// edited\n")
+    assert key != build_key([edited], "UartRx", parameters={"BAUD_RATE": 9600})
+
+
+def test_build_key_tracks_every_compile_kwarg(tmp_path):
+    rtl = [SRC_DIR / "uart_rx.v"]
+    key = build_key(rtl, "UartRx")
+
+    assert key != build_key(rtl, "UartRx", extra_args=["-Wall"])
+    assert key != build_key(rtl, "UartRx", verilog_compile_args=["-Wall"])
+
+    # An include directory counts with the headers in it
+    header = tmp_path / "defs.vh"
+    header.write_text("`define WIDTH 8\n")
+    with_include = build_key(rtl, "UartRx", includes=[tmp_path])
+    assert with_include not in (key, build_key(rtl, "UartRx", includes=[tmp_path / "other"]))
+    header.write_text("`define WIDTH 16\n")
+    assert with_include != build_key(rtl, "UartRx", includes=[tmp_path])
+
+
+def test_fetch_store_roundtrip(tmp_path):
+    cache = BuildCache(root=tmp_path / "cache")
+    image = tmp_path / "build" / "UartRx.vvp"
+    image.parent.mkdir()
+
+    assert not cache.fetch("k1", image)
+    image.write_bytes(b"compiled")
+    cache.store("k1", image, meta={"toplevel": "UartRx"})
+    image.unlink()
+
+    assert cache.fetch("k1", image)
+    assert image.read_bytes() == b"compiled"
+
+
+def test_prune_by_age_then_size(tmp_path):
+    cache = BuildCache(root=tmp_path / "cache", max_mb=3 / 1024, max_age_days=1)
+    image = tmp_path / "img.vvp"
+    image.write_bytes(b"x" * 1024)
+
+    now = time.time()
+    for n, age_s in enumerate([3 * 86400, 300, 200, 100]):
+        key = f"k{n}"
+        cache.store(key, image)
+        os.utime(cache.root / key, (now - age_s, now - age_s))
+
+    cache.prune()
+    # k0 is expired; of the rest only the two most recently used fit in 3 KiB
+    assert sorted(key for key, _, _ in cache.entries()) == ["k2", "k3"]
@@ -0,0 +1,45 @@
+# ====================================
+# File: test_capture.py
+# Author: jaimebw
+# Created: 2026-10-18 10:28:25
+# ====================================
+
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.capture import Capture, write_capture
+
+
+def test_raw_capture_chunks(tmp_path):
+    path = tmp_path / "raw.bin"
+    payload = bytes(range(256)) * 10
+    write_capture(path, payload)
+
+    with Capture(path) as capture:
+        assert not capture.timed and capture.n_bytes == len(payload)
+        chunks = [(bytes(data), gaps) for data, gaps in capture.chunks(1000)]
+    assert [len(data) for data, _ in chunks] == [1000, 1000, 560]
+    assert b"".join(data for data, _ in chunks) == payload
+    assert all(gaps is None for _, gaps in chunks)
+
+
+def test_timed_capture_chunks(tmp_path):
+    path = tmp_path / "timed.cap"
+    payload = b"\xaa\x10\x01\x55" * 3
+    gaps = list(range(len(payload)))
+    write_capture(path, payload, gaps, baud_rate=115200)
+
+    with Capture(path) as capture:
+        assert capture.timed and capture.baud_rate == 115200
+        assert capture.n_bytes == len(payload)
+        chunks = list(capture.chunks(5))
+    assert b"".join(data for data, _ in chunks) == payload
+    assert [g for _, chunk_gaps in chunks for g in chunk_gaps] == gaps
+
+
+def test_empty_capture(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    with Capture(path) as capture:
+        assert capture.n_bytes == 0
+        assert list(capture.chunks()) == []
@@ -5,11 +5,15 @@
 # ====================================
 
 import cocotb
+import pytest
 from cocotb.triggers import ReadOnly
-from cocotb_test.simulator import run
 from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.runner import SRC_DIR, SimJob, run_job
+from tblib.profiling import install_from_env
+
+install_from_env()  # TB_PROFILE=1: profile this run, see tblib/profiling.py
 
 
 TEST_VAL = 1 <<16
@@ -41,24 +45,21 @@ async def control_law_test(dut):
 
 
 
-def test_control_law():
-    """Run simulation for UartRx"""
-    this_dir = Path(__file__).resolve().parent
-    rtl_file = this_dir.parent / "src" / "control_law.v"
-    mod_name = Path(__file__).stem
-
-    assert rtl_file.exists(), f"Missing Verilog source: {rtl_file}"
-
-    run(
-        verilog_sources=[rtl_file],
+JOBS = [
+    SimJob(
+        name="control_law",
         toplevel="LandauControlLaw",
-        module= mod_name,
+        module=Path(__file__).stem,
+        verilog_sources=[SRC_DIR / "control_law.v"],
         parameters={
-               "K1": "32'sd65536", # 1.0
-                "K2": "32'sd65536" # 1.0
+            "K1": "32'sd65536", # 1.0
+            "K2": "32'sd65536", # 1.0
         },
-        waves=True,
-        sim_build=this_dir / f"sim_{mod_name}",
-        timescale="1ns/1ps"
-    )
+    ),
+]
+
 
+@pytest.mark.parametrize("job", JOBS, ids=lambda job: job.name)
+def test_control_law(job):
+    """Run simulation for LandauControlLaw"""
+    run_job(job)
@@ -0,0 +1,127 @@
+# ====================================
+# File: test_control_law_vectors.py
+# Author: jaimebw
+# Created: 2026-10-18 10:19:48
+# ====================================
+# Bulk check of LandauControlLaw against the NumPy golden model:
+# corner cases plus CONTROL_LAW_VECTORS random vectors per K1/K2 pair.
+
+import os
+import cocotb
+import numpy as np
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.config import dut_parameter
+from tblib.control_law_model import (INT32_MAX, INT32_MIN, Q16_ONE, control_law,
+                                     mismatch_table, to_int32, to_q16, vector_batches,
+                                     verilog_q16)
+from tblib.runner import SRC_DIR, SimJob, run_job
+from tblib.sweep import Sweep
+from tblib.vectors import BatchChecker, drive_vectors
+from tblib.profiling import install_from_env
+
+install_from_env()  # TB_PROFILE=1: profile this run, see tblib/profiling.py
+
+N_VECTORS = int(os.getenv("CONTROL_LAW_VECTORS", "200000"))
+BATCH_SIZE = 8192
+SETTLE_NS = 1
+
+
+@cocotb.test(timeout_time=2 * (N_VECTORS + 1000) * SETTLE_NS, timeout_unit="ns")
+async def control_law_vectors(dut):
+    k1 = to_int32(dut_parameter(dut, "K1"))
+    k2 = to_int32(dut_parameter(dut, "K2"))
+    rng = np.random.default_rng(cocotb.RANDOM_SEED)
+    checker = BatchChecker()
+
+    for batch in vector_batches(rng, N_VECTORS, BATCH_SIZE):
+        raw, xmask = await drive_vectors(dut, batch, "b", settle_ns=SETTLE_NS)
+        got = raw.astype(np.uint32).view(np.int32)
+        expected = control_law(batch["a1"], batch["a2"], batch["test"], k1, k2)
+        checker.check(batch, expected, got, xmask)
+
+    dut._log.info(f"K1={k1 / Q16_ONE:+.5f} K2={k2 / Q16_ONE:+.5f}: "
+                  f"{checker.checked} vectors, {checker.failures} mismatches")
+    assert not checker, (
+        f"{checker.failures}/{checker.checked} vectors mismatch (K1={k1:#x}, K2={k2:#x})\n"
+        + mismatch_table([r[0] for r in checker.rows], checker.column("a1"),
+                         checker.column("a2"), checker.column("test"),
+                         [r[2] for r in checker.rows], [r[3] for r in checker.rows]))
+
+
+# ----------------------------------------------------------------
+# Model sanity checks (plain pytest, no simulator)
+# ----------------------------------------------------------------
+def test_model_matches_directed_vectors():
+    one = Q16_ONE
+    # The directed cases in test_control_law.py
+    assert control_law([one], [one], [0], one, one)[0] == 2 * one
+    assert control_law([one], [one], [1], one, one)[0] == 2 * one
+    # Truncation, not rounding: -0.2 * 1.0 keeps the low bits of the product
+    k1 = int(to_q16(-0.2))
+    assert control_law([one], [0], [0], k1, 0)[0] == k1
+    assert control_law([1], [0], [0], k1, 0)[0] == -1  # -13107 >> 16 floors
+
+
+def test_model_wraps_like_the_rtl():
+    # a1 + 1.0 wraps at 32 bits in test mode
+    assert control_law([INT32_MAX], [0], [1], 0, 0)[0] == INT32_MIN + Q16_ONE - 1
+    # 2 * (-2**31)**2 = 2**63 wraps sum_wide to -2**63; bits [47:16] are zero
+    assert control_law([INT32_MIN], [INT32_MIN], [0], INT32_MIN, INT32_MIN)[0] == 0
+    # Plain Python reference for a few random vectors
+    rng = np.random.default_rng(1)
+    batch = next(vector_batches(rng, 10_000, 10_000))
+    k1, k2 = INT32_MAX, INT32_MIN
+    expected = [to_int32((int(a) * k1 + int(b) * k2) >> 16) if not t else to_int32(int(a) + Q16_ONE)
+                for a, b, t in zip(batch["a1"], batch["a2"], batch["test"])]
+    assert control_law(batch["a1"], batch["a2"], batch["test"], k1, k2).tolist() == expected
+
+
+# K1/K2 pairs: unity (sim), the real gains, a mixed sign pair and the
+# extremes that overflow sum_wide
+K_SWEEP = [
+    ("unity", Q16_ONE, Q16_ONE),
+    ("landau", int(to_q16(-0.2)), int(to_q16(-0.4))),
+    ("mixed", int(to_q16(0.5)), int(to_q16(-1.5))),
+    ("extreme", INT32_MIN, INT32_MIN),
+    ("extreme_mixed", INT32_MAX, INT32_MIN),
+]
+
+JOBS = [
+    SimJob(
+        name=f"control_law_vectors_{label}",
+        toplevel="LandauControlLaw",
+        module=Path(__file__).stem,
+        verilog_sources=[SRC_DIR / "control_law.v"],
+        parameters={"K1": verilog_q16(k1), "K2": verilog_q16(k2)},
+        extra_env={"CONTROL_LAW_VECTORS": str(N_VECTORS)},
+    )
+    for label, k1, k2 in K_SWEEP
+]
+
+
+# python tb/sweep.py -k control_law: a K1 x K2 gain grid (None keeps the RTL
+# default, which SIM_MODE selects) at two seeds; both seeds share one build
+K_GRID = [None] + [verilog_q16(int(to_q16(k))) for k in (-1.5, -0.4, -0.2, 0.0, 0.5, 1.0)]
+
+SWEEPS = [
+    Sweep(
+        name="control_law_gains",
+        toplevel="LandauControlLaw",
+        module=Path(__file__).stem,
+        verilog_sources=[SRC_DIR / "control_law.v"],
+        parameters={"K1": K_GRID, "K2": K_GRID},
+        defines=[[], ["SIM_MODE"]],
+        env={"CONTROL_LAW_VECTORS": [20000], "RANDOM_SEED": [1, 2]},
+        # SIM_MODE only changes the defaults, skip it when both gains are set
+        where=lambda p: not p["defines"] or p["K1"] is None or p["K2"] is None,
+    ),
+]
+
+
+@pytest.mark.parametrize("job", JOBS, ids=lambda job: job.name)
+def test_control_law_vectors(job):
+    """Run the bulk vector check for LandauControlLaw"""
+    run_job(job)
@@ -0,0 +1,279 @@
+# ====================================
+# File: test_cycle_models.py
+# Author: jaimebw
+# Created: 2026-10-18 10:32:03
+# ====================================
+
+import random
+import numpy as np
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.control_law_model import control_law, random_vectors
+from tblib.coverage import lane_frame, uniform_frames
+from tblib.cycle_models import (ControlLawModel, FracUartRxModel, PidBufferModel, RxFifoModel,
+                                TxPidBufferModel, TxPidFifoModel, UartRxModel, simulate, uart_levels)
+from tblib.pid_codec import (A1_PIDS, A2_PIDS, RxPidBufferModel, encode_rx_burst, encode_rx_test, encode_rx_words,
+                             encode_tx_words)
+
+CLKS_PER_BIT = 16
+
+
+def byte_strobes(data, gap_cycles=1):
+    """rx_done/rx_byte streams that present each byte for one clock, like UartRx"""
+    cycles = len(data) * (1 + gap_cycles)
+    done = np.zeros(cycles, np.uint8)
+    byte = np.zeros(cycles, np.uint8)
+    done[::1 + gap_cycles] = 1
+    byte[::1 + gap_cycles] = np.frombuffer(bytes(data), np.uint8)
+    return done, byte
+
+
+def test_uart_rx_batch_decodes_every_instance():
+    rng = np.random.default_rng(3)
+    n, n_bytes = 16, 12
+    payloads = rng.integers(0, 256, (n, n_bytes), dtype=np.uint8)
+    # Every instance starts its stream at a different cycle
+    lines = [uart_levels(p.tolist(), CLKS_PER_BIT, lead_cycles=lead)
+             for p, lead in zip(payloads, range(n))]
+    cycles = max(map(len, lines)) + 2
+    rx = np.ones((cycles, n), np.uint8)
+    for i, line in enumerate(lines):
+        rx[:len(line), i] = line
+
+    model = UartRxModel(n, clks_per_bit=CLKS_PER_BIT)
+    trace = simulate(model, cycles, rx=rx)
+    for i in range(n):
+        got = trace["rx_data"][trace["rx_done"][:, i] == 1, i]
+        assert got.tolist() == payloads[i].tolist()
+
+
+def test_uart_rx_ignores_glitches():
+    # A start bit shorter than half a bit is dropped at the mid-bit check
+    line = np.concatenate([np.ones(4, np.uint8), np.zeros(3, np.uint8),
+                           uart_levels([0x5A], CLKS_PER_BIT, lead_cycles=20)])
+    trace = simulate(UartRxModel(clks_per_bit=CLKS_PER_BIT), len(line), rx=line)
+    assert trace["rx_data"][trace["rx_done"][:, 0] == 1, 0].tolist() == [0x5A]
+
+
+def received_bytes(trace):
+    """Bytes every instance reported with rx_done"""
+    done = trace["rx_done"] == 1
+    return [trace["rx_data"][done[:, i], i].tolist() for i in range(done.shape[1])]
+
+
+def test_fractional_uart_rx_keeps_up_at_3_mbaud():
+    # 50 MHz / 3 Mbaud = 16.67 clocks per bit: the integer divider drifts a
+    # third of a clock per bit and loses back-to-back bytes; the phase
+    # accumulator decodes them, even from a transmitter 3% fast or slow
+    clk_freq, baud_rate = 50_000_000, 3_000_000
+    skews = (-0.03, 0.0, 0.03)
+    rng = np.random.default_rng(21)
+    payloads = rng.integers(0, 256, (len(skews), 24), dtype=np.uint8)
+    lines = [uart_levels(p.tolist(), clk_freq * (1 + skew) / baud_rate, idle_bits=0, lead_cycles=5)
+             for p, skew in zip(payloads, skews)]
+    cycles = max(map(len, lines)) + 40
+    rx = np.ones((cycles, len(skews)), np.uint8)
+    for i, line in enumerate(lines):
+        rx[:len(line), i] = line
+
+    for oversample in (False, True):
+        model = FracUartRxModel(len(skews), clk_freq, baud_rate, oversample=oversample)
+        assert received_bytes(simulate(model, cycles, rx=rx)) == payloads.tolist()
+    integer = UartRxModel(len(skews), clks_per_bit=clk_freq // baud_rate)
+    assert received_bytes(simulate(integer, cycles, rx=rx))[1] != payloads[1].tolist()
+
+
+def test_rx_fifo_absorbs_back_to_back_bytes():
+    # Stop bit straight into the next start bit, into a consumer that takes
+    # one byte every 1.5 byte times, then stalls, then drains every clock
+    rng = np.random.default_rng(11)
+    clks_per_bit = 8
+    data = rng.integers(0, 256, 64, dtype=np.uint8)
+    byte_cycles = 10 * clks_per_bit
+    line = uart_levels(data.tolist(), clks_per_bit, idle_bits=0, lead_cycles=3)
+    cycles = len(line) + 30 * byte_cycles
+    rx = np.ones(cycles, np.uint8)
+    rx[:len(line)] = line
+    uart = simulate(UartRxModel(clks_per_bit=clks_per_bit), cycles, rx=rx)
+
+    def consume(depth_log2, stall):
+        fifo = RxFifoModel(depth_log2=depth_log2)
+        received = []
+        for cycle in range(cycles):
+            slow = cycle < stall[0] and cycle % (3 * byte_cycles // 2) == 0
+            rd_en = cycle >= stall[1] or slow
+            if rd_en and fifo.rd_valid[0]:
+                received.append(int(fifo.rd_data[0]))
+            fifo.step(wr_data=uart["rx_data"][cycle], wr_en=uart["rx_done"][cycle], rd_en=rd_en)
+        return fifo, received
+
+    # 16 bytes absorb the ~7 bytes the slow phase falls behind plus a 6-byte stall
+    fifo, received = consume(4, stall=(20 * byte_cycles, 26 * byte_cycles))
+    assert bytes(received) == data.tobytes()
+    assert fifo.overflows[0] == 0 and fifo.max_level[0] > 8
+
+    # 4 bytes do not: every byte that found it full is counted, none reordered
+    fifo, received = consume(2, stall=(20 * byte_cycles, 26 * byte_cycles))
+    assert len(received) + fifo.overflows[0] == len(data) and fifo.overflows[0] > 0
+    it = iter(data.tolist())
+    assert all(byte in it for byte in received)  # a subsequence of what was sent
+
+
+def noisy_pid_stream(rng, n_frames):
+    """Lane, burst and test frames mixed with uniform_frames(): unknown PIDs,
+    missing END bytes and line noise
+    """
+    data = bytearray()
+    for _ in range(n_frames):
+        kind = rng.random()
+        if kind < 0.4:
+            data += lane_frame(rng.choice(A1_PIDS + A2_PIDS), rng.getrandbits(8))
+        elif kind < 0.6:
+            a1, a2 = rng.getrandbits(32), rng.getrandbits(32)
+            pick = rng.randrange(3)
+            data += encode_rx_burst(a1 if pick != 1 else None, a2 if pick != 0 else None)
+        elif kind < 0.7:
+            data += encode_rx_test(rng.getrandbits(8))
+        else:
+            data += uniform_frames(rng)
+    return data
+
+
+def test_pid_buffer_models_agree():
+    """PidBufferModel and RxPidBufferModel describe the same RTL FSM: the same
+    ready pulses and (a1, a2, test) for the same bytes, back to back or spaced
+    """
+    rng = random.Random(11)
+    for gap_cycles in (0, 1, 3):
+        n = 16
+        streams = [noisy_pid_stream(rng, 60) for _ in range(n)]
+        length = max(map(len, streams))
+        cycles = length * (1 + gap_cycles) + 4
+        done = np.zeros((cycles, n), np.uint8)
+        byte = np.zeros((cycles, n), np.uint8)
+        for i, data in enumerate(streams):
+            d, b = byte_strobes(data, gap_cycles)
+            done[:len(d), i], byte[:len(b), i] = d, b
+
+        trace = simulate(PidBufferModel(n), cycles, rx_done=done, rx_byte=byte)
+        for i, data in enumerate(streams):
+            pulses = trace["ready"][:, i] == 1
+            got = list(zip(trace["a1"][pulses, i].tolist(), trace["a2"][pulses, i].tolist(),
+                           trace["test"][pulses, i].tolist()))
+            want = RxPidBufferModel().feed(data)
+            assert want, "stream completes no update"
+            assert got == want, f"gap {gap_cycles}, stream {i}"
+
+
+def test_pid_buffer_batch_matches_byte_model():
+    rng = np.random.default_rng(5)
+    n = 32
+    streams = []
+    for _ in range(n):
+        data = bytearray()
+        for _ in range(6):
+            kind = rng.random()
+            if kind < 0.2:
+                data += encode_rx_test(int(rng.integers(256)))
+            elif kind < 0.5:
+                # Burst frame for a1 (0), a2 (1) or both (2)
+                a1, a2 = int(rng.integers(1 << 32)), int(rng.integers(1 << 32))
+                pick = int(rng.integers(3))
+                data += encode_rx_burst(a1 if pick != 1 else None, a2 if pick != 0 else None)
+            else:
+                data += encode_rx_words([int(rng.integers(1 << 32))], [int(rng.integers(1 << 32))])
+            if rng.random() < 0.3:
+                data += bytes(rng.integers(0, 256, int(rng.integers(1, 4)), dtype=np.uint8))
+        streams.append(data)
+
+    length = max(map(len, streams))
+    strobes = [byte_strobes(s.ljust(length, b"\0")) for s in streams]
+    cycles = 2 * length + 4
+    done = np.zeros((cycles, n), np.uint8)
+    byte = np.zeros((cycles, n), np.uint8)
+    for i, (d, b) in enumerate(strobes):
+        done[:len(d), i] = d
+        done[2 * len(streams[i]):, i] = 0  # padding is not received
+        byte[:len(b), i] = b
+
+    trace = simulate(PidBufferModel(n), cycles, rx_done=done, rx_byte=byte)
+    for i, data in enumerate(streams):
+        pulses = trace["ready"][:, i] == 1
+        got = list(zip(trace["a1"][pulses, i].tolist(), trace["a2"][pulses, i].tolist()))
+        want = [(a1, a2) for a1, a2, _ in RxPidBufferModel().feed(data)]
+        assert got == want
+        # test follows the last PID one edge later, so it is valid with ready
+        tests = trace["test"][pulses, i].tolist()
+        assert tests == [t for _, _, t in RxPidBufferModel().feed(data)]
+
+
+def test_tx_pid_buffer_frames_with_busy_handshake():
+    words = [0xA1BE12C1, 0, 0xFFFFFFFF]
+    busy_cycles = 3
+    model = TxPidBufferModel()
+    sent = bytearray()
+    busy_left = 0
+    for word in words:
+        valid = 1
+        for _ in range(200):
+            model.step(tx_float=word, tx_valid=valid, tx_busy=int(busy_left > 0), test=0)
+            valid = 0
+            busy_left = max(0, busy_left - 1)
+            if model.tx_start[0]:
+                sent.append(int(model.tx_data[0]))
+                busy_left = busy_cycles + 1
+            if len(sent) % 7 == 0 and len(sent) and model.state[0] == model.S_IDLE and not busy_left:
+                break
+    assert sent == encode_tx_words(words)
+
+
+def test_tx_pid_buffer_holds_valid_while_busy():
+    # tx_valid while the UART is busy is remembered and launched once it frees
+    # up; the RTL latches tx_float at launch, not when tx_valid was seen
+    model = TxPidBufferModel()
+    model.step(tx_float=0x12345678, tx_valid=1, tx_busy=1, test=1)
+    assert model.pending_valid[0] and model.state[0] == model.S_IDLE
+    model.step(tx_float=0xCAFEF00D, tx_valid=0, tx_busy=0, test=1)
+    assert model.state[0] == model.S_LOAD and model.buffer[0] == 0xCAFEF00D
+    model.step(tx_float=0, tx_valid=0, tx_busy=0, test=1)
+    assert model.tx_start[0] == 1 and model.tx_data[0] == 0xAA
+
+
+def test_tx_pid_fifo_issues_bytes_back_to_back():
+    # Busy for a whole byte from the clock after tx_start, like UartTx
+    byte_cycles = 10 * CLKS_PER_BIT
+    words = [0xA1BE12C1, 5, 0xFFFFFFFF]
+    model = TxPidFifoModel()
+    pending = list(words)
+    sent, starts = bytearray(), []
+    busy_left = 0
+    for cycle in range((7 * len(words) + 1) * (byte_cycles + 2)):
+        push = bool(pending) and model.tx_ready[0] == 1
+        model.step(tx_float=pending[0] if pending else 0, tx_valid=int(bool(pending)),
+                   tx_busy=int(busy_left > 0), test=0)
+        if push:
+            pending.pop(0)
+        busy_left = max(0, busy_left - 1)
+        if model.tx_start[0]:
+            sent.append(int(model.tx_data[0]))
+            starts.append(cycle)
+            busy_left = byte_cycles + 1
+    assert sent == encode_tx_words(words)
+    # Every byte, across frames too, goes out on the first edge the UART is free
+    assert set(np.diff(starts).tolist()) == {byte_cycles + 2}
+
+
+def test_reset_only_touches_selected_instances():
+    model = UartRxModel(2, clks_per_bit=CLKS_PER_BIT)
+    model.step(rx=0)
+    model.step(rx=0, rst=[1, 0])
+    assert model.state.tolist() == [UartRxModel.IDLE, UartRxModel.START]
+    assert model.clk_count.tolist() == [0, 1]
+
+
+def test_control_law_model():
+    batch = random_vectors(np.random.default_rng(9), 1000)
+    model = ControlLawModel(1000, k1=-13107, k2=-26214)
+    model.step(a1=batch["a1"], a2=batch["a2"], test=batch["test"])
+    assert np.array_equal(model.b, control_law(batch["a1"], batch["a2"], batch["test"], -13107, -26214))
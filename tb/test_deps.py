@@ -0,0 +1,55 @@
+# ====================================
+# File: test_deps.py
+# Author: jaimebw
+# Created: 2026-10-18 10:36:23
+# ====================================
+
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.deps import (ModuleGraph, TB_DIR, module_graph, parse_verilog, python_closure,
+                        select_jobs, verilog_sources)
+from tblib.regression import discover_jobs
+from tblib.runner import SRC_DIR
+
+
+def test_instantiations_ignore_comments_and_keywords(tmp_path):
+    (tmp_path / "leaf.v").write_text("module Leaf(input a); endmodule\n")
+    (tmp_path / "top.v").write_text(
+        "module Top(input clk);\n"
+        "  // Unused u_unused (.a(clk));\n"
+        "  /* Leaf commented (.a(clk)); */\n"
+        "  Leaf #(.W(8)) u_leaf (.a(clk));\n"
+        "  always @(posedge clk) begin end\n"
+        "endmodule\n")
+    assert "Leaf" in parse_verilog(tmp_path / "top.v")["Top"]
+    graph = ModuleGraph([tmp_path])
+    assert graph.children == {"Leaf": [], "Top": ["Leaf"]}
+    assert graph.sources("Top") == [tmp_path / "top.v", tmp_path / "leaf.v"]
+
+
+def test_tree_graph():
+    assert module_graph().children["UartTxAndPidBuffer"] == ["UartRx", "UartRxPidBuffer"]
+    assert verilog_sources("UartTxAndPidBuffer") == [
+        SRC_DIR / "uart_tx_and_buffer.v", SRC_DIR / "uart_rx.v", SRC_DIR / "uart_rx_pid_buffer.v"]
+
+
+def test_python_closure_follows_tblib_imports():
+    files = python_closure(TB_DIR / "test_uart_rx_and_buffer.py")
+    names = {path.name for path in files}
+    # runner -> deps/build_cache, uart -> config, the test module itself -> profiling
+    assert {"runner.py", "deps.py", "build_cache.py", "uart.py", "config.py", "profiling.py"} <= names
+    assert "capture.py" not in names
+
+
+def test_single_file_edit_selects_few_jobs():
+    jobs = discover_jobs()
+    selected, _ = select_jobs(jobs, [SRC_DIR / "control_law.v"])
+    # control_law.v and the loop top that instantiates it
+    assert selected and all(job.toplevel in ("LandauControlLaw", "UartControlLoop") for job in selected)
+    assert len(selected) < len(jobs) // 2
+
+    selected, _ = select_jobs(jobs, [TB_DIR / "tblib" / "capture.py"])
+    assert [job.name for job in selected] == ["uart_replay"]
+    assert select_jobs(jobs, [TB_DIR.parent / "README.md"])[0] == []
+    assert len(select_jobs(jobs, [TB_DIR.parent / "requirements.txt"])[0]) == len(jobs)
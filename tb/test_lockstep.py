@@ -0,0 +1,211 @@
+# ====================================
+# File: test_lockstep.py
+# Author: jaimebw
+# Created: 2026-10-18 10:32:55
+# ====================================
+# Cross-check the cycle models in tblib/cycle_models.py against the RTL: each
+# test drives randomized traffic and compares every output on every clock
+# edge with the model (tblib/lockstep.py).
+
+import random
+import cocotb
+import pytest
+from cocotb.triggers import ClockCycles, RisingEdge, Timer
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.config import CLK_PERIOD_NS, clks_per_bit, sim_budget_ns, uart_parameters
+from tblib.cycle_models import PidBufferModel, RxFifoModel, TxPidBufferModel, TxPidFifoModel, UartRxModel
+from tblib.harness import reset, start_clock
+from tblib.lockstep import Lockstep
+from tblib.pid_codec import encode_rx_burst, encode_rx_test, encode_rx_words
+from tblib.runner import SRC_DIR, SimJob, run_job
+from tblib.uart import UartByteSource, UartSource
+from tblib.profiling import install_from_env
+
+install_from_env()  # TB_PROFILE=1: profile this run, see tblib/profiling.py
+
+SEED = 2026
+N_BYTES = 64
+N_UPDATES = 40
+N_WORDS = 20
+
+
+@cocotb.test(timeout_time=sim_budget_ns(uart_bytes=2 * N_BYTES), timeout_unit="ns")
+async def uart_rx_lockstep(dut):
+    """UartRx against UartRxModel, with start-bit glitches between bytes"""
+    rng = random.Random(SEED)
+    start_clock(dut)
+    source = UartSource(dut.rx, clks_per_bit(dut) * CLK_PERIOD_NS)
+    lockstep = Lockstep(dut, UartRxModel(clks_per_bit=clks_per_bit(dut))).start()
+    await reset(dut)
+
+    for _ in range(N_BYTES):
+        if rng.random() < 0.2:
+            # Low for less than half a bit: rejected at the mid-bit check
+            dut.rx.value = 0
+            await Timer(rng.randint(1, clks_per_bit(dut) // 2 - 1) * CLK_PERIOD_NS, units="ns")
+            dut.rx.value = 1
+            await ClockCycles(dut.clk, clks_per_bit(dut))
+        await source.send(rng.getrandbits(8), idle_bits=rng.randint(0, 2))
+    await ClockCycles(dut.clk, 2 * clks_per_bit(dut))
+    lockstep.check()
+
+
+@cocotb.test(timeout_time=sim_budget_ns(cycles=4000), timeout_unit="ns")
+async def rx_fifo_lockstep(dut):
+    """UartRxFifo against RxFifoModel: writer and reader rates drifting past full and empty"""
+    rng = random.Random(SEED)
+    start_clock(dut)
+    dut.wr_en.value = 0
+    dut.rd_en.value = 0
+    dut.wr_data.value = 0
+    lockstep = Lockstep(dut, RxFifoModel(depth_log2=2)).start()
+    await reset(dut)
+
+    clk = RisingEdge(dut.clk)
+    for _ in range(20):
+        write_p, read_p = rng.random(), rng.random()
+        for _ in range(rng.randint(20, 150)):
+            dut.wr_data.value = rng.getrandbits(8)
+            dut.wr_en.value = rng.random() < write_p
+            dut.rd_en.value = rng.random() < read_p
+            await clk
+    lockstep.check()
+
+
+@cocotb.test(timeout_time=sim_budget_ns(cycles=4 * 40 * N_UPDATES), timeout_unit="ns")
+async def pid_buffer_lockstep(dut):
+    """UartRxPidBuffer against PidBufferModel: lane and burst updates, test frames and noise"""
+    rng = random.Random(SEED)
+    start_clock(dut)
+    source = UartByteSource(dut.clk, dut.rx_byte, dut.rx_done)
+    lockstep = Lockstep(dut, PidBufferModel()).start()
+    await reset(dut)
+
+    for _ in range(N_UPDATES):
+        kind = rng.random()
+        if kind < 0.2:
+            frame = encode_rx_test(rng.getrandbits(8))
+        elif kind < 0.5:
+            words = rng.choice(((rng.getrandbits(32), None), (None, rng.getrandbits(32)),
+                                (rng.getrandbits(32), rng.getrandbits(32))))
+            frame = bytearray(encode_rx_burst(*words))
+        else:
+            frame = bytearray(encode_rx_words([rng.getrandbits(32)], [rng.getrandbits(32)]))
+            if rng.random() < 0.2:
+                frame[rng.randrange(len(frame))] = rng.getrandbits(8)  # corrupt one byte
+        await source.send(frame, idle_bits=rng.choice((0, 0, 1, 3)))
+    await ClockCycles(dut.clk, 4)
+    lockstep.check()
+
+
+async def busy_handshake(dut, rng):
+    """UART stand-in: tx_busy rises 0-2 clocks after tx_start and stays up 1-6 clocks"""
+    tx_start = RisingEdge(dut.tx_start)
+    clk = RisingEdge(dut.clk)
+    while True:
+        await tx_start
+        await ClockCycles(dut.clk, rng.randint(0, 2))
+        dut.tx_busy.value = 1
+        await ClockCycles(dut.clk, rng.randint(1, 6))
+        dut.tx_busy.value = 0
+        await clk
+
+
+@cocotb.test(timeout_time=sim_budget_ns(cycles=40 * 7 * N_WORDS), timeout_unit="ns")
+async def tx_pid_buffer_lockstep(dut):
+    """UartTxPidBuffer against TxPidBufferModel with a random busy handshake"""
+    rng = random.Random(SEED)
+    start_clock(dut)
+    dut.tx_valid.value = 0
+    dut.tx_busy.value = 0
+    dut.tx_float.value = 0
+    dut.test.value = 0
+    lockstep = Lockstep(dut, TxPidBufferModel()).start()
+    await reset(dut)
+
+    busy = cocotb.start_soon(busy_handshake(dut, rng))
+    clk = RisingEdge(dut.clk)
+    for _ in range(N_WORDS):
+        # tx_valid lands anywhere, including while a frame is still going out
+        await ClockCycles(dut.clk, rng.randint(1, 60))
+        dut.tx_float.value = rng.getrandbits(32)
+        dut.test.value = rng.random() < 0.3
+        dut.tx_valid.value = 1
+        await clk
+        dut.tx_valid.value = 0
+    await ClockCycles(dut.clk, 200)
+    busy.kill()
+    lockstep.check()
+
+
+@cocotb.test(timeout_time=sim_budget_ns(cycles=40 * 7 * N_WORDS), timeout_unit="ns")
+async def tx_pid_fifo_lockstep(dut):
+    """UartTxPidFifo against TxPidFifoModel: bursts of tx_valid into a full FIFO"""
+    rng = random.Random(SEED)
+    start_clock(dut)
+    dut.tx_valid.value = 0
+    dut.tx_busy.value = 0
+    dut.tx_float.value = 0
+    dut.test.value = 0
+    lockstep = Lockstep(dut, TxPidFifoModel()).start()
+    await reset(dut)
+
+    busy = cocotb.start_soon(busy_handshake(dut, rng))
+    for _ in range(N_WORDS):
+        await ClockCycles(dut.clk, rng.randint(1, 40))
+        for _ in range(rng.randint(1, 4)):  # pushes past full are dropped
+            dut.tx_float.value = rng.getrandbits(32)
+            dut.test.value = rng.random() < 0.3
+            dut.tx_valid.value = 1
+            await RisingEdge(dut.clk)
+        dut.tx_valid.value = 0
+    await ClockCycles(dut.clk, 400)
+    busy.kill()
+    lockstep.check()
+
+
+JOBS = [
+    SimJob(
+        name="lockstep_uart_rx",
+        toplevel="UartRx",
+        module=Path(__file__).stem,
+        testcase="uart_rx_lockstep",
+        verilog_sources=[SRC_DIR / "uart_rx.v"],
+        parameters=dict(FRAME_BITS=8, **uart_parameters()),
+    ),
+    SimJob(
+        name="lockstep_rx_fifo",
+        toplevel="UartRxFifo",
+        module=Path(__file__).stem,
+        testcase="rx_fifo_lockstep",
+        parameters=dict(DEPTH_LOG2=2),
+    ),
+    SimJob(
+        name="lockstep_pid_buffer",
+        toplevel="UartRxPidBuffer",
+        module=Path(__file__).stem,
+        testcase="pid_buffer_lockstep",
+        verilog_sources=[SRC_DIR / "uart_rx_pid_buffer.v"],
+    ),
+    SimJob(
+        name="lockstep_tx_pid_buffer",
+        toplevel="UartTxPidBuffer",
+        module=Path(__file__).stem,
+        testcase="tx_pid_buffer_lockstep",
+        verilog_sources=[SRC_DIR / "uart_tx_pid_buffer.v"],
+    ),
+    SimJob(
+        name="lockstep_tx_pid_fifo",
+        toplevel="UartTxPidFifo",
+        module=Path(__file__).stem,
+        testcase="tx_pid_fifo_lockstep",
+    ),
+]
+
+
+@pytest.mark.parametrize("job", JOBS, ids=lambda job: job.name)
+def test_lockstep(job):
+    """Cross-check a cycle model against the RTL"""
+    run_job(job)
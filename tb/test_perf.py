@@ -0,0 +1,38 @@
+# ====================================
+# File: test_perf.py
+# Author: jaimebw
+# Created: 2026-10-18 10:23:24
+# ====================================
+
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.perf import compare, counts_callbacks, read_records, record
+
+
+def test_compare_flags_growth_over_threshold():
+    baseline = {"uart_rx_stream": {"wall_s": 10.0, "wall_per_item_us": 5.0, "callbacks_per_cycle": 2.0},
+                "retired": {"wall_s": 1.0}}
+    results = {"uart_rx_stream": {"wall_s": 21.0, "wall_per_item_us": 5.2, "callbacks_per_cycle": 1.0},
+               "new_workload": {"wall_s": 3.0}}
+
+    rows = {(name, metric): regressed for name, metric, _, _, _, regressed in
+            compare(results, baseline, threshold=0.10)}
+    # Only workloads in both files are compared
+    assert set(rows) == {("uart_rx_stream", "wall_s"), ("uart_rx_stream", "wall_per_item_us"),
+                         ("uart_rx_stream", "callbacks_per_cycle")}
+    assert rows[("uart_rx_stream", "wall_s")]
+    assert not rows[("uart_rx_stream", "wall_per_item_us")]  # +4% is noise
+    assert not rows[("uart_rx_stream", "callbacks_per_cycle")]
+
+
+def test_records_roundtrip(tmp_path):
+    path = tmp_path / "records.jsonl"
+    record({"name": "a", "wall_s": 1.5}, path=path)
+    record({"name": "b", "wall_s": 2.5}, path=path)
+    assert [r["name"] for r in read_records(path)] == ["a", "b"]
+
+
+def test_callback_counting_is_pinned_to_known_cocotb():
+    assert counts_callbacks("1.9.2")
+    assert not counts_callbacks("2.0.0")
@@ -0,0 +1,106 @@
+# ====================================
+# File: test_pid_codec.py
+# Author: jaimebw
+# Created: 2026-10-18 10:26:09
+# ====================================
+
+import random
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.pid_codec import (RX_BURST_LEN, RX_UPDATE_LEN, RxPidBufferModel, TX_DATA_PID, TX_TEST_PID,
+                             TxFrameDecoder, decode_tx_frames, encode_rx_burst, encode_rx_bursts,
+                             encode_rx_bursts_into, encode_rx_test, encode_rx_words,
+                             encode_rx_words_into, encode_tx_words)
+
+
+def test_rx_lane_frames():
+    assert encode_rx_words([0xF1F2F3F4], [0xF5F6F7F8]) == bytes.fromhex(
+        "aa10f155aa11f255aa12f355aa13f455aa20f555aa21f655aa22f755aa23f855")
+    assert encode_rx_test(0x1F1) == bytes([0xAA, 0x69, 0xF1, 0x55])
+
+
+def test_rx_encode_into_offset():
+    buf = bytearray(b"\xee" * (2 * RX_UPDATE_LEN + 3))
+    written = encode_rx_words_into(buf, [1, 2], [3, 4], offset=3)
+    assert written == 2 * RX_UPDATE_LEN
+    assert buf[:3] == b"\xee" * 3
+    assert buf[3:] == encode_rx_words([1], [3]) + encode_rx_words([2], [4])
+    with pytest.raises(ValueError):
+        encode_rx_words_into(bytearray(10), [1], [2])
+
+
+def test_rx_burst_frames():
+    assert encode_rx_burst(0xF1F2F3F4, 0xF5F6F7F8) == bytes.fromhex("aa32f1f2f3f4f5f6f7f855")
+    assert encode_rx_burst(a1=0xF1F2F3F4) == bytes.fromhex("aa30f1f2f3f455")
+    assert encode_rx_burst(a2=0xF5F6F7F8) == bytes.fromhex("aa31f5f6f7f855")
+    assert encode_rx_bursts([1, 2], [3, 4]) == encode_rx_burst(1, 3) + encode_rx_burst(2, 4)
+    # A full update is under half the bytes of the lane frames
+    assert 2 * RX_BURST_LEN < RX_UPDATE_LEN
+    buf = bytearray(RX_BURST_LEN + 1)
+    assert encode_rx_bursts_into(buf, [5], [6], offset=1) == RX_BURST_LEN
+    assert buf[1:] == encode_rx_burst(5, 6)
+    with pytest.raises(ValueError):
+        encode_rx_burst()
+
+
+def test_tx_roundtrip():
+    words = [0xC112BEA1, 0, 0xFFFFFFFF]
+    frames = encode_tx_words(words)
+    assert frames[:7] == bytes([0xAA, 0x69, 0xA1, 0xBE, 0x12, 0xC1, 0x55])
+    assert decode_tx_frames(frames) == [(TX_DATA_PID, w) for w in words]
+    assert decode_tx_frames(encode_tx_words([5], test=True)) == [(TX_TEST_PID, 5)]
+    with pytest.raises(ValueError):
+        decode_tx_frames(frames[1:] + b"\xaa")
+
+
+def test_streaming_decoder_resynchronizes():
+    rng = random.Random(3)
+    words = [rng.getrandbits(32) for _ in range(1000)]
+    clean = encode_tx_words(words)
+    # Leading garbage, a stray START, and a frame cut short by one byte
+    noisy = b"\x13\xaa\x00" + clean[:70] + b"\xaa\x55" + clean[70:140] + clean[141:]
+
+    decoder = TxFrameDecoder()
+    decoded = []
+    pos = 0
+    while pos < len(noisy):  # ragged chunks split frames anywhere
+        size = rng.randint(1, 500)
+        decoded += decoder.feed(noisy[pos:pos + size])
+        pos += size
+
+    assert [w for _, w in decoded] == words[:20] + words[21:]
+    assert decoder.dropped == 3 + 2 + 6
+
+
+def test_rx_model_follows_the_rtl():
+    model = RxPidBufferModel()
+    stream = encode_rx_words([0x11223344], [0x55667788])
+    # Split mid-frame: nothing until the last END
+    assert model.feed(stream[:-1]) == []
+    assert model.feed(stream[-1:]) == [(0x11223344, 0x55667788, 0)]
+
+    # A test frame only replaces the low byte of both words
+    assert model.feed(encode_rx_test(0xF1)) == [(0x112233F1, 0x556677F1, 1)]
+
+    # Bad END drops the a1 MSB frame, so the next update completes as soon
+    # as its first frame fills that lane, with the other lanes still stale
+    bad = bytearray(encode_rx_words([0xAABBCCDD], [0]))
+    bad[3] = 0x00
+    assert model.feed(bad) == []
+    assert model.feed(encode_rx_words([0x01020304], [2])) == [(0x01BBCCDD, 0, 0)]
+
+
+def test_rx_model_burst_frames():
+    model = RxPidBufferModel()
+    assert model.feed(encode_rx_burst(0x11223344, 0x55667788)) == [(0x11223344, 0x55667788, 0)]
+    # Single-word bursts and lane frames fill the same lanes
+    assert model.feed(encode_rx_burst(a2=0xA2A2A2A2)) == []
+    assert model.feed(encode_rx_words([0x01020304], [0])[:16]) == [(0x01020304, 0xA2A2A2A2, 0)]
+    # 0x55 and 0xAA inside the payload are data, not delimiters
+    assert model.feed(encode_rx_burst(0x55AA55AA, 0xAA55AA55)) == [(0x55AA55AA, 0xAA55AA55, 0)]
+    # A burst whose END is wrong is dropped
+    bad = bytearray(encode_rx_burst(1, 2))
+    bad[-1] = 0
+    assert model.feed(bad + encode_rx_test(7)) == [(0x55AA5507, 0xAA55AA07, 1)]
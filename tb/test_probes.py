@@ -0,0 +1,97 @@
+# ====================================
+# File: test_probes.py
+# Author: jaimebw
+# Created: 2026-10-18 11:10:30
+# ====================================
+# tblib.probes analysis, and the cycle budgets it declares checked on the
+# cycle models (no simulator): the cocotb tests assert the same budgets on the
+# RTL.
+
+import numpy as np
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.cycle_models import (FracUartRxModel, PidBufferModel, TxPidBufferModel, UartRxModel,
+                                simulate, uart_levels)
+from tblib.pid_codec import END_DEL, encode_rx_burst, encode_rx_test
+from tblib.probes import (END_TO_READY_CYCLES, VALID_TO_START_CYCLES, check_budget, histogram,
+                          latencies, pulse_cycles, rx_stop_to_done_budget, throughput)
+
+
+def test_latencies_pair_each_cause_with_the_next_effect():
+    assert latencies([0, 10, 11], [3, 12, 40]).tolist() == [3, 2, 1]
+    # Unmatched causes are dropped, fractional times round up
+    assert latencies([0.5, 50], [3]).tolist() == [3]
+    # Effects may lead their cause by up to -min_cycles
+    assert latencies([10, 30], [7, 28], min_cycles=-4).tolist() == [-3, -2]
+
+
+def test_histogram_throughput_and_budget():
+    cycles = np.array([3, 3, 4, 3])
+    assert histogram(cycles) == {3: 3, 4: 1}
+    assert throughput([0, 10, 20, 30]) == pytest.approx(0.1)
+    check_budget(cycles, 4, "ok")
+    with pytest.raises(AssertionError, match=r"max 4 cycles, budget 3\n\s+3 cycles\s+3"):
+        check_budget(cycles, 3, "late")
+    with pytest.raises(AssertionError, match="4 latencies measured, expected 5"):
+        check_budget(cycles, 4, "lost", expected_count=5)
+    with pytest.raises(AssertionError, match="min 3 cycles, expected at least 4"):
+        check_budget(cycles, 4, "early", min_cycles=4)
+
+
+def test_end_to_ready_budget():
+    rng = np.random.default_rng(2)
+    frames = [encode_rx_test(int(rng.integers(256))) if rng.random() < 0.25
+              else encode_rx_burst(int(rng.integers(1 << 32)), int(rng.integers(1 << 32)))
+              for _ in range(32)]
+    data = b"".join(frames)
+    done = np.zeros(2 * len(data) + 8, np.uint8)
+    byte = np.zeros_like(done)
+    done[:2 * len(data):2] = 1
+    byte[:2 * len(data):2] = np.frombuffer(data, np.uint8)
+
+    trace = simulate(PidBufferModel(), len(done), rx_done=done, rx_byte=byte)
+    ends = pulse_cycles(done & (byte == END_DEL), driven=True)
+    cycles = latencies(ends, pulse_cycles(trace["ready"][:, 0]))
+    check_budget(cycles, END_TO_READY_CYCLES, "END -> ready", expected_count=len(frames))
+    assert histogram(cycles) == {END_TO_READY_CYCLES: len(frames)}
+
+
+def test_valid_to_start_budget():
+    # A word every 200 clocks into an idle buffer, UART busy for 20 clocks per byte
+    model = TxPidBufferModel()
+    valid = np.zeros(1000, np.uint8)
+    valid[5::200] = 1
+    starts, busy_left = [], 0
+    for cycle, v in enumerate(valid):
+        model.step(tx_float=cycle, tx_valid=v, tx_busy=int(busy_left > 0), test=0)
+        busy_left = max(0, busy_left - 1)
+        if model.tx_start[0]:
+            starts.append(cycle)
+            busy_left = 20
+    cycles = latencies(pulse_cycles(valid, driven=True), starts)
+    check_budget(cycles, VALID_TO_START_CYCLES, "tx_valid -> tx_start", expected_count=5)
+    assert histogram(cycles) == {VALID_TO_START_CYCLES: 5}
+    assert len(starts) == 5 * 7
+
+
+@pytest.mark.parametrize("model, clks_per_bit, phase", [
+    (lambda: UartRxModel(clks_per_bit=8), 8, False),
+    (lambda: UartRxModel(clks_per_bit=16), 16, False),
+    (lambda: UartRxModel(clks_per_bit=17), 17, False),
+    (lambda: FracUartRxModel(baud_rate=3_000_000), 50 / 3, True),
+    (lambda: FracUartRxModel(baud_rate=3_125_000, oversample=True), 16, True),
+], ids=["int8", "int16", "int17", "frac3M", "over3.125M"])
+def test_stop_bit_to_rx_done_budget(model, clks_per_bit, phase):
+    data = [0x00, 0xFF, 0x55, 0x80]
+    lead = 5
+    line = np.concatenate([uart_levels(data, clks_per_bit, idle_bits=0, lead_cycles=lead),
+                           np.ones(2 * round(clks_per_bit), np.uint8)])
+    trace = simulate(model(), len(line), rx=line)
+    # The start bit of byte k falls just after edge lead - 1 + floor(10 k clks_per_bit)
+    stops = [lead - 1 + np.floor(10 * k * clks_per_bit) + 9 * clks_per_bit for k in range(len(data))]
+    cycles = latencies(stops, pulse_cycles(trace["rx_done"][:, 0]), min_cycles=-clks_per_bit)
+    budget = rx_stop_to_done_budget(clks_per_bit, phase)
+    check_budget(cycles, budget, "stop bit -> rx_done", expected_count=len(data))
+    assert cycles.max() == budget   # the budget is tight: one more stage fails it
@@ -0,0 +1,40 @@
+# ====================================
+# File: test_profiling.py
+# Author: jaimebw
+# Created: 2026-10-18 10:24:32
+# ====================================
+
+from cocotb.triggers import NullTrigger
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.profiling import CoroutineProfiler, top_stacks
+
+
+async def send_byte():
+    await NullTrigger()
+
+
+async def stimulus():
+    await send_byte()
+
+
+class FakeTask:
+    def __init__(self, coro):
+        self._coro = coro
+
+    def done(self):
+        return False
+
+
+def test_resumption_charged_to_await_stack(tmp_path):
+    profiler = CoroutineProfiler(tmp_path)
+    task = FakeTask(stimulus())
+    result = profiler.advance(lambda t, outcome: t._coro.send(outcome), task, None)
+    assert isinstance(result, NullTrigger)
+    assert profiler.triggers["stimulus"]["NullTrigger"] == 1
+
+    folded = profiler.dump("my_test")
+    (stack, _), = top_stacks(folded)
+    assert stack == "my_test;stimulus;send_byte;NullTrigger"
+    task._coro.close()
@@ -0,0 +1,119 @@
+# ====================================
+# File: test_soak.py
+# Author: jaimebw
+# Created: 2026-10-18 11:19:30
+# ====================================
+# tblib.soak without a simulator: chunks are reproducible and resumable, and
+# an impaired chunk through UartRxModel passes the scoreboard the cocotb
+# soak test uses on the RTL (glitches rejected, framing errors resynchronised).
+
+import math
+from collections import deque
+import numpy as np
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.cycle_models import UartRxModel, simulate
+from tblib.pid_codec import RxPidBufferModel, encode_rx_burst
+from tblib.probes import pulse_cycles
+from tblib.soak import (FRAMING, GLITCH, SYNC_LEN, SoakProfile, SoakScoreboard, SoakStream,
+                        levels)
+
+CLKS_PER_BIT = 8
+ROUGH = SoakProfile(gap=0.1, glitch=0.15, framing=0.1)
+
+
+def test_chunks_are_reproducible_and_resumable():
+    stream = SoakStream(7, chunk_bytes=1024)
+    again = SoakStream(7, chunk_bytes=1024)
+    assert stream.chunk(40) == again.chunk(40)
+    assert stream.chunk(40).data != SoakStream(8, chunk_bytes=1024).chunk(40).data
+
+    # Resuming at byte 40_000 starts from the chunk holding it
+    assert stream.start_of(40_000) == 39 * 1024
+    resumed = list(stream.chunks(offset=40_000, n_bytes=2048))
+    assert [chunk.index for chunk in resumed] == [39, 40, 41]
+    assert resumed[1] == stream.chunk(40)
+
+    for chunk in resumed:
+        assert len(chunk.data) == 1024
+        assert not any(chunk.impairment[:SYNC_LEN])   # the sync preamble is never impaired
+        assert chunk.data[10:SYNC_LEN] == encode_rx_burst(*[
+            int.from_bytes(chunk.data[12 + 4 * n:16 + 4 * n], "big") for n in range(2)])
+        assert chunk.updates and all(chunk.offset <= start < end <= chunk.offset + 1024
+                                     for start, end, _ in chunk.updates)
+        assert abs(chunk.drift) <= stream.profile.max_drift
+
+
+def run_through_uart_rx(chunk, clks_per_bit):
+    """Line of *chunk* into UartRxModel; scoreboard calls in time order"""
+    guards, t = [], 0.0
+    for pos in range(len(chunk.data)):
+        t += sum(bits for _, bits in chunk.byte_runs(pos))
+        if chunk.impairment[pos] == FRAMING:
+            guards.append(math.floor(t * clks_per_bit))
+    line = np.frombuffer(levels(chunk.runs(), clks_per_bit), np.uint8)
+    line = np.concatenate([line, np.ones(4 * CLKS_PER_BIT, np.uint8)])
+    trace = simulate(UartRxModel(clks_per_bit=CLKS_PER_BIT), len(line), rx=line)
+    done = pulse_cycles(trace["rx_done"][:, 0])
+    events = [(cycle, 0, int(trace["rx_data"][cycle, 0])) for cycle in done]
+    events += [(cycle, 1, None) for cycle in guards]
+    return sorted(events)
+
+
+@pytest.mark.parametrize("drift", [-0.015, 0.0, 0.015])
+def test_impaired_chunk_through_uart_rx_model(drift):
+    chunk = SoakStream(3, ROUGH, chunk_bytes=80).chunk(2)
+    chunk.drift = drift
+    assert chunk.impairment.count(GLITCH) and chunk.impairment.count(FRAMING)
+
+    scoreboard = SoakScoreboard()
+    scoreboard.expect(chunk)
+    buffer = RxPidBufferModel()
+    for _, guard, byte in run_through_uart_rx(chunk, CLKS_PER_BIT * (1 + drift)):
+        if guard:
+            scoreboard.guard_done()
+            continue
+        scoreboard.received(byte)
+        for update in buffer.feed((byte,)):
+            scoreboard.ready(*update)
+    scoreboard.finish()
+    assert not scoreboard.errors, scoreboard.errors
+    stats = scoreboard.stats
+    assert stats["bytes"] == len(chunk.data)
+    assert stats["glitches"] == chunk.impairment.count(GLITCH)
+    assert stats["spurious_bytes"] <= stats["framing_errors"]
+    assert stats["updates"] >= len(chunk.updates) - stats["lost_updates"]
+
+
+def test_scoreboard_flags_unexplained_losses():
+    chunk = SoakStream(5, SoakProfile(gap=0, glitch=0, framing=0), chunk_bytes=256).chunk(0)
+    scoreboard = SoakScoreboard()
+    scoreboard.expect(chunk)
+    for byte in chunk.data:
+        scoreboard.received(byte)
+    # Only the last update shows up: the others were lost with no framing error
+    scoreboard.expected = deque([chunk.updates[-1][2]])
+    scoreboard.ready(*chunk.updates[-1][2])
+    assert scoreboard.stats["lost_updates"] == len(chunk.updates) - 1
+    assert scoreboard.first_error_offset == chunk.updates[0][0]
+    assert "lost, no framing error" in scoreboard.errors[0]
+
+    scoreboard = SoakScoreboard()
+    scoreboard.expect(chunk)
+    scoreboard.received(chunk.data[0] ^ 1)
+    assert scoreboard.errors == ["byte 0: UartRx gave 0x01, sent 0x00"]
+
+
+def test_glitch_longer_than_half_a_bit_is_caught():
+    chunk = SoakStream(3, ROUGH, chunk_bytes=80).chunk(2)
+    chunk.glitch_bits = dict.fromkeys(chunk.glitch_bits, 0.9)   # still low at the MID_BIT re-sample
+    scoreboard = SoakScoreboard()
+    scoreboard.expect(chunk)
+    for _, guard, byte in run_through_uart_rx(chunk, CLKS_PER_BIT):
+        if guard:
+            scoreboard.guard_done()
+        else:
+            scoreboard.received(byte)
+    assert "UartRx gave" in scoreboard.errors[0]
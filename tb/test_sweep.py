@@ -0,0 +1,57 @@
+# ====================================
+# File: test_sweep.py
+# Author: jaimebw
+# Created: 2026-10-18 10:35:14
+# ====================================
+
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.regression import JobResult
+from tblib.runner import SRC_DIR
+from tblib.sweep import Sweep, SweepResult, format_grid, group_builds, grid_rows
+
+SOURCES = [SRC_DIR / "control_law.v"]
+
+
+def make_sweep(**kwargs):
+    return Sweep(name="gains", toplevel="LandauControlLaw", module="test_control_law_vectors",
+                 verilog_sources=SOURCES, **kwargs)
+
+
+def test_points_expand_and_filter():
+    sweep = make_sweep(parameters={"K1": [1, 2, 2], "K2": [None, 3]},
+                       defines=[[], ["SIM_MODE"]],
+                       where=lambda p: not p["defines"] or p["K2"] is None)
+    points = list(sweep.points())
+    # duplicates of K1=2 collapse; SIM_MODE only with the default K2
+    assert len(points) == 2 * 2 + 2
+    jobs = sweep.jobs()
+    assert [job.name for job, _ in jobs] == [f"gains_{n:04d}" for n in range(6)]
+    job, point = jobs[1]
+    assert point == {"K1": 1, "K2": None, "defines": ("SIM_MODE",)}
+    assert job.parameters == {"K1": 1} and job.defines == ["SIM_MODE"]
+
+
+def test_env_axis_reuses_the_build():
+    sweep = make_sweep(parameters={"K1": [1, 2]}, env={"RANDOM_SEED": [1, 2, 3]})
+    jobs = [job for job, _ in sweep.jobs()]
+    assert jobs[0].extra_env == {"RANDOM_SEED": "1"}
+    groups = group_builds(jobs, "icarus")
+    assert len(groups) == 2
+    assert all(len(group) == 3 for group in groups.values())
+
+
+def test_grid_rows():
+    sweep = make_sweep(parameters={"K1": [None, 5]})
+    results = []
+    for n, (job, point) in enumerate(sweep.jobs()):
+        tests = [{"sim_time_ns": 2e6}]
+        results.append(SweepResult(JobResult(job.name, job.toplevel, job.module, job.parameters,
+                                             passed=n == 0, wall_time_s=1.5, tests=tests),
+                                   point, build="ab" * 16, compile_s=4.0, reused=n > 0))
+    rows = grid_rows(results)
+    assert rows[0]["K1"] == "default" and rows[0]["status"] == "PASS"
+    assert rows[0]["compile_s"] == 4.0 and rows[1]["compile_s"] == 0.0
+    assert rows[1]["sim_ms"] == 2.0
+    assert format_grid(results).splitlines()[0].split()[:3] == ["K1", "defines", "job"]
@@ -0,0 +1,226 @@
+# ====================================
+# File: test_uart_control_loop.py
+# Author: jaimebw
+# Created: 2026-10-18 11:06:49
+# ====================================
+# UartControlLoop (src/uart_control_loop.v) closed through a Python plant:
+# every step sends the plant state as a1/a2, waits for the b frame on tx and
+# applies it. Each b is checked against tblib.plant.closed_loop, and the run
+# reports the loop latency per step and the sustained update rate.
+#
+#   LOOP_STEPS   control steps (default 2000 in fast baud mode, 4 in full mode)
+#   LOOP_FRAMES  burst: one 0x32 frame per step (11 bytes), lanes: 8 lane frames (32 bytes)
+#   LOOP_REPORT  write the summary there as JSON
+#
+# control_loop_fifo sends its updates back to back instead: with
+# RX_FIFO_DEPTH_LOG2 set the bytes that arrive while a b frame is on the line
+# wait in UartRxFifo, and every update still gets its answer.
+
+import json
+import os
+import cocotb
+import numpy as np
+import pytest
+from cocotb.triggers import FallingEdge
+from cocotb.utils import get_sim_time
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.config import CLK_FREQ, baud_mode, bit_time_ns, dut_parameter, sim_budget_ns, uart_parameters
+from tblib.control_law_model import control_law, to_int32, to_q16
+from tblib.harness import reset, start_clock
+from tblib.pid_codec import (RX_BURST_LEN, RX_UPDATE_LEN, TX_DATA_PID, TX_FRAME_LEN,
+                             decode_tx_frames, encode_rx_burst, encode_rx_bursts, encode_rx_words)
+from tblib.plant import closed_loop, double_integrator, loop_rate_bound, to_float
+from tblib.runner import SimJob, run_job
+from tblib.uart import UartSink, UartSource
+from tblib.profiling import install_from_env
+
+install_from_env()  # TB_PROFILE=1: profile this run, see tblib/profiling.py
+
+FULL_MODE_STEPS = 4  # 9600 baud: each step is ~1e6 clocks
+
+
+def default_steps(fast_steps):
+    return fast_steps if baud_mode() == "fast" else FULL_MODE_STEPS
+
+
+N_STEPS = int(os.getenv("LOOP_STEPS", default_steps(2000)))
+FRAMES = os.getenv("LOOP_FRAMES", "burst")
+N_BACK_TO_BACK = default_steps(64)
+RX_BYTES = {"burst": RX_BURST_LEN, "lanes": RX_UPDATE_LEN}
+BITS_PER_BYTE = 10
+
+
+def encode_measurement(a1, a2):
+    if FRAMES == "lanes":
+        return bytes(encode_rx_words([a1], [a2]))
+    return encode_rx_burst(a1, a2)
+
+
+def loop_summary(latency_ns, turnaround_ns, elapsed_ns, baud_rate):
+    """Latency and rate figures of a run, as logged and written to LOOP_REPORT"""
+    rx_bytes = RX_BYTES[FRAMES]
+    return {
+        "frames": FRAMES,
+        "baud_rate": baud_rate,
+        "steps": len(latency_ns),
+        "bytes_per_step": rx_bytes + TX_FRAME_LEN,
+        "latency_us": {
+            "min": latency_ns.min() / 1e3,
+            "mean": latency_ns.mean() / 1e3,
+            "p99": float(np.percentile(latency_ns, 99)) / 1e3,
+            "max": latency_ns.max() / 1e3,
+        },
+        # last stop bit of the a1/a2 frame to the start bit of the b frame
+        "turnaround_ns": {"mean": turnaround_ns.mean(), "max": turnaround_ns.max()},
+        "update_rate_hz": len(latency_ns) / elapsed_ns * 1e9,
+        "line_bound_hz": loop_rate_bound(baud_rate, rx_bytes, TX_FRAME_LEN, BITS_PER_BYTE),
+    }
+
+
+async def first_falling_edge(signal):
+    await FallingEdge(signal)
+    return get_sim_time("ns")
+
+
+@cocotb.test(timeout_time=sim_budget_ns(uart_bytes=N_STEPS * (RX_BYTES[FRAMES] + TX_FRAME_LEN)),
+             timeout_unit="ns")
+async def control_loop_closed(dut):
+    """N_STEPS through the HDL loop, every b equal to the NumPy loop's"""
+    k1 = to_int32(dut_parameter(dut, "K1"))
+    k2 = to_int32(dut_parameter(dut, "K2"))
+    expected = closed_loop(double_integrator(), N_STEPS, k1, k2)
+    plant = double_integrator()
+
+    start_clock(dut)
+    bit_ns = bit_time_ns(dut)
+    source = UartSource(dut.rx, bit_ns)
+    sink = UartSink(dut.tx, bit_ns).start()
+    await reset(dut)
+
+    latency = np.zeros(N_STEPS)
+    turnaround = np.zeros(N_STEPS)
+    start = get_sim_time("ns")
+    for k in range(N_STEPS):
+        a1, a2 = plant.measure()
+        frame = encode_measurement(a1, a2)
+        sent = get_sim_time("ns")
+        tx_start = cocotb.start_soon(first_falling_edge(dut.tx))
+        await source.send(frame)
+        (pid, b), = decode_tx_frames(await sink.read(TX_FRAME_LEN))
+        latency[k] = get_sim_time("ns") - sent
+        turnaround[k] = await tx_start - (sent + len(frame) * BITS_PER_BYTE * bit_ns)
+
+        assert pid == TX_DATA_PID
+        assert (a1, a2, b) == tuple(expected[:, k]), \
+            f"step {k}: a1={a1:#010x} a2={a2:#010x} b={b:#010x}, expected b={int(expected[2, k]):#010x}"
+        plant.step(b)
+
+    summary = loop_summary(latency, turnaround, get_sim_time("ns") - start,
+                           dut_parameter(dut, "BAUD_RATE"))
+    dut._log.info("%s", json.dumps(summary, indent=2))
+    if os.getenv("LOOP_REPORT"):
+        Path(os.environ["LOOP_REPORT"]).write_text(json.dumps(summary, indent=2) + "\n")
+
+    # The answer may overlap the last stop bit; beyond the line time, a step
+    # costs only the clocks between ready and tx_start and between TX bytes
+    wire_ns = (RX_BYTES[FRAMES] + TX_FRAME_LEN) * BITS_PER_BYTE * bit_ns
+    assert latency.max() <= wire_ns + BITS_PER_BYTE * bit_ns, summary["latency_us"]
+    assert sink.framing_errors == 0
+
+
+@cocotb.test(timeout_time=sim_budget_ns(uart_bytes=N_BACK_TO_BACK * (RX_BURST_LEN + TX_FRAME_LEN)),
+             timeout_unit="ns")
+async def control_loop_back_to_back(dut):
+    """Burst updates with no gap between them: each gets its b frame, in order"""
+    k1 = to_int32(dut_parameter(dut, "K1"))
+    k2 = to_int32(dut_parameter(dut, "K2"))
+    rng = np.random.default_rng(7)
+    a1 = rng.integers(0, 2**32, N_BACK_TO_BACK, dtype=np.uint64).astype(np.uint32)
+    a2 = rng.integers(0, 2**32, N_BACK_TO_BACK, dtype=np.uint64).astype(np.uint32)
+    expected = control_law(a1.view(np.int32), a2.view(np.int32), 0, k1, k2).view(np.uint32)
+
+    start_clock(dut)
+    bit_ns = bit_time_ns(dut)
+    source = UartSource(dut.rx, bit_ns)
+    sink = UartSink(dut.tx, bit_ns).start()
+    await reset(dut)
+
+    await source.send(encode_rx_bursts(a1.tolist(), a2.tolist()), idle_bits=0)
+    frames = decode_tx_frames(await sink.read(N_BACK_TO_BACK * TX_FRAME_LEN))
+
+    assert [b for _, b in frames] == expected.tolist()
+    fifo = dut.rx_fifo.rx_fifo_inst
+    max_level = int(fifo.max_level.value)
+    dut._log.info("FIFO high-water mark: %d bytes", max_level)
+    # Each b frame holds the input back for ~7 byte times of a 11-byte burst
+    assert max_level >= TX_FRAME_LEN - 2, max_level
+    assert int(fifo.overflows.value) == 0
+    assert sink.framing_errors == 0
+
+
+# ----------------------------------------------------------------
+# Plant sanity checks (plain pytest, no simulator)
+# ----------------------------------------------------------------
+def test_reference_loop_is_stable_and_repeatable():
+    k1, k2 = int(to_q16(-0.2)), int(to_q16(-0.4))
+    trace = closed_loop(double_integrator(), 2000, k1, k2)
+    assert np.array_equal(trace, closed_loop(double_integrator(), 2000, k1, k2))
+    position = to_float(trace[0])
+    assert position[0] == 4.0
+    assert np.abs(position[100:]).max() < 1.0   # regulated around zero, kept moving by the noise
+    assert np.abs(position[100:]).std() > 0.01
+
+
+def test_measurement_saturates_to_q16():
+    plant = double_integrator(x0=(1e6, -1e6))
+    a1, a2 = plant.measure()
+    assert to_float([a1, a2]).tolist() == [32767.0, -32767.0]
+
+
+def test_line_bound():
+    # 11-byte burst + 7-byte answer at 3.125 Mbaud: 180 bits per step
+    assert loop_rate_bound(3_125_000, RX_BURST_LEN, TX_FRAME_LEN) == pytest.approx(17_361.1, abs=0.1)
+
+
+JOBS = [
+    SimJob(
+        name="control_loop",
+        toplevel="UartControlLoop",
+        module=Path(__file__).stem,
+        parameters=uart_parameters(),
+        testcase="control_loop_closed",
+        extra_env={"LOOP_STEPS": str(N_STEPS)},
+    ),
+    SimJob(
+        name="control_loop_lanes",
+        toplevel="UartControlLoop",
+        module=Path(__file__).stem,
+        parameters=uart_parameters(),
+        testcase="control_loop_closed",
+        extra_env={"LOOP_STEPS": str(default_steps(500)), "LOOP_FRAMES": "lanes"},
+    ),
+    # 3 Mbaud does not divide 50 MHz: phase-accumulator timing on both UARTs
+    SimJob(
+        name="control_loop_3mbaud",
+        toplevel="UartControlLoop",
+        module=Path(__file__).stem,
+        parameters={"CLK_FREQ": CLK_FREQ, "BAUD_RATE": 3_000_000, "FRACTIONAL": 1},
+        testcase="control_loop_closed",
+        extra_env={"LOOP_STEPS": "500"},
+    ),
+    SimJob(
+        name="control_loop_fifo",
+        toplevel="UartControlLoop",
+        module=Path(__file__).stem,
+        parameters={**uart_parameters(), "RX_FIFO_DEPTH_LOG2": 4},
+        testcase="control_loop_back_to_back",
+    ),
+]
+
+
+@pytest.mark.parametrize("job", JOBS, ids=lambda job: job.name)
+def test_uart_control_loop_runner(job):
+    """Run the closed-loop simulation of UartControlLoop"""
+    run_job(job)
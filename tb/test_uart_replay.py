@@ -0,0 +1,135 @@
+# ====================================
+# File: test_uart_replay.py
+# Author: jaimebw
+# Created: 2026-10-18 10:28:01
+# ====================================
+# Replay a UART capture through UartTxAndPidBuffer and check every ready
+# pulse against the streaming RxPidBufferModel.
+#
+#   REPLAY_CAPTURE=/path/field.cap pytest tb/test_uart_replay.py
+#
+# Without REPLAY_CAPTURE a synthetic timed capture (updates, test frames and
+# line noise) is generated. Gaps of timed captures are converted to idle bit
+# times at the capture baud rate and capped at REPLAY_MAX_GAP_BITS. Like
+# test_uart_rx_and_buffer.py it runs at transaction level unless SIM_RX_LEVEL=bit.
+
+import os
+import random
+from collections import deque
+import cocotb
+import pytest
+from cocotb.triggers import ReadOnly, RisingEdge, Timer, with_timeout
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.capture import Capture, write_capture
+from tblib.config import BUDGET_BITS_PER_BYTE, FULL_BAUD_RATE, bit_time_ns
+from tblib.harness import reset, start_clock
+from tblib.pid_codec import RxPidBufferModel, encode_rx_test, encode_rx_words
+from tblib.runner import rx_and_buffer_job, run_job
+from tblib.uart import rx_source
+from tblib.profiling import install_from_env
+
+install_from_env()  # TB_PROFILE=1: profile this run, see tblib/profiling.py
+
+REPLAY_CHUNK = 4096
+REPLAY_IDLE_BITS = 1        # between bytes of a raw capture
+MAX_GAP_BITS = int(os.getenv("REPLAY_MAX_GAP_BITS", "8"))
+MAX_REPORTED = 20
+
+
+def synthetic_capture(path, n_updates=200, seed=7):
+    """Timed capture of lane updates and test frames with some line noise"""
+    rng = random.Random(seed)
+    data = bytearray()
+    for _ in range(n_updates):
+        if rng.random() < 0.1:
+            data += encode_rx_test(rng.getrandbits(8))
+        else:
+            data += encode_rx_words([rng.getrandbits(32)], [rng.getrandbits(32)])
+        if rng.random() < 0.05:
+            data += bytes(rng.getrandbits(8) for _ in range(rng.randint(1, 3)))
+    gaps_us = [rng.choice((0, 0, 0, 150, 2000)) for _ in data]
+    write_capture(path, data, gaps_us, baud_rate=FULL_BAUD_RATE)
+
+
+def gap_bits(gap_us, baud_rate):
+    bits = round(gap_us * baud_rate / 1e6)
+    return min(max(bits, 0), MAX_GAP_BITS)
+
+
+@cocotb.test()
+async def replay_capture(dut):
+    path = os.getenv("REPLAY_CAPTURE")
+    if not path:
+        path = "synthetic.cap"
+        synthetic_capture(path)
+
+    start_clock(dut)
+    source = rx_source(dut)
+    await reset(dut)
+
+    model = RxPidBufferModel()
+    expected = deque()    # updates the model has produced, not yet seen on the DUT
+    mismatches = []
+    checked = 0
+
+    async def monitor():
+        nonlocal checked
+        ready = RisingEdge(dut.ready)
+        while True:
+            await ready
+            await ReadOnly()
+            got = (int(dut.a1.value), int(dut.a2.value), int(dut.test.value))
+            want = expected.popleft() if expected else None
+            if got != want:
+                mismatches.append((checked, want, got))
+            checked += 1
+
+    with Capture(path) as capture:
+        dut._log.info(f"Replaying {capture.n_bytes} bytes from {path}"
+                      f" ({'timed' if capture.timed else 'raw'})")
+        # Worst case every byte waits the longest gap
+        idle = MAX_GAP_BITS if capture.timed else REPLAY_IDLE_BITS
+        budget_ns = (2 * capture.n_bytes * (BUDGET_BITS_PER_BYTE + idle) + 100) * bit_time_ns(dut)
+
+        async def replay():
+            for data, gaps_us in capture.chunks(REPLAY_CHUNK):
+                expected.extend(model.feed(data))
+                if gaps_us is None:
+                    await source.send(data, idle_bits=REPLAY_IDLE_BITS)
+                    continue
+                for byte, gap_us in zip(data, gaps_us):
+                    bits = gap_bits(gap_us, capture.baud_rate)
+                    if bits:
+                        await source.idle(bits)
+                    await source.send(byte)
+
+        checker = cocotb.start_soon(monitor())
+        await with_timeout(replay(), budget_ns, "ns", round_mode="round")
+        # The last ready pulse trails the final stop bit by a few clocks
+        await Timer(2 * bit_time_ns(dut), units="ns", round_mode="round")
+        checker.kill()
+
+    dut._log.info(f"{source.bytes_sent} bytes, {checked} updates checked")
+    rows = "\n".join(f"  update {n}: expected {want}, got {got}"
+                     for n, want, got in mismatches[:MAX_REPORTED])
+    assert not mismatches, f"{len(mismatches)} mismatching updates\n{rows}"
+    assert not expected, f"{len(expected)} updates never appeared, first {expected[0]}"
+
+
+JOBS = [
+    rx_and_buffer_job(
+        "uart_replay",
+        Path(__file__).stem,
+        # The simulator runs in the build directory
+        extra_env={"REPLAY_CAPTURE": str(Path(os.environ["REPLAY_CAPTURE"]).resolve())}
+        if os.getenv("REPLAY_CAPTURE") else {},
+    ),
+]
+
+
+@pytest.mark.parametrize("job", JOBS, ids=lambda job: job.name)
+def test_uart_replay(job):
+    """Replay a UART capture through UartTxAndPidBuffer"""
+    run_job(job)
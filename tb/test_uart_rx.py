@@ -4,82 +4,64 @@
 # Created: 2025-05-04 22:06:58
 # ====================================
 
+import os
+import random
 import cocotb
-from cocotb.clock import Clock
+import pytest
 from cocotb.triggers import RisingEdge, Timer
-from cocotb_test.simulator import run
+from cocotb.utils import get_sim_time
 from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.runner import SRC_DIR, SimJob, run_job
+from tblib.sweep import Sweep
+from tblib.config import (CLK_FREQ, bit_time_ns, clks_per_bit, dut_parameter, phase_timing,
+                          sim_budget_ns, uart_parameters)
+from tblib.harness import reset, start_clock
+from tblib.triggers import wait_for_pulse
+from tblib.uart import UartSource
+from tblib.probes import (EventProbe, check_budget, format_histogram, latencies, ns_to_cycles,
+                          rx_stop_to_done_budget)
+from tblib.profiling import install_from_env
+
+install_from_env()  # TB_PROFILE=1: profile this run, see tblib/profiling.py
+
 COCOTB_RESOLVE_X = 1
 
 
 # Parameters
-CLK_FREQ = 50_000_000
-BAUD_RATE = 9600
-CLKS_PER_BIT = CLK_FREQ // BAUD_RATE
-MID_BIT= CLKS_PER_BIT// 2
-BIT_TIME_NS = CLKS_PER_BIT * 20  # 20ns per clock tick at 50MHzk
 FRAME_BITS =8 
+SEED = 2026
+N_STREAM_BYTES = 64
+N_LATENCY_BYTES = 32
+N_GAP_BYTES = 4
+GAP_BITS = 25  # longer than a frame: beyond the precomputed timers
 
 
-START_BIT = 0
-STOP_BIT  = 1
-
-async def run_cycles(dut, n):
-    for _ in range(n):
-        await RisingEdge(dut.clk)
+def line_skew():
+    """Relative error of the transmitter's bit period, from UART_CLOCK_SKEW (0.03: 3% slow)"""
+    return float(os.getenv("UART_CLOCK_SKEW", "0"))
 
 
-async def watch_rx_done(dut):
-    for _ in range(100_000):
-        await RisingEdge(dut.clk)
-        if dut.rx_done.value == 1:
-            print("rx_done detected!")
-            return
-    assert False, "rx_done was never asserted"
-
-@cocotb.test()
+@cocotb.test(timeout_time=sim_budget_ns(uart_bytes=1), timeout_unit="ns")
 async def uart_rx_test(dut):
     """Receive 0xAA (1010_1010) and check rx_done / rx_data"""
-
-    # ----------------------------------------------------------------
-    # Create 50 MHz clock
-    # ----------------------------------------------------------------
-    clock = Clock(dut.clk, 20, units="ns")  # 50 MHz
-    cocotb.start_soon(clock.start())
-
-    dut.rst.value = 1
-    await RisingEdge(dut.clk)
-    dut.rst.value = 0
-
-    await RisingEdge(dut.clk)
-    dut.rx.value  = 1                 # line idle
-
-    # ----------------------------------------------------------------
-    # Build the UART frame: start + 8 data + stop
-    # LSB first for UART
-    # ----------------------------------------------------------------
     data_byte = 0xAA                  # 1010_1010
-    frame_bits = [(data_byte >> i) & 1 for i in range(FRAME_BITS)]
-    await Timer(BIT_TIME_NS, units="ns")
+    start_clock(dut)
+    source = UartSource(dut.rx, bit_time_ns(dut), data_bits=dut_parameter(dut, "FRAME_BITS"))
+    await reset(dut)
 
-    assert dut.rx_busy.value == 0 
+    assert dut.rx_busy.value == 0
     assert dut.rx_done.value == 0
-    dut.rx.value  = 0                 # line idle
 
-    await Timer(BIT_TIME_NS, units="ns")
+    rx_done_task = cocotb.start_soon(wait_for_pulse(dut.rx_done))
+    send_task = cocotb.start_soon(source.send(data_byte))
+    await Timer(source.bit_time_ns, units="ns")
     assert dut.rx_busy.value == 1
+    assert dut.rx_data.value == 0
 
-    rx_done_task = cocotb.start_soon(watch_rx_done(dut))
-    for index, bit in enumerate(frame_bits):
-        dut.rx.value  = bit                 # line idle
-        assert dut.rx_data.value == 0
-        await Timer(BIT_TIME_NS, units="ns")
-
-    assert dut.rx_data.value != 0
-
-
+    await send_task
+    await rx_done_task
 
     # ----------------------------------------------------------------
     # Assertions
@@ -88,24 +70,152 @@ async def uart_rx_test(dut):
     assert dut.rx_data.value.integer == data_byte, \
         f"Expected 0x{data_byte:02X}, got 0x{dut.rx_data.value.integer:02X}"
 
-
-
-
-def test_uart_rx_runner():
-    """Run simulation for UartRx"""
-    this_dir = Path(__file__).resolve().parent
-    rtl_file = this_dir.parent / "src" / "uart_rx.v"
-    mod_name = Path(__file__).stem
-
-    assert rtl_file.exists(), f"Missing Verilog source: {rtl_file}"
-
-    run(
-        verilog_sources=[rtl_file],
+@cocotb.test(timeout_time=sim_budget_ns(uart_bytes=N_STREAM_BYTES), timeout_unit="ns")
+async def uart_rx_stream(dut):
+    """Back-to-back random bytes, stop bit straight into the next start bit, from a
+    transmitter whose clock is off by UART_CLOCK_SKEW
+    """
+    rng = random.Random(SEED)
+    frame_bits = dut_parameter(dut, "FRAME_BITS")
+    start_clock(dut)
+    source = UartSource(dut.rx, bit_time_ns(dut) * (1 + line_skew()), data_bits=frame_bits)
+    await reset(dut)
+
+    received = []
+
+    async def collect():
+        clk = RisingEdge(dut.clk)
+        while True:
+            await clk
+            if dut.rx_done.value:  # one clock per byte, sampled as the RTL drove it
+                received.append(int(dut.rx_data.value))
+
+    collector = cocotb.start_soon(collect())
+    data = [rng.getrandbits(frame_bits) for _ in range(N_STREAM_BYTES)]
+    await source.send(data, idle_bits=0)
+    await Timer(source.bit_time_ns, units="ns")
+    collector.kill()
+
+    lost = next((i for i, (a, b) in enumerate(zip(received, data)) if a != b), None)
+    assert received == data, f"{len(received)}/{len(data)} bytes, first difference at {lost}"
+
+
+@cocotb.test(timeout_time=sim_budget_ns(uart_bytes=N_GAP_BYTES * 4), timeout_unit="ns")
+async def uart_rx_long_gaps(dut):
+    """Bytes separated by idle gaps longer than a whole frame"""
+    rng = random.Random(SEED)
+    frame_bits = dut_parameter(dut, "FRAME_BITS")
+    start_clock(dut)
+    source = UartSource(dut.rx, bit_time_ns(dut), data_bits=frame_bits)
+    await reset(dut)
+
+    data = [rng.getrandbits(frame_bits) for _ in range(N_GAP_BYTES)]
+    start = get_sim_time("ns")
+    for value in data:
+        done = cocotb.start_soon(wait_for_pulse(dut.rx_done))
+        await source.send(value, idle_bits=GAP_BITS)
+        await done
+        assert int(dut.rx_data.value) == value
+    elapsed_bits = (get_sim_time("ns") - start) / source.bit_time_ns
+    assert elapsed_bits == pytest.approx(N_GAP_BYTES * (frame_bits + 2 + GAP_BITS), abs=1)
+
+
+@cocotb.test(timeout_time=sim_budget_ns(uart_bytes=N_LATENCY_BYTES), timeout_unit="ns")
+async def rx_done_latency_budget(dut):
+    """Start of the stop bit -> rx_done within rx_stop_to_done_budget()"""
+    rng = random.Random(SEED)
+    frame_bits = dut_parameter(dut, "FRAME_BITS")
+    if phase_timing(dut):
+        cpb = dut_parameter(dut, "CLK_FREQ") / dut_parameter(dut, "BAUD_RATE")
+    else:
+        cpb = clks_per_bit(dut)
+    start_clock(dut)
+    source = UartSource(dut.rx, bit_time_ns(dut), data_bits=frame_bits)
+    await reset(dut)
+
+    done = EventProbe(dut.rx_done).start()
+    stops = []
+    for _ in range(N_LATENCY_BYTES):
+        stops.append(get_sim_time("ns") + (1 + frame_bits) * source.bit_time_ns)
+        await source.send(rng.getrandbits(frame_bits), idle_bits=rng.randint(0, 2))
+    await Timer(source.bit_time_ns, units="ns")
+
+    # rx_done may lead the stop bit, but never by a whole bit
+    cycles = latencies(ns_to_cycles(stops), done.cycles, min_cycles=-cpb)
+    budget = rx_stop_to_done_budget(cpb, phase_timing(dut))
+    dut._log.info("stop bit -> rx_done (budget %d):\n%s", budget, format_histogram(cycles))
+    check_budget(cycles, budget, "stop bit -> rx_done", expected_count=N_LATENCY_BYTES)
+
+
+JOBS = [
+    SimJob(
+        name="uart_rx",
         toplevel="UartRx",
-        module= mod_name,
-        parameters={"FRAME_BITS": FRAME_BITS},
-        waves=True,
-        sim_build=this_dir / f"sim_{mod_name}",
-        timescale="1ns/1ps"
-    )
-
+        module=Path(__file__).stem,
+        verilog_sources=[SRC_DIR / "uart_rx.v"],
+        parameters={"FRAME_BITS": FRAME_BITS, **uart_parameters()},
+    ),
+    # 3 Mbaud is 16.67 clocks per bit at 50 MHz: only the phase accumulator keeps up
+    SimJob(
+        name="uart_rx_fractional",
+        toplevel="UartRx",
+        module=Path(__file__).stem,
+        verilog_sources=[SRC_DIR / "uart_rx.v"],
+        parameters={"FRAME_BITS": FRAME_BITS, "CLK_FREQ": 50_000_000, "BAUD_RATE": 3_000_000,
+                    "FRACTIONAL": 1},
+    ),
+    SimJob(
+        name="uart_rx_oversample",
+        toplevel="UartRx",
+        module=Path(__file__).stem,
+        verilog_sources=[SRC_DIR / "uart_rx.v"],
+        parameters={"FRAME_BITS": FRAME_BITS, "CLK_FREQ": 50_000_000, "BAUD_RATE": 3_000_000,
+                    "FRACTIONAL": 1, "OVERSAMPLE": 1},
+        testcase="uart_rx_stream",
+        extra_env={"UART_CLOCK_SKEW": "-0.03"},
+    ),
+]
+
+
+# The testbench clock is always CLK_FREQ (CLK_PERIOD_NS), so what the uart_rx
+# sweep varies is the clocks per bit of UartRx: BAUD_RATE = CLK_FREQ // n.
+# 8 is the fewest it samples reliably, 434 and 5208 are 115200 and 9600 baud.
+UART_RX_CLKS_PER_BIT = [8, 9, 16, 27, 434, 5208]
+
+# python tb/sweep.py -k uart_rx: the budgets and bit times follow each point
+SWEEPS = [
+    Sweep(
+        name="uart_rx",
+        toplevel="UartRx",
+        module=Path(__file__).stem,
+        verilog_sources=[SRC_DIR / "uart_rx.v"],
+        parameters={
+            "CLK_FREQ": [CLK_FREQ],
+            "BAUD_RATE": [CLK_FREQ // n for n in UART_RX_CLKS_PER_BIT],
+            "FRAME_BITS": [8, 9],
+        },
+    ),
+    # Phase-accumulator timing up to 3.125 Mbaud, against a transmitter 3% fast or slow
+    Sweep(
+        name="uart_rx_fractional",
+        toplevel="UartRx",
+        module=Path(__file__).stem,
+        verilog_sources=[SRC_DIR / "uart_rx.v"],
+        parameters={
+            "CLK_FREQ": [50_000_000],
+            "BAUD_RATE": [115_200, 921_600, 1_000_000, 2_000_000, 3_000_000, 3_125_000],
+            "FRACTIONAL": [1],
+            "OVERSAMPLE": [0, 1],
+        },
+        env={"UART_CLOCK_SKEW": [-0.03, 0, 0.03]},
+        # At most one oversampling tick per clock
+        where=lambda p: not p["OVERSAMPLE"] or 16 * p["BAUD_RATE"] <= p["CLK_FREQ"],
+        testcase="uart_rx_stream",
+    ),
+]
+
+
+@pytest.mark.parametrize("job", JOBS, ids=lambda job: job.name)
+def test_uart_rx_runner(job):
+    """Run simulation for UartRx"""
+    run_job(job)
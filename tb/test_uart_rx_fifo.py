@@ -0,0 +1,131 @@
+# ====================================
+# File: test_uart_rx_fifo.py
+# Author: jaimebw
+# Created: 2026-10-18 10:49:03
+# ====================================
+# UartRx into UartRxFifo (tb/uart_rx_fifo_line.v) under continuous traffic:
+# every stop bit is followed straight by the next start bit, and the consumer
+# side pops at its own pace.
+
+import random
+import cocotb
+import pytest
+from cocotb.triggers import ClockCycles, RisingEdge
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.config import bit_time_ns, clks_per_bit, dut_parameter, sim_budget_ns, uart_parameters
+from tblib.harness import reset, start_clock
+from tblib.runner import SimJob, run_job
+from tblib.uart import UartSource
+from tblib.profiling import install_from_env
+
+install_from_env()  # TB_PROFILE=1: profile this run, see tblib/profiling.py
+
+SEED = 2026
+N_BYTES = 512
+DEPTH_LOG2 = 4
+
+
+class Consumer:
+    """Pops rd_data with rd_en; stall_cycles() decides how long to wait after each byte"""
+
+    def __init__(self, dut, stall_cycles):
+        self.dut = dut
+        self.stall_cycles = stall_cycles
+        self.received = bytearray()
+        self.dut.rd_en.value = 0
+        self._task = cocotb.start_soon(self._run())
+
+    async def _run(self):
+        dut = self.dut
+        clk = RisingEdge(dut.clk)
+        while True:
+            dut.rd_en.value = 1
+            await clk
+            while not dut.rd_valid.value:  # sampled at the edge, as the FIFO saw it
+                await clk
+            self.received.append(int(dut.rd_data.value))
+            dut.rd_en.value = 0
+            stall = self.stall_cycles()
+            if stall:
+                await ClockCycles(dut.clk, stall)
+
+    def stop(self):
+        self._task.kill()
+
+
+async def start_line(dut):
+    """Clock, idle line and reset; returns the UartSource on rx"""
+    start_clock(dut)
+    source = UartSource(dut.rx, bit_time_ns(dut))
+    dut.rd_en.value = 0
+    await reset(dut)
+    return source
+
+
+@cocotb.test(timeout_time=sim_budget_ns(uart_bytes=N_BYTES), timeout_unit="ns")
+async def rx_fifo_back_to_back_stress(dut):
+    """No byte lost at full line rate with a consumer that stalls for several bytes"""
+    rng = random.Random(SEED)
+    byte_clks = 10 * clks_per_bit(dut)
+    depth = 1 << dut_parameter(dut, "DEPTH_LOG2")
+    popped = 0
+
+    def stall_cycles():
+        # A few clocks per byte, so on average it keeps up with the line, and
+        # every 64 bytes away for half to almost all of the FIFO's byte times
+        nonlocal popped
+        popped += 1
+        if popped % 64 == 0:
+            return rng.randint(depth // 2, depth - 2) * byte_clks
+        return rng.randint(0, byte_clks // 4)
+
+    source = await start_line(dut)
+    consumer = Consumer(dut, stall_cycles)
+    data = bytes(rng.getrandbits(8) for _ in range(N_BYTES))
+    await source.send(data, idle_bits=0)
+    await ClockCycles(dut.clk, depth * byte_clks)
+    consumer.stop()
+
+    assert int(dut.overflows.value) == 0
+    lost = next((i for i, (a, b) in enumerate(zip(consumer.received, data)) if a != b), None)
+    assert bytes(consumer.received) == data, \
+        f"{len(consumer.received)}/{len(data)} bytes, first difference at {lost}"
+    assert int(dut.max_level.value) >= depth // 2, "the stalls never filled the FIFO"
+    assert int(dut.level.value) == 0
+    dut._log.info("max level %d of %d", int(dut.max_level.value), depth)
+
+
+@cocotb.test(timeout_time=sim_budget_ns(uart_bytes=64), timeout_unit="ns")
+async def rx_fifo_counts_overflows(dut):
+    """A consumer away for the whole burst gets the first depth bytes; the rest are counted"""
+    depth = 1 << dut_parameter(dut, "DEPTH_LOG2")
+    data = bytes(range(depth + 9))
+    source = await start_line(dut)
+    await source.send(data, idle_bits=0)
+    await ClockCycles(dut.clk, 2 * clks_per_bit(dut))
+    assert dut.full.value == 1
+    assert int(dut.overflows.value) == 9
+
+    consumer = Consumer(dut, lambda: 0)
+    await ClockCycles(dut.clk, 2 * depth)
+    consumer.stop()
+    assert bytes(consumer.received) == data[:depth]
+    assert int(dut.max_level.value) == depth
+
+
+JOBS = [
+    SimJob(
+        name="uart_rx_fifo",
+        toplevel="UartRxFifoLine",
+        module=Path(__file__).stem,
+        parameters=dict(DEPTH_LOG2=DEPTH_LOG2, **uart_parameters()),
+    ),
+]
+
+
+@pytest.mark.parametrize("job", JOBS, ids=lambda job: job.name)
+def test_uart_rx_fifo_runner(job):
+    """Run simulation for UartRx into UartRxFifo"""
+    run_job(job)
@@ -4,13 +4,29 @@
 # Created: 2025-05-05 21:35:46
 # ====================================
 
+import os
+import random
 import cocotb
+import pytest
 from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, Timer
-from cocotb_test.simulator import run
+from cocotb.triggers import ClockCycles, ReadOnly, RisingEdge
 from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.runner import SRC_DIR, SimJob, run_job
+from tblib.config import CLK_PERIOD_NS, sim_budget_ns
+from tblib.coverage import DirectedFrames, PidBufferCoverage, dut_registers
+from tblib.cycle_models import PidBufferModel
+from tblib.lockstep import Lockstep
+from tblib.triggers import wait_for_pulse, wait_for_value
+from tblib.pid_codec import encode_rx_burst, encode_rx_test, encode_rx_words
+from tblib.harness import reset, start_clock
+from tblib.probes import (END_TO_READY_CYCLES, EventProbe, check_budget, format_histogram,
+                          latencies, throughput)
+from tblib.uart import UartByteSource
+from tblib.profiling import install_from_env
+
+install_from_env()  # TB_PROFILE=1: profile this run, see tblib/profiling.py
 
 
 # Parameters
@@ -19,6 +35,10 @@ TEST_PID = 0x69
 TEST_VAL = 0x2
 START_FRAME = 0xAA
 END_FRAME = 0x55
+READY_TIMEOUT_NS = 20 * CLK_PERIOD_NS
+SEED = 2026
+N_LATENCY_FRAMES = 64
+COVERAGE_MAX_BYTES = int(os.getenv("COVERAGE_MAX_BYTES", "8000"))
 
 
 async def send_byte(dut,pid_or_data):
@@ -29,20 +49,11 @@ async def send_byte(dut,pid_or_data):
     await RisingEdge(dut.clk)
 
 
-async def wath_ready(dut):
-    for _ in range(20):
-        await RisingEdge(dut.clk)
-        if dut.ready.value ==1:
-            return
-    assert False
-        
-
-
-@cocotb.test()
+@cocotb.test(timeout_time=sim_budget_ns(cycles=100), timeout_unit="ns")
 async def operationTest_mode(dut):
     """ Test the buffer when running in test mode"""
-    cocotb.start_soon(Clock(dut.clk, 20, units="ns").start())
-    ready_flag = cocotb.start_soon(wath_ready(dut))
+    cocotb.start_soon(Clock(dut.clk, CLK_PERIOD_NS, units="ns").start())
+    ready_flag = cocotb.start_soon(wait_for_pulse(dut.ready, timeout_ns=READY_TIMEOUT_NS))
 
     # reset
     dut.rst.value = 1
@@ -59,8 +70,8 @@ async def operationTest_mode(dut):
     await send_byte(dut,  END_FRAME)
 
     # give DUT one extra cycle to assert ready
-    while dut.ready.value != 1:
-        await RisingEdge(dut.clk)
+    await wait_for_value(dut.ready, 1, timeout_ns=READY_TIMEOUT_NS)
+    await ReadOnly()
     #assert dut.ready.value == 1, f"ready was {int(dut.ready.value)}"
     assert dut.test.value  == 1, f"test was {int(dut.test.value)}"
     assert dut.ready.value  == 1
@@ -68,10 +79,10 @@ async def operationTest_mode(dut):
     assert dut.a1.value    ==  dut.a2.value
     await ready_flag
 
-@cocotb.test()
+@cocotb.test(timeout_time=sim_budget_ns(cycles=200), timeout_unit="ns")
 async def operationNormal_mode(dut):
     """ Test the buffer when running a norma control law"""
-    cocotb.start_soon(Clock(dut.clk, 20, units="ns").start())
+    cocotb.start_soon(Clock(dut.clk, CLK_PERIOD_NS, units="ns").start())
     #ready_flag = cocotb.start_soon(wath_ready(dut))
 
     # reset
@@ -80,23 +91,13 @@ async def operationNormal_mode(dut):
     dut.rst.value = 0
     await RisingEdge(dut.clk)
 
-    # send A1 bytes: PID then data for each byte
-    for pid in [0x10, 0x11, 0x12, 0x13]:
-        await send_byte(dut,  START_FRAME)
-        await send_byte(dut,  pid)
-        await send_byte(dut,  0x01)
-        await send_byte(dut,  END_FRAME)
-
-    # send A2 bytes
-    for pid in [0x20, 0x21, 0x22, 0x23]:
-        await send_byte(dut,  START_FRAME)
-        await send_byte(dut,  pid)
-        await send_byte(dut,  0x01)
-        await send_byte(dut,  END_FRAME)
+    # START / PID / 0x01 / END for every byte lane of a1, then a2
+    for byte in encode_rx_words([0x01010101], [0x01010101]):
+        await send_byte(dut, byte)
 
     # give DUT one extra cycle to assert ready
-    while dut.ready.value != 1:
-        await RisingEdge(dut.clk)
+    await wait_for_value(dut.ready, 1, timeout_ns=READY_TIMEOUT_NS)
+    await ReadOnly()
 
     #assert dut.ready.value == 1, f"ready was {int(dut.ready.value)}"
     assert dut.a1.value    == 0x01010101, f"a1 = {hex(int(dut.a1.value))}"
@@ -105,22 +106,102 @@ async def operationNormal_mode(dut):
     #await ready_flag
 
 
+@cocotb.test(timeout_time=sim_budget_ns(cycles=200), timeout_unit="ns")
+async def operationBurst_mode(dut):
+    """ Whole-word burst frames, alone and mixed with lane frames"""
+    cocotb.start_soon(Clock(dut.clk, CLK_PERIOD_NS, units="ns").start())
 
+    # reset
+    dut.rst.value = 1
+    await RisingEdge(dut.clk)
+    dut.rst.value = 0
+    await RisingEdge(dut.clk)
 
-def test_uart_rx_pid_buffer_runner():
-    """Run simulation for UartRx"""
-    this_dir = Path(__file__).resolve().parent
-    rtl_file = this_dir.parent / "src" / "uart_rx_pid_buffer.v"
-    mod_name = Path(__file__).stem
-
-    assert rtl_file.exists(), f"Missing Verilog source: {rtl_file}"
+    # START / 0x32 / a1 MSB..LSB / a2 MSB..LSB / END
+    for byte in encode_rx_burst(0x11223344, 0x55667788):
+        await send_byte(dut, byte)
+    await wait_for_value(dut.ready, 1, timeout_ns=READY_TIMEOUT_NS)
+    await ReadOnly()
+    assert dut.a1.value    == 0x11223344, f"a1 = {hex(int(dut.a1.value))}"
+    assert dut.a2.value    == 0x55667788, f"a2 = {hex(int(dut.a2.value))}"
+    assert dut.test.value  == 0, f"test was {int(dut.test.value)}"
+    await RisingEdge(dut.clk)
 
-    run(
-        verilog_sources=[rtl_file],
+    # a1 as one burst word, a2 through its four lane frames
+    for byte in encode_rx_burst(a1=0xCAFEF00D) + encode_rx_words([0], [0x0BADBEEF])[16:]:
+        await send_byte(dut, byte)
+    await wait_for_value(dut.ready, 1, timeout_ns=READY_TIMEOUT_NS)
+    await ReadOnly()
+    assert dut.a1.value    == 0xCAFEF00D, f"a1 = {hex(int(dut.a1.value))}"
+    assert dut.a2.value    == 0x0BADBEEF, f"a2 = {hex(int(dut.a2.value))}"
+
+
+@cocotb.test(timeout_time=sim_budget_ns(cycles=N_LATENCY_FRAMES * 40), timeout_unit="ns")
+async def ready_latency_budget(dut):
+    """rx_done of every END byte that completes an update -> ready in exactly END_TO_READY_CYCLES"""
+    rng = random.Random(SEED)
+    start_clock(dut)
+    source = UartByteSource(dut.clk, dut.rx_byte, dut.rx_done)
+    await reset(dut)
+
+    # Burst and test frames only: each of their END bytes pulses ready
+    ends = EventProbe(dut.rx_done, when=lambda: int(dut.rx_byte.value) == END_FRAME).start()
+    ready = EventProbe(dut.ready).start()
+    for _ in range(N_LATENCY_FRAMES):
+        if rng.random() < 0.25:
+            frame = encode_rx_test(rng.getrandbits(8))
+        else:
+            frame = encode_rx_burst(rng.getrandbits(32), rng.getrandbits(32))
+        await source.send(frame)
+        await ClockCycles(dut.clk, rng.randint(1, 4))
+    await ClockCycles(dut.clk, 2 * END_TO_READY_CYCLES)
+
+    cycles = latencies(ends.cycles, ready.cycles)
+    dut._log.info("END -> ready, %.4f updates per clock:\n%s",
+                  throughput(ready.cycles), format_histogram(cycles))
+    check_budget(cycles, END_TO_READY_CYCLES, "END -> ready", expected_count=N_LATENCY_FRAMES,
+                 min_cycles=END_TO_READY_CYCLES)
+    assert len(ready) == N_LATENCY_FRAMES
+
+
+@cocotb.test(timeout_time=sim_budget_ns(cycles=2 * COVERAGE_MAX_BYTES + 100), timeout_unit="ns")
+async def coverage_closure(dut):
+    """Coverage-directed frames until every bin of PidBufferCoverage is hit,
+    checked against PidBufferModel; COVERAGE_REPORT gets the summary as JSON
+    """
+    start_clock(dut)
+    source = UartByteSource(dut.clk, dut.rx_byte, dut.rx_done)
+    lockstep = Lockstep(dut, PidBufferModel()).start()
+    await reset(dut)
+
+    coverage = PidBufferCoverage()
+    next_frames = DirectedFrames(coverage, random.Random(SEED))
+    while coverage.missing() and coverage.samples < COVERAGE_MAX_BYTES:
+        for byte in next_frames(dut_registers(dut)):
+            # The previous byte was taken on the first of its two clocks: settled by now
+            coverage.sample(byte, **dut_registers(dut))
+            await source.send(byte)
+    await ClockCycles(dut.clk, 4)
+    lockstep.check()
+
+    report = coverage.report(seed=SEED, cycles=2 * coverage.samples)
+    dut._log.info("PidBufferCoverage:\n%s", report)
+    if os.getenv("COVERAGE_REPORT"):
+        Path(os.environ["COVERAGE_REPORT"]).write_text(report + "\n")
+    assert not coverage.missing(), f"{coverage.ratio:.1%} after {coverage.samples} bytes"
+
+
+JOBS = [
+    SimJob(
+        name="uart_rx_pid_buffer",
         toplevel="UartRxPidBuffer",
-        module= mod_name,
-        waves=True,
-        sim_build=this_dir / f"sim_{mod_name}",
-        timescale="1ns/1ps"
-    )
+        module=Path(__file__).stem,
+        verilog_sources=[SRC_DIR / "uart_rx_pid_buffer.v"],
+    ),
+]
+
 
+@pytest.mark.parametrize("job", JOBS, ids=lambda job: job.name)
+def test_uart_rx_pid_buffer_runner(job):
+    """Run simulation for UartRxPidBuffer"""
+    run_job(job)
@@ -0,0 +1,149 @@
+# ====================================
+# File: test_uart_soak.py
+# Author: jaimebw
+# Created: 2026-10-18 11:22:14
+# ====================================
+# Soak UartTxAndPidBuffer at bit level with the seeded tblib.soak stream:
+# any number of bytes in constant memory, with start-bit glitches, framing
+# errors, inter-byte gaps and baud drift on rx. Every received byte is checked
+# against the stream, and every ready pulse against RxPidBufferModel and the
+# intended updates (resynchronisation after framing errors).
+#
+# Only the receive path is soaked: UartTxAndPidBuffer is rx -> UartRx ->
+# UartRxPidBuffer and has no tx line. UartTxPidBuffer and UartTx are covered
+# by their own tests, the lockstep checks and test_uart_control_loop.py.
+#
+#   SOAK_SEED     stream seed (default 1)
+#   SOAK_OFFSET   first byte, rounded down to a chunk boundary (default 0)
+#   SOAK_BYTES    bytes to send from there; the job is only collected when set
+#   SOAK_REPORT   write the summary there as JSON
+#
+# A failure names the SOAK_SEED / SOAK_OFFSET that replays it from its chunk:
+#
+#   SOAK_SEED=1 SOAK_OFFSET=40001536 SOAK_BYTES=4096 pytest tb/test_uart_soak.py
+
+import json
+import os
+import time
+import cocotb
+import pytest
+from cocotb.triggers import ReadOnly, RisingEdge, Timer
+from cocotb.utils import get_sim_time
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.config import bit_time_ns, sim_budget_ns, uart_parameters
+from tblib.harness import reset, start_clock
+from tblib.runner import SimJob, run_job
+from tblib.soak import CHUNK_BYTES, FRAMING, GUARD_BITS, SoakScoreboard, SoakStream
+from tblib.profiling import install_from_env
+
+install_from_env()  # TB_PROFILE=1: profile this run, see tblib/profiling.py
+
+SEED = int(os.getenv("SOAK_SEED", "1"))
+OFFSET = int(os.getenv("SOAK_OFFSET", "0"))
+N_BYTES = int(os.getenv("SOAK_BYTES", "0"))
+SOAK_ENV = ("SOAK_SEED", "SOAK_OFFSET", "SOAK_BYTES", "SOAK_REPORT")
+PROGRESS_CHUNKS = 64
+
+
+class ImpairedLine:
+    """Drive SoakChunk runs onto an rx line, the bit time scaled by the chunk's drift"""
+
+    def __init__(self, signal, bit_time_ns):
+        self._signal = signal
+        self.bit_time_ns = bit_time_ns
+        signal.value = 1
+
+    async def send(self, chunk, scoreboard):
+        bit_ns = self.bit_time_ns * (1 + chunk.drift)
+        timers = {}     # run length in bits -> Timer, shared by the whole chunk
+        signal = self._signal
+        for pos in range(len(chunk.data)):
+            for level, bits in chunk.byte_runs(pos):
+                timer = timers.get(bits)
+                if timer is None:
+                    timer = timers[bits] = Timer(bits * bit_ns, units="ns", round_mode="round")
+                signal.value = level
+                await timer
+            if chunk.impairment[pos] == FRAMING:
+                scoreboard.guard_done()
+
+
+async def monitor_bytes(dut, scoreboard):
+    rx_done = RisingEdge(dut.rx_done)
+    while True:
+        await rx_done
+        await ReadOnly()
+        scoreboard.received(int(dut.rx_data.value))
+
+
+async def monitor_ready(dut, scoreboard):
+    ready = RisingEdge(dut.ready)
+    while True:
+        await ready
+        await ReadOnly()
+        scoreboard.ready(int(dut.a1.value), int(dut.a2.value), int(dut.test.value))
+
+
+@cocotb.test(timeout_time=sim_budget_ns(uart_bytes=2 * (N_BYTES + CHUNK_BYTES)), timeout_unit="ns")
+async def uart_soak(dut):
+    """SOAK_BYTES of the SOAK_SEED stream from SOAK_OFFSET, impairments included"""
+    stream = SoakStream(SEED)
+    start = stream.start_of(OFFSET)
+    start_clock(dut)
+    line = ImpairedLine(dut.rx, bit_time_ns(dut))
+    await reset(dut)
+
+    scoreboard = SoakScoreboard()
+    monitors = [cocotb.start_soon(monitor_bytes(dut, scoreboard)),
+                cocotb.start_soon(monitor_ready(dut, scoreboard))]
+    wall_start, sim_start = time.perf_counter(), get_sim_time("ns")
+    chunks, end = 0, start
+    for chunk in stream.chunks(OFFSET, N_BYTES):
+        scoreboard.expect(chunk)
+        await line.send(chunk, scoreboard)
+        chunks, end = chunks + 1, chunk.offset + len(chunk.data)
+        if scoreboard.errors:
+            break
+        if chunks % PROGRESS_CHUNKS == 0:
+            dut._log.info("byte %d, %d updates, %.0f bytes/s", end, scoreboard.stats["updates"],
+                          (end - start) / (time.perf_counter() - wall_start))
+    # The last byte's rx_done, or a spurious one, lands within a guard
+    await Timer(GUARD_BITS * line.bit_time_ns, units="ns", round_mode="round")
+    for monitor in monitors:
+        monitor.kill()
+    scoreboard.finish()
+
+    wall_s = time.perf_counter() - wall_start
+    summary = scoreboard.summary(seed=SEED, start_offset=start, end_offset=end, chunks=chunks,
+                                 sim_time_ms=(get_sim_time("ns") - sim_start) / 1e6,
+                                 wall_time_s=round(wall_s, 3), bytes_per_s=round((end - start) / wall_s))
+    dut._log.info("%s", json.dumps(summary, indent=2))
+    if os.getenv("SOAK_REPORT"):
+        Path(os.environ["SOAK_REPORT"]).write_text(json.dumps(summary, indent=2) + "\n")
+
+    replay = f"SOAK_SEED={SEED} SOAK_OFFSET={stream.start_of(scoreboard.first_error_offset or start)}"
+    assert not scoreboard.errors, f"replay with {replay}\n" + "\n".join(scoreboard.errors)
+    assert summary["updates"], summary
+
+
+# Opt-in: even 16k bytes are ~1e9 clocks in full baud mode
+JOBS = [
+    SimJob(
+        name="uart_soak",
+        toplevel="UartTxAndPidBuffer",
+        module=Path(__file__).stem,
+        parameters=uart_parameters(),
+        testcase="uart_soak",
+        # The simulator runs in the build directory
+        extra_env={name: str(Path(os.environ[name]).resolve()) if name == "SOAK_REPORT"
+                   else os.environ[name] for name in SOAK_ENV if name in os.environ},
+    ),
+] if N_BYTES else []
+
+
+@pytest.mark.parametrize("job", JOBS, ids=lambda job: job.name)
+def test_uart_soak_runner(job):
+    """Soak UartTxAndPidBuffer with the seeded impaired stream"""
+    run_job(job)
@@ -4,70 +4,104 @@
 # Created: 2025-05-04 16:00:16
 # ====================================
 import cocotb
-from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, Timer
-from cocotb_test.simulator import run
+import pytest
+from cocotb.triggers import Edge, FallingEdge, RisingEdge
+from cocotb.utils import get_sim_time
 from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.runner import SRC_DIR, SimJob, run_job
+from tblib.sweep import Sweep
+from tblib.config import CLK_PERIOD_NS, bit_time_ns, sim_budget_ns, uart_parameters
+from tblib.harness import reset, start_clock
+from tblib.uart import UartSink, uart_frame
+from tblib.profiling import install_from_env
+
+install_from_env()  # TB_PROFILE=1: profile this run, see tblib/profiling.py
 
 
 # Parameters
-CLK_FREQ = 50_000_000
-BAUD_RATE = 9600
-CLKS_PER_BIT = CLK_FREQ // BAUD_RATE
-BIT_TIME_NS = CLKS_PER_BIT * 20  # 20ns per clock tick at 50MHzk
-FRAME_BITS = 10
+FRAME_BITS = 10 # start + 8 data + stop
 
 
-@cocotb.test()
+@cocotb.test(timeout_time=sim_budget_ns(uart_bytes=1), timeout_unit="ns")
 async def uart_tx_test(dut):
-    """Test UART TX emits correct bitstream for 0xAA"""
-    clock = Clock(dut.clk, 20, units="ns")  # 50 MHz
-    cocotb.start_soon(clock.start())
+    """Test UART TX emits a start(0), 0xAA, stop(1) frame"""
+    data_byte = 0xAA
+    start_clock(dut)
+    sink = UartSink(dut.tx, bit_time_ns(dut), data_bits=FRAME_BITS - 2).start()
+    dut.tx_start.value = 0
+    await reset(dut)
 
-    dut.rst.value = 1
+    dut.frame_data.value = uart_frame(data_byte)
+    dut.tx_start.value = 1
     await RisingEdge(dut.clk)
-    dut.rst.value = 0
+    dut.tx_start.value = 0
+
+    received = await sink.read(1)
+    assert received[0] == data_byte, f"Expected 0x{data_byte:02X}, got 0x{received[0]:02X}"
+    assert sink.framing_errors == 0, "stop bit missing"
 
-    await RisingEdge(dut.clk)
 
-    # Send a known frame: start(0), 0xAA (10101010), stop(1)
-    #frame = 0x3FF # Funny, it is always one...
-    frame = 0b0_10101010_1
-    dut.frame_data.value = frame
+@cocotb.test(timeout_time=sim_budget_ns(uart_bytes=1), timeout_unit="ns")
+async def uart_tx_bit_edges(dut):
+    """0x55 toggles every bit: each edge within a clock of k / BAUD_RATE after the start bit"""
+    start_clock(dut)
+    bit_ns = bit_time_ns(dut)
     dut.tx_start.value = 0
+    await reset(dut)
 
-    await Timer(20, units="ns")  # Give it a short pulse
+    dut.frame_data.value = uart_frame(0x55)
     dut.tx_start.value = 1
+    await RisingEdge(dut.clk)
+    dut.tx_start.value = 0
 
-    bits = [(frame >> i) & 1 for i in range(FRAME_BITS)]
-    test_rest = 0;
-
-    for i, expected in enumerate(bits):
-        await Timer(BIT_TIME_NS, units="ns")
-        actual = dut.tx.value.integer
-        test_rest |= actual << i
-        print(f"Bit {i}: expected {expected}, got {actual}")
-        assert actual == expected
-    
+    await FallingEdge(dut.tx)
+    start = get_sim_time("ns")
+    for k in range(1, FRAME_BITS):   # data bits, then the stop bit
+        await Edge(dut.tx)
+        error = get_sim_time("ns") - start - k * bit_ns
+        assert abs(error) <= CLK_PERIOD_NS, f"edge {k} off by {error:.1f} ns"
 
 
 
-def test_uart_tx_runner():
-    """Run simulation for UartTx"""
-    this_dir = Path(__file__).resolve().parent
-    rtl_file = this_dir.parent / "src" / "uart_tx.v"
+JOBS = [
+    SimJob(
+        name="uart_tx",
+        toplevel="UartTx",
+        module=Path(__file__).stem,
+        verilog_sources=[SRC_DIR / "uart_tx.v"],
+        parameters={"FRAME_BITS": FRAME_BITS, **uart_parameters()},
+    ),
+    SimJob(
+        name="uart_tx_fractional",
+        toplevel="UartTx",
+        module=Path(__file__).stem,
+        verilog_sources=[SRC_DIR / "uart_tx.v"],
+        parameters={"FRAME_BITS": FRAME_BITS, "CLK_FREQ": 50_000_000, "BAUD_RATE": 3_000_000,
+                    "FRACTIONAL": 1},
+    ),
+]
 
-    assert rtl_file.exists(), f"Missing Verilog source: {rtl_file}"
 
-    run(
-        verilog_sources=[rtl_file],
+# python tb/sweep.py -k uart_tx: bit edges at rates that don't divide the clock
+SWEEPS = [
+    Sweep(
+        name="uart_tx_fractional",
         toplevel="UartTx",
         module=Path(__file__).stem,
-        parameters={"FRAME_BITS": 10},
-        waves=True,
-        sim_build=this_dir / "sim_build",
-        timescale="1ns/1ps"
-    )
-
+        verilog_sources=[SRC_DIR / "uart_tx.v"],
+        parameters={
+            "FRAME_BITS": [FRAME_BITS],
+            "CLK_FREQ": [50_000_000],
+            "BAUD_RATE": [115_200, 921_600, 1_000_000, 2_000_000, 3_000_000, 3_125_000],
+            "FRACTIONAL": [1],
+        },
+    ),
+]
+
+
+@pytest.mark.parametrize("job", JOBS, ids=lambda job: job.name)
+def test_uart_tx_runner(job):
+    """Run simulation for UartTx"""
+    run_job(job)
@@ -5,13 +5,24 @@
 # ====================================
 
 
+import random
 import cocotb
+import pytest
 from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, Timer, ReadOnly
-from cocotb_test.simulator import run
+from cocotb.triggers import ClockCycles, RisingEdge, Timer, ReadOnly
 from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.runner import SRC_DIR, SimJob, run_job
+from tblib.config import CLK_PERIOD_NS, sim_budget_ns
+from tblib.triggers import wait_for_value
+from tblib.pid_codec import TX_FRAME_LEN, decode_tx_frames
+from tblib.harness import reset, start_clock
+from tblib.probes import (VALID_TO_START_CYCLES, EventProbe, check_budget, format_histogram,
+                          latencies, throughput)
+from tblib.profiling import install_from_env
+
+install_from_env()  # TB_PROFILE=1: profile this run, see tblib/profiling.py
 
 
 # Parameters
@@ -19,24 +30,23 @@ sys.path.append(str(Path(__file__).resolve().parent))
 START_DEL= 0xAA
 END_DEL = 0x55
 DATA_PID = 0x69
+TX_START_TIMEOUT_NS = 20 * CLK_PERIOD_NS
+SEED = 2026
+N_LATENCY_WORDS = 32
+BUSY_CYCLES = 12   # a very fast UART: busy for 12 clocks per byte
 
-def pack_val(byte_list):
-    result = 0
-    for i, byte in enumerate(byte_list):
-        result |= byte << (8 * i)
-    return result
 # ======================================================================
 # Main test: send one normal-mode frame and verify its bytes.
 # ======================================================================
-@cocotb.test()
+@cocotb.test(timeout_time=sim_budget_ns(cycles=200), timeout_unit="ns")
 async def operationNormal_mode(dut):
     """Verify START, PID, 4 data bytes, END in normal (DATA_PID) mode."""
     START_DEL, DATA_PID, END_DEL = 0xAA, 0x69, 0x55
     VALUES_TO_PACK = [0xA1, 0xBE, 0x12, 0xC1]
-    VALUE = pack_val(VALUES_TO_PACK)
+    VALUE = int.from_bytes(bytes(VALUES_TO_PACK), "little")
 
     # Start 50 MHz clock (20ns period)
-    cocotb.start_soon(Clock(dut.clk, 20, units="ns").start())
+    cocotb.start_soon(Clock(dut.clk, CLK_PERIOD_NS, units="ns").start())
 
     # Reset
     dut.rst.value = 1
@@ -62,14 +72,14 @@ async def operationNormal_mode(dut):
     # Wait for 7 tx_start pulses and capture tx_data
     for i in range(7):
         # Wait until tx_start is asserted
-        while dut.tx_start.value == 0:
-            await RisingEdge(dut.clk)
+        await wait_for_value(dut.tx_start, 1, timeout_ns=TX_START_TIMEOUT_NS)
 
         # Latch tx_data on tx_start
+        await ReadOnly()
         sent.append(int(dut.tx_data.value))
-        print(f"Byte {i}: {hex(sent[-1])}")
 
         # Advance FSM out of WAITBUSY
+        await RisingEdge(dut.clk)
         dut.tx_busy.value = 1
         await RisingEdge(dut.clk)
         dut.tx_busy.value = 0
@@ -83,6 +93,51 @@ async def operationNormal_mode(dut):
     assert sent[4] == VALUES_TO_PACK[2]
     assert sent[5] == VALUES_TO_PACK[3]
     assert sent[6] == END_DEL, "End delimiter incorrect"
+    assert decode_tx_frames(bytes(sent)) == [(DATA_PID, VALUE)]
+
+
+async def fake_uart(dut, busy_cycles):
+    """Hold tx_busy for *busy_cycles* from the edge that sampled tx_start, like UartTx"""
+    clk = RisingEdge(dut.clk)
+    dut.tx_busy.value = 0
+    while True:
+        await clk
+        if dut.tx_start.value:  # sampled at the edge, as the UART saw it
+            dut.tx_busy.value = 1
+            await ClockCycles(dut.clk, busy_cycles)
+            dut.tx_busy.value = 0
+
+
+@cocotb.test(timeout_time=sim_budget_ns(cycles=N_LATENCY_WORDS * TX_FRAME_LEN * (BUSY_CYCLES + 8)),
+             timeout_unit="ns")
+async def tx_start_latency_budget(dut):
+    """tx_valid into an idle buffer -> first tx_start in exactly VALID_TO_START_CYCLES"""
+    rng = random.Random(SEED)
+    start_clock(dut)
+    dut.tx_valid.value = 0
+    dut.test.value = 0
+    dut.tx_float.value = 0
+    cocotb.start_soon(fake_uart(dut, BUSY_CYCLES))
+    await reset(dut)
+
+    valid = EventProbe(dut.tx_valid).start()
+    starts = EventProbe(dut.tx_start).start()
+    clk = RisingEdge(dut.clk)
+    for n in range(N_LATENCY_WORDS):
+        dut.tx_float.value = rng.getrandbits(32)
+        dut.tx_valid.value = 1
+        await clk
+        dut.tx_valid.value = 0
+        while len(starts) < TX_FRAME_LEN * (n + 1) or dut.tx_busy.value:
+            await clk
+        # WAITFREE -> IDLE on the edge after the last byte frees the UART
+        await ClockCycles(dut.clk, 1 + rng.randint(0, 3))
+
+    cycles = latencies(valid.cycles, starts.cycles)
+    dut._log.info("tx_valid -> tx_start, %.4f bytes per clock:\n%s",
+                  throughput(starts.cycles), format_histogram(cycles))
+    check_budget(cycles, VALID_TO_START_CYCLES, "tx_valid -> tx_start", expected_count=N_LATENCY_WORDS,
+                 min_cycles=VALID_TO_START_CYCLES)
 # @cocotb.test()
 # async def operationNormal_mode(dut):
 #     """Verify START, PID, 4 data bytes, END in normal (DATA_PID) mode."""
@@ -157,21 +212,17 @@ async def operationNormal_mode(dut):
 
 
 
-def test_uart_tx_pid_buffer_runner():
-    """Run simulation for UartRx"""
-    this_dir = Path(__file__).resolve().parent
-    rtl_file = this_dir.parent / "src" / "uart_tx_pid_buffer.v"
-    mod_name = Path(__file__).stem
-
-    assert rtl_file.exists(), f"Missing Verilog source: {rtl_file}"
-
-    run(
-        verilog_sources=[rtl_file],
+JOBS = [
+    SimJob(
+        name="uart_tx_pid_buffer",
         toplevel="UartTxPidBuffer",
-        module= mod_name,
-        waves=True,
-        sim_build=this_dir / f"sim_{mod_name}",
-        timescale="1ns/1ps",
-        clean = True
-    )
+        module=Path(__file__).stem,
+        verilog_sources=[SRC_DIR / "uart_tx_pid_buffer.v"],
+    ),
+]
+
 
+@pytest.mark.parametrize("job", JOBS, ids=lambda job: job.name)
+def test_uart_tx_pid_buffer_runner(job):
+    """Run simulation for UartTxPidBuffer"""
+    run_job(job)
@@ -0,0 +1,122 @@
+# ====================================
+# File: test_uart_tx_pid_fifo.py
+# Author: jaimebw
+# Created: 2026-10-18 10:45:32
+# ====================================
+# UartTxPidFifo behind a real UartTx (tb/uart_tx_pid_line.v): frames on the
+# tx line, throughput with words pushed as fast as tx_ready allows, and
+# tx_valid dropped while full.
+
+import random
+import cocotb
+import pytest
+from cocotb.triggers import FallingEdge, RisingEdge
+from cocotb.utils import get_sim_time
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.config import bit_time_ns, clks_per_bit, sim_budget_ns, uart_parameters
+from tblib.harness import reset, start_clock
+from tblib.pid_codec import TX_DATA_PID, TX_FRAME_LEN, TX_TEST_PID, decode_tx_frames
+from tblib.runner import SimJob, run_job
+from tblib.uart import UartSink
+from tblib.profiling import install_from_env
+
+install_from_env()  # TB_PROFILE=1: profile this run, see tblib/profiling.py
+
+SEED = 2026
+N_WORDS = 24
+# UartTx spends one DONE and one IDLE clock between frames, and the FIFO
+# issues tx_start on the next edge: 3 clocks of gap per 10-bit byte
+GAP_CLKS = 3
+
+
+def min_utilization(dut):
+    frame_clks = 10 * clks_per_bit(dut)
+    return frame_clks / (frame_clks + GAP_CLKS) - 0.005
+
+
+async def start_line(dut):
+    start_clock(dut)
+    dut.tx_valid.value = 0
+    dut.tx_float.value = 0
+    dut.test.value = 0
+    sink = UartSink(dut.tx, bit_time_ns(dut)).start()
+    await reset(dut)
+    return sink
+
+
+async def push_words(dut, words, tests):
+    """Push every word, holding tx_valid until tx_ready accepts it"""
+    clk = RisingEdge(dut.clk)
+    for word, test in zip(words, tests):
+        dut.tx_float.value = word
+        dut.test.value = test
+        dut.tx_valid.value = 1
+        await clk
+        while not dut.tx_ready.value:  # sampled at the edge, as the RTL saw it
+            await clk
+    dut.tx_valid.value = 0
+
+
+@cocotb.test(timeout_time=sim_budget_ns(uart_bytes=TX_FRAME_LEN * N_WORDS), timeout_unit="ns")
+async def tx_fifo_back_to_back(dut):
+    """Words pushed at full rate come out in order with the line almost never idle"""
+    rng = random.Random(SEED)
+    sink = await start_line(dut)
+    words = [rng.getrandbits(32) for _ in range(N_WORDS)]
+    tests = [rng.random() < 0.25 for _ in range(N_WORDS)]
+
+    cocotb.start_soon(push_words(dut, words, tests))
+    await FallingEdge(dut.tx)
+    start = get_sim_time("ns")
+    received = await sink.read(TX_FRAME_LEN * N_WORDS)
+    # read() returns at the middle of the last stop bit
+    busy_ns = (len(received) - 0.05) * 10 * bit_time_ns(dut)
+    utilization = busy_ns / (get_sim_time("ns") - start)
+
+    assert decode_tx_frames(received) == [
+        (TX_TEST_PID if test else TX_DATA_PID, word) for word, test in zip(words, tests)]
+    assert sink.framing_errors == 0
+    assert utilization >= min_utilization(dut), f"line utilization {utilization:.4f}"
+    dut._log.info("line utilization %.4f over %d bytes", utilization, len(received))
+
+
+@cocotb.test(timeout_time=sim_budget_ns(uart_bytes=TX_FRAME_LEN * N_WORDS), timeout_unit="ns")
+async def tx_fifo_drops_when_full(dut):
+    """A new word every clock: only the ones seen with tx_ready high are sent"""
+    sink = await start_line(dut)
+    clk = RisingEdge(dut.clk)
+    accepted = []
+    saw_full = False
+    word = 0
+    while len(accepted) < N_WORDS:
+        word += 1
+        dut.tx_float.value = word
+        dut.tx_valid.value = 1
+        await clk
+        if dut.tx_ready.value:
+            accepted.append(word)
+        saw_full |= bool(dut.full.value)
+    dut.tx_valid.value = 0
+
+    received = await sink.read(TX_FRAME_LEN * N_WORDS)
+    assert saw_full
+    assert accepted[:3] == [1, 2, 3]  # one word on the line, two queued
+    assert [w for _, w in decode_tx_frames(received)] == accepted
+
+
+JOBS = [
+    SimJob(
+        name="uart_tx_pid_fifo",
+        toplevel="UartTxPidLine",
+        module=Path(__file__).stem,
+        parameters=uart_parameters(),
+    ),
+]
+
+
+@pytest.mark.parametrize("job", JOBS, ids=lambda job: job.name)
+def test_uart_tx_pid_fifo_runner(job):
+    """Run simulation for UartTxPidFifo on a UartTx line"""
+    run_job(job)
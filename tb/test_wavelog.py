@@ -0,0 +1,85 @@
+# ====================================
+# File: test_wavelog.py
+# Author: jaimebw
+# Created: 2026-10-18 10:39:53
+# ====================================
+
+import io
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.pid_codec import encode_rx_burst, encode_rx_words, encode_tx_words
+from tblib.wavelog import UartLineDecoder, VcdReader, WaveLog
+
+BIT_PS = 320_000  # 16 clocks of 20 ns
+
+
+def serialize(data, start_ps, bit_ps=BIT_PS):
+    """(time_ps, level) changes of a UART line sending *data*, one idle bit between bytes"""
+    changes, t, level = [], start_ps, 1
+    for byte in data:
+        bits = [0] + [(byte >> i) & 1 for i in range(8)] + [1, 1]
+        for bit in bits:
+            if bit != level:
+                changes.append((t, bit))
+                level = bit
+            t += bit_ps
+    return changes, t
+
+
+def rx_buffer_vcd(data):
+    changes, end = serialize(data, start_ps=1_000_000)
+    lines = [
+        "$date today $end", "$timescale 1ps $end",
+        "$scope module UartTxAndPidBuffer $end",
+        "$var parameter 32 ! CLK_FREQ [31:0] $end",
+        '$var parameter 32 " BAUD_RATE [31:0] $end',
+        "$var wire 1 # rx $end",
+        "$scope module uart_rx_inst $end", "$var wire 1 # rx $end", "$upscope $end",
+        "$scope module rx_pid_buffer $end",
+        "$var reg 3 $ state [2:0] $end", "$var reg 8 % pid_byte [7:0] $end",
+        "$upscope $end", "$upscope $end", "$enddefinitions $end",
+        "#0", "$dumpvars", f"b{50_000_000:b} !", f"b{3_125_000:b} \"", "1#", "b0 $", "b0 %", "$end",
+    ]
+    for t, level in changes:
+        lines += [f"#{t}", f"{level}#"]
+    lines += ["#2000000", "b1 $", "#3000000", "b100 $", "#4000000", "b0 $", f"#{end + BIT_PS}"]
+    return io.BytesIO("\n".join(lines).encode() + b"\n")
+
+
+def test_line_decoder_rejects_glitches():
+    decoder = UartLineDecoder(bit_ns=100)
+    assert decoder.change(0, 0) == []
+    assert decoder.change(20, 1) == []       # low for 20 ns only
+    changes, end = serialize([0xA5], start_ps=1000, bit_ps=100)
+    out = [b for t, level in changes for b in decoder.change(t, level)] + decoder.finish(end)
+    assert [(byte, ok) for _, byte, ok in out] == [(0xA5, True)]
+
+
+def test_rx_frames_and_fsm_timeline():
+    lanes = encode_rx_words([0xF1F2F3F4], [0x01020304])
+    data = lanes + encode_rx_burst(0xA1A2A3A4, 0xB1B2B3B4) + encode_rx_burst(a2=0x55AA)
+    log = WaveLog(VcdReader(rx_buffer_vcd(data)))
+    records = list(log.records())
+
+    uart = [r for r in records if r["kind"] == "uart"]
+    assert bytes(r["byte"] for r in uart) == data  # the aliased instance port is not decoded twice
+    assert uart[0]["signal"] == "UartTxAndPidBuffer.rx"
+    frames = [(r["pid"], r["value"]) for r in records if r["kind"] == "rx_frame"]
+    assert frames == [(pid, lanes[n + 2]) for n, pid in zip(range(0, 32, 4), lanes[1::4])] + [
+        (0x32, 0xA1A2A3A4B1B2B3B4), (0x31, 0x55AA)]
+    states = [r["state"] for r in records if r["kind"] == "fsm"]
+    assert states == ["IDLE", "GOT_START", "GOT_WORD", "IDLE"]
+    assert log.state_time_ns[("UartTxAndPidBuffer.rx_pid_buffer", "GOT_START")] == 1000.0
+
+
+def test_tx_frames_with_explicit_baud():
+    words = [0xDEADBEEF, 7]
+    changes, end = serialize(encode_tx_words(words), start_ps=0, bit_ps=1_000_000)
+    text = "$timescale 1 ps $end\n$scope module UartTx $end\n$var wire 1 ! tx $end\n" \
+           "$upscope $end\n$enddefinitions $end\n#0\n1!\n"
+    text += "".join(f"#{t}\n{level}!\n" for t, level in changes) + f"#{end}\n"
+    log = WaveLog(VcdReader(io.BytesIO(text.encode())), baud=1_000_000)
+    frames = [(r["pid"], r["word"]) for r in log.records() if r["kind"] == "tx_frame"]
+    assert frames == [(0x69, w) for w in words]
+    assert log.counts["tx_bytes"] == 14
@@ -0,0 +1,36 @@
+# ====================================
+# File: test_waves.py
+# Author: jaimebw
+# Created: 2026-10-18 10:18:12
+# ====================================
+
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parent))
+from tblib.waves import dump_plusargs, waves_requested, write_dump_module
+
+
+def test_dump_module_scope_and_rewrite(tmp_path):
+    path = write_dump_module(tmp_path, "UartTxAndPidBuffer", scope="rx_pid_buffer", fmt="fst")
+    source = path.read_text()
+    assert '$dumpfile("UartTxAndPidBuffer.fst")' in source
+    assert "$dumpvars(0, UartTxAndPidBuffer.rx_pid_buffer)" in source
+
+    # Unchanged contents must not touch the mtime (cocotb-test rebuild check)
+    mtime = path.stat().st_mtime_ns
+    write_dump_module(tmp_path, "UartTxAndPidBuffer", scope="rx_pid_buffer", fmt="fst")
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_dump_plusargs():
+    assert dump_plusargs("fst") == ["-fst"]
+    assert dump_plusargs("vcd", start_ns=1500) == ["+dump_start=1500"]
+    assert dump_plusargs("fst", start_ns=0, stop_ns=10) == ["-fst", "+dump_stop=10"]
+
+
+def test_waves_requested(monkeypatch):
+    monkeypatch.delenv("WAVES", raising=False)
+    assert not waves_requested()
+    monkeypatch.setenv("WAVES", "1")
+    assert waves_requested()
+    assert not waves_requested(False)
@@ -0,0 +1,61 @@
+// ====================================
+// File: uart_rx_fifo_line.v
+// Author: jaimebw
+// Created: 2026-10-18 10:47:59
+// ====================================
+// UartRx feeding UartRxFifo, with the consumer side left to the testbench:
+// a serial line in, a byte stream out at whatever rate rd_en allows.
+
+module UartRxFifoLine#(
+    parameter CLK_FREQ = 50_000_000,
+    parameter BAUD_RATE = 9600,
+    parameter DEPTH_LOG2 = 4
+)(
+    input  wire                  clk,
+    input  wire                  rst,
+    input  wire                  rx,
+    input  wire                  rd_en,
+    output wire [7:0]            rd_data,
+    output wire                  rd_valid,
+    output wire                  full,
+    output wire [DEPTH_LOG2:0]   level,
+    output wire [DEPTH_LOG2:0]   max_level,
+    output wire [15:0]           overflows
+);
+
+    wire [7:0] rx_data;
+    wire       rx_done;
+    wire       rx_busy;
+
+    UartRx #(
+        .CLK_FREQ(CLK_FREQ),
+        .BAUD_RATE(BAUD_RATE),
+        .FRAME_BITS(8)
+    ) uart_rx_inst (
+        .clk(clk),
+        .rst(rst),
+        .rx(rx),
+        .rx_data(rx_data),
+        .rx_done(rx_done),
+        .rx_busy(rx_busy)
+    );
+
+    UartRxFifo #(
+        .DATA_BITS(8),
+        .DEPTH_LOG2(DEPTH_LOG2),
+        .COUNT_BITS(16)
+    ) rx_fifo (
+        .clk(clk),
+        .rst(rst),
+        .wr_data(rx_data),
+        .wr_en(rx_done),
+        .rd_en(rd_en),
+        .rd_data(rd_data),
+        .rd_valid(rd_valid),
+        .full(full),
+        .level(level),
+        .max_level(max_level),
+        .overflows(overflows)
+    );
+
+endmodule
@@ -0,0 +1,59 @@
+// ====================================
+// File: uart_tx_pid_line.v
+// Author: jaimebw
+// Created: 2026-10-18 10:44:39
+// ====================================
+// UartTxPidFifo driving a real UartTx, so the tests can look at the tx line
+// itself: throughput, gaps between bytes and frames, backpressure.
+
+module UartTxPidLine#(
+    parameter CLK_FREQ = 50_000_000,
+    parameter BAUD_RATE = 9600,
+    parameter DEPTH_LOG2 = 1
+)(
+    input  wire        clk,
+    input  wire        rst,
+    input  wire [31:0] tx_float,
+    input  wire        tx_valid,
+    input  wire        test,
+    output wire        tx,
+    output wire        tx_ready,
+    output wire        full
+);
+
+    wire [7:0] tx_data;
+    wire       tx_start;
+    wire       tx_busy;
+    wire       tx_done;
+
+    UartTxPidFifo #(
+        .DEPTH_LOG2(DEPTH_LOG2)
+    ) tx_pid_fifo (
+        .clk(clk),
+        .rst(rst),
+        .tx_float(tx_float),
+        .tx_valid(tx_valid),
+        .tx_busy(tx_busy),
+        .test(test),
+        .tx_data(tx_data),
+        .tx_start(tx_start),
+        .tx_ready(tx_ready),
+        .full(full)
+    );
+
+    // start + 8 data + stop, shifted out LSB first
+    UartTx #(
+        .CLK_FREQ(CLK_FREQ),
+        .BAUD_RATE(BAUD_RATE),
+        .FRAME_BITS(10)
+    ) uart_tx_inst (
+        .clk(clk),
+        .rst(rst),
+        .frame_data({1'b1, tx_data, 1'b0}),
+        .tx_start(tx_start),
+        .tx(tx),
+        .tx_busy(tx_busy),
+        .tx_done(tx_done)
+    );
+
+endmodule